@@ -79,6 +79,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.SiteMiddleware",
+    "core.middleware.APICompressionMiddleware",
+    "core.middleware.APICacheControlMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -171,6 +174,11 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
+# Public URL prefix for original image files in API payloads, built from the
+# stored file name without a storage call (set to the bucket/CDN URL when
+# media lives in object storage)
+MEDIA_PUBLIC_URL = os.getenv("MEDIA_PUBLIC_URL", MEDIA_URL)
+
 STORAGES = {
     "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
@@ -193,6 +201,77 @@ WAGTAILSEARCH_BACKENDS = {
 # Base URL for notifications / full URLs in admin (env-driven)
 WAGTAILADMIN_BASE_URL = os.getenv("WAGTAILADMIN_BASE_URL", "http://127.0.0.1:8000")
 
+# Rendition pre-generation (home/renditions.py). Renditions for published
+# pages are rendered in a pool of worker processes; 0 workers runs inline.
+RENDITION_PREGENERATION = os.getenv("RENDITION_PREGENERATION", "True").lower() == "true"
+RENDITION_WORKERS = int(os.getenv("RENDITION_WORKERS", "2"))
+
+# Tests run background jobs inline - spawned workers would use the
+# development database (core/test_runner.py)
+TEST_RUNNER = "core.test_runner.TestRunner"
+
+# Cross-request cache of rendition URLs (core/rendition_cache.py).
+# Keys include the file hash and focal point; entries expire so a purge of
+# an evicted rendition that missed this process' cache still takes effect
+RENDITION_URL_CACHE = os.getenv("RENDITION_URL_CACHE", "default")
+RENDITION_URL_CACHE_TIMEOUT = 60 * 60
+
+# "rendition" renders images while serializing; "signed" returns signed
+# serve-view URLs (core/signed_renditions.py) and renders on first fetch.
+# IMAGE_SERVE_ACTION is "redirect" (to the rendition file) or "serve".
+IMAGE_URL_MODE = os.getenv("IMAGE_URL_MODE", "rendition")
+IMAGE_SERVE_ACTION = os.getenv("IMAGE_SERVE_ACTION", "redirect")
+
+# LQIP / dominant colour per image, computed in the worker pool on upload
+# (core/placeholders.py)
+IMAGE_PLACEHOLDERS = os.getenv("IMAGE_PLACEHOLDERS", "True").lower() == "true"
+
+# Content-addressed rendition files (core/storage.py) - identical outputs
+# share one file. Past RENDITION_STORAGE_BUDGET_MB the least recently used
+# renditions are evicted (core/rendition_budget.py); 0 means unlimited.
+WAGTAILIMAGES_RENDITION_STORAGE = "core.storage.ContentAddressedStorage"
+RENDITION_STORAGE_BUDGET = int(os.getenv("RENDITION_STORAGE_BUDGET_MB", "0")) * 1024 * 1024 or None
+RENDITION_ACCESS_INTERVAL = 6 * 60 * 60
+
+# Memoized StreamField block output (core/block_serializers.py), keyed by
+# block id and content hash. Invalidated on publish and image changes.
+BLOCK_SERIALIZER_CACHE = os.getenv("BLOCK_SERIALIZER_CACHE", "default")
+BLOCK_SERIALIZER_CACHE_TIMEOUT = 24 * 60 * 60
+# Build block values from the raw JSON with one query per chosen model
+# (core/raw_streams.py) instead of reading the StreamValue
+BLOCK_SERIALIZER_RAW = os.getenv("BLOCK_SERIALIZER_RAW", "True").lower() == "true"
+
+# JSON backend of every /api/v2/ response (core/renderers.py): "orjson"
+# (falls back to "json" when not installed) or "json" (stdlib)
+API_JSON_RENDERER = os.getenv("API_JSON_RENDERER", "orjson")
+
+# Brotli/gzip compression of /api/ responses (core/middleware.py). Bytes of
+# responses with an ETag are stored, so each payload is compressed once
+API_COMPRESSION_PREFIX = "/api/"
+API_COMPRESSION_CACHE = os.getenv("API_COMPRESSION_CACHE", "default")
+API_COMPRESSION_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Cache-Control of API routes (core/cache_control.py): route prefix ->
+# {max_age, s_maxage, stale_while_revalidate, stale_if_error} in seconds,
+# added to or overriding the built-in policies
+API_CACHE_POLICIES = {}
+
+# Built site settings payload (core/site_settings.py), dropped when the
+# settings or a linked page change
+SITE_SETTINGS_CACHE = os.getenv("SITE_SETTINGS_CACHE", "default")
+SITE_SETTINGS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Process-local hostname -> Site table (core/sites.py). Its version token
+# lives in SITE_MAP_CACHE, so processes sharing that cache reload it on
+# change; others reload it once it is SITE_MAP_MAX_AGE seconds old
+SITE_MAP_CACHE = os.getenv("SITE_MAP_CACHE", "default")
+SITE_MAP_MAX_AGE = 60
+
+# /api/v2/batch/ (core/batch.py): extra named request sets on top of the
+# built-in "app-shell" preset, and the most sub-requests per batch
+API_BATCH_PRESETS = {}
+API_BATCH_MAX_REQUESTS = 10
+
 # Allowed file extensions for Wagtail documents (keep/adjust as needed)
 WAGTAILDOCS_EXTENSIONS = [
     "csv", "docx", "key", "odt", "pdf", "pptx", "rtf", "txt", "xlsx", "zip"
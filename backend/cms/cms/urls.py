@@ -11,28 +11,44 @@ from wagtail.documents import urls as wagtaildocs_urls
 
 # Wagtail API v2 (Wagtail 7.x)
 from wagtail.api.v2.router import WagtailAPIRouter
-from wagtail.api.v2.views import PagesAPIViewSet
-from wagtail.images.api.v2.views import ImagesAPIViewSet
-from wagtail.documents.api.v2.views import DocumentsAPIViewSet
+from wagtail.images.views.serve import ServeView
 
 # Import custom API views
-from core.views import site_settings_api
+from core import async_views
+from core.views import (
+    HeadlessDocumentsAPIViewSet, HeadlessImagesAPIViewSet, HeadlessPagesAPIViewSet, api_batch,
+    site_settings_api,
+)
 
 api_router = WagtailAPIRouter("wagtailapi")
-api_router.register_endpoint("pages", PagesAPIViewSet)
-api_router.register_endpoint("images", ImagesAPIViewSet)
-api_router.register_endpoint("documents", DocumentsAPIViewSet)
+api_router.register_endpoint("pages", HeadlessPagesAPIViewSet)
+api_router.register_endpoint("images", HeadlessImagesAPIViewSet)
+api_router.register_endpoint("documents", HeadlessDocumentsAPIViewSet)
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("admin/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
 
+    # Signed rendition URLs (IMAGE_URL_MODE = "signed") - renders on first fetch
+    re_path(
+        r"^images/([^/]*)/(\d*)/([^/]*)/[^/]*$",
+        ServeView.as_view(action=settings.IMAGE_SERVE_ACTION),
+        name="wagtailimages_serve",
+    ),
+
     # API root
     path("api/v2/", api_router.urls),
     
     # Custom API endpoints
     path("api/v2/site-settings/", site_settings_api, name="site_settings_api"),
+    path("api/v2/batch/", api_batch, name="api_batch"),
+
+    # Async read endpoints (served without a thread per request under cms.asgi)
+    path("api/v2/async/site-settings/", async_views.site_settings_api, name="async_site_settings_api"),
+    path("api/v2/async/home/", async_views.home_api, name="async_home_api"),
+    path("api/v2/async/house-designs/", async_views.house_designs_api, name="async_house_designs_api"),
+    path("api/v2/async/search/", async_views.search_api, name="async_search_api"),
    
 
     # Wagtail page serving (keep this last)
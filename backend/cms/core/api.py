@@ -4,8 +4,10 @@ API Serialization Helpers for Wagtail Headless CMS
 Reusable methods and mixins for serializing Wagtail content to API responses.
 """
 
+from rest_framework import serializers
 from wagtail.api import APIField
 from wagtail.images.api.fields import ImageRenditionField
+from core.block_serializers import registry
 from core.utils import get_base_url, get_image_data
 
 
@@ -48,18 +50,8 @@ class HeadlessSerializerMixin:
         Returns:
             list: Serialized blocks
         """
-        if not streamfield_value:
-            return []
-        
-        serialized_blocks = []
-        for block in streamfield_value:
-            serialized_blocks.append({
-                'type': block.block_type,
-                'value': block.value,
-                'id': block.id,
-            })
-        
-        return serialized_blocks
+        context = registry.make_context(base_url=self.get_api_base_url(request))
+        return registry.serialize_stream(streamfield_value, context)
     
     def get_hero_data(self, hero_relation_name, request=None):
         """
@@ -116,6 +108,76 @@ class ImageSerializerMixin:
         ]
 
 
+def get_api_projection(instance, field_name):
+    """
+    Get the sub fields requested for an API field with the projection
+    syntax (e.g. ``fields=body_content_data(blog_section,quality_homes)``).
+    
+    Args:
+        instance: Model instance being serialized
+        field_name (str): API field name
+        
+    Returns:
+        list: Requested sub field names, or None for all of them
+    """
+    return getattr(instance, '_api_projection', {}).get(field_name)
+
+
+def is_api_field_requested(instance, field_name):
+    """Check whether an API field is part of the response being serialized."""
+    projection = getattr(instance, '_api_projection', None)
+    return projection is None or field_name in projection
+
+
+def project(data, fields):
+    """
+    Keep only the requested keys of a dict.
+    
+    Args:
+        data (dict): Serialized data
+        fields (list): Requested keys, or None for all of them
+        
+    Returns:
+        dict: Projected data
+    """
+    if fields is None or data is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
+
+
+class ProjectionSerializerMixin:
+    """
+    Serializer mixin telling the instance which API fields (and sub
+    fields) are being serialized, so projectable properties only compute
+    what was asked for. See ``HeadlessPagesAPIViewSet``.
+    """
+    
+    projections = {}
+    
+    def to_representation(self, instance):
+        instance._api_projection = {
+            field_name: self.projections.get(field_name)
+            for field_name in self.Meta.fields
+        }
+        return super().to_representation(instance)
+
+
+class StreamFieldSerializer(serializers.Field):
+    """
+    API field serializing a StreamField through the block serializer registry.
+    
+    Usage:
+        api_fields = [
+            APIField('body', serializer=StreamFieldSerializer()),
+        ]
+    """
+    
+    def to_representation(self, value):
+        request = self.context.get('request')
+        context = registry.make_context(base_url=get_base_url(request))
+        return registry.serialize_stream(value, context)
+
+
 def serialize_page_for_menu(page):
     """
     Serialize page for menu/navigation.
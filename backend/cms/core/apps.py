@@ -9,3 +9,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core Components'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,208 @@
+"""
+Async Read Endpoints for the Headless API
+
+Async versions of the reads the SPA makes (site settings, homepage, house
+designs, search), for deployments served through the ASGI entry point
+(cms/asgi.py). Lookups use the async ORM and cache API, and independent
+ones are awaited together with ``asyncio.gather()``, so a worker serves
+other requests while these wait on the database, cache or storage. The
+sync endpoints stay where they are.
+
+Code that only exists in sync form - serializing a homepage without a
+current snapshot, image placeholders, search backends - runs through
+``sync_to_async``.
+
+Usage:
+    GET /api/v2/async/site-settings/
+    GET /api/v2/async/home/
+    GET /api/v2/async/house-designs/
+    GET /api/v2/async/search/?query=...&limit=10
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from wagtail.models import Page
+
+from core import sites
+from core.cache_control import get_model_policy, set_policy
+from core.conditional import Validators, get_not_modified_response, make_validators, set_validators
+from core.links import PageLinkResolver
+from core.placeholders import get_placeholders
+from core.renderers import api_json_response
+from core.site_settings import aget_site_settings_payload
+from home.models import HomePage
+from house_designs.models import HouseCategory, HouseDesignsIndexPage
+
+
+async def alist(queryset):
+    """Evaluate a queryset with the async ORM."""
+    return [obj async for obj in queryset]
+
+
+def not_found_response(message='not found'):
+    return api_json_response({'message': message}, status=404)
+
+
+@require_safe
+async def site_settings_api(request):
+    """Async version of ``core.views.site_settings_api``."""
+    site = await sites.afind_for_request(request)
+    if site is None:
+        return api_json_response({'error': 'No site is configured for this host'}, status=404)
+
+    try:
+        payload = await aget_site_settings_payload(site)
+    except Exception as e:
+        return api_json_response(
+            {'error': f'Failed to load site settings: {str(e)}'},
+            status=500
+        )
+
+    validators = Validators(payload['etag'], payload['last_modified'])
+    not_modified = get_not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(HttpResponse(payload['body'], content_type='application/json'), validators)
+
+
+@require_safe
+async def home_api(request):
+    """
+    The homepage of the requesting site, with the fields of
+    ``/api/v2/pages/?type=home.HomePage&fields=title,hero_section_data,body_content_data``.
+    """
+    site = await sites.afind_for_request(request)
+    if site is None:
+        return not_found_response()
+    page = await HomePage.objects.live().descendant_of(site.root_page, inclusive=True).afirst()
+    if page is None:
+        return not_found_response()
+
+    stamp = ('page', page.pk, page.last_published_at, page.live_revision_id, page.content_type_id)
+    validators = await sync_to_async(make_validators)(request, stamp, page.last_published_at)
+    policy = get_model_policy([HomePage])
+    not_modified = get_not_modified_response(request, validators)
+    if not_modified is not None:
+        return set_policy(not_modified, policy)
+
+    snapshot = page.get_api_snapshot()
+    if snapshot is not None:
+        hero_section_data, body_content_data = snapshot['hero_section_data'], snapshot['body_content_data']
+    else:
+        hero_section_data, body_content_data = await asyncio.gather(
+            sync_to_async(page.build_hero_section_data)(),
+            sync_to_async(page.build_body_content_data)(),
+        )
+
+    response = api_json_response({
+        'id': page.pk,
+        'title': page.title,
+        'slug': page.slug,
+        'hero_section_data': hero_section_data,
+        'body_content_data': body_content_data,
+    })
+    return set_policy(set_validators(response, validators), policy)
+
+
+@require_safe
+async def house_designs_api(request):
+    """
+    The house designs index of the requesting site, with the fields of
+    ``/api/v2/pages/?type=house_designs.HouseDesignsIndexPage&fields=*``.
+    """
+    site = await sites.afind_for_request(request)
+    if site is None:
+        return not_found_response()
+
+    index_pages = HouseDesignsIndexPage.objects.live().descendant_of(site.root_page, inclusive=True)
+    page = await index_pages.select_related('hero_background_image').afirst()
+    if page is None:
+        return not_found_response()
+
+    # Snippet changes bump the generation the validators include
+    stamp = ('page', page.pk, page.last_published_at, page.live_revision_id, page.content_type_id)
+    validators = await sync_to_async(make_validators)(request, stamp, page.last_published_at)
+    policy = get_model_policy([HouseDesignsIndexPage])
+    not_modified = get_not_modified_response(request, validators)
+    if not_modified is not None:
+        return set_policy(not_modified, policy)
+
+    designs, categories = await asyncio.gather(
+        alist(HouseDesignsIndexPage.get_house_designs()),
+        alist(HouseCategory.objects.all()),
+    )
+
+    placeholders, hero_data = await asyncio.gather(
+        sync_to_async(get_placeholders)([design.featured_image for design in designs]),
+        sync_to_async(lambda: page.hero_data)(),
+    )
+    response = api_json_response({
+        'id': page.pk,
+        'title': page.title,
+        'slug': page.slug,
+        'intro_title': page.intro_title,
+        'intro_text': page.intro_text,
+        'designs_per_page': page.designs_per_page,
+        'hero_data': hero_data,
+        'house_designs_data': page.build_house_designs_data(designs, placeholders=placeholders),
+        'filter_options': page.build_filter_options(categories),
+    })
+    return set_policy(set_validators(response, validators), policy)
+
+
+@require_safe
+async def search_api(request):
+    """
+    Search the live pages of the requesting site.
+
+    Query parameters: ``query``, ``limit`` (at most WAGTAILAPI_LIMIT_MAX)
+    and ``offset``.
+
+    Returns ``{"meta": {"total_count"}, "items": [{"id", "title", "type", "url"}]}``.
+    """
+    site = await sites.afind_for_request(request)
+    if site is None:
+        return not_found_response()
+
+    limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20) or 20
+    try:
+        limit = int(request.GET.get('limit', min(20, limit_max)))
+        offset = int(request.GET.get('offset', 0))
+        if limit < 1 or offset < 0:
+            raise ValueError()
+    except ValueError:
+        return api_json_response({'message': 'limit and offset must be positive integers'}, status=400)
+    if limit > limit_max:
+        return api_json_response({'message': 'limit cannot be higher than %d' % limit_max}, status=400)
+
+    query = request.GET.get('query', '').strip()
+    if not query:
+        return api_json_response({'meta': {'total_count': 0}, 'items': []})
+
+    # Setting up the search backend may query too
+    pages = Page.objects.live().descendant_of(site.root_page, inclusive=True)
+    results = await sync_to_async(pages.search)(query)
+    pages, total_count = await asyncio.gather(
+        sync_to_async(list)(results[offset:offset + limit]),
+        sync_to_async(results.count)(),
+    )
+
+    def serialize():
+        links = PageLinkResolver(site=site)
+        links.add_pages(pages)
+        return [
+            {
+                'id': page.pk,
+                'title': page.title,
+                'type': page.specific_class._meta.label if page.specific_class else None,
+                'url': links.get_url(page),
+            }
+            for page in pages
+        ]
+
+    items = await sync_to_async(serialize)()
+    return api_json_response({'meta': {'total_count': total_count}, 'items': items})
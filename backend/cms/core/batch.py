@@ -0,0 +1,187 @@
+"""
+Batched API Requests for the Headless API
+
+Runs several GET requests against the existing ``/api/v2/`` routes in one
+server request, so the SPA's first paint does not wait on a waterfall of
+round trips (home page, site settings, house designs).
+
+Sub-requests are dispatched straight to the views (no middleware) with
+the caller's host, site, cookies and user. They share a per-batch cache
+- ``get_shared()`` - holding the site settings and the page link
+resolver, so page URLs resolved by one sub-request are reused by the
+next. Each rendered body is embedded as is, never re-parsed.
+
+Usage:
+    GET  /api/v2/batch/?preset=app-shell
+    POST /api/v2/batch/ {"preset": "app-shell", "requests": {"menu": "/api/v2/pages/?type=..."}}
+
+    {"responses": {"site_settings": {"status": 200, "body": {...}}, ...}}
+"""
+
+import contextvars
+import copy
+import json
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.http import Http404, QueryDict
+from django.urls import Resolver404, resolve
+
+from core import sites
+
+
+# Named request sets; API_BATCH_PRESETS adds or overrides presets
+PRESETS = {
+    # First load of the SPA (useSiteSettings, useHome, useHouseDesigns)
+    'app-shell': {
+        'site_settings': '/api/v2/site-settings/',
+        'home': '/api/v2/pages/?type=home.HomePage&fields=title,hero_section_data,body_content_data&limit=1',
+        'house_designs': '/api/v2/pages/?type=house_designs.HouseDesignsIndexPage&fields=*',
+    },
+}
+
+# Request headers a sub-request must not inherit from the batch request
+DROPPED_HEADERS = [
+    'CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE',
+    'HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE', 'HTTP_ACCEPT_ENCODING',
+]
+
+_shared = contextvars.ContextVar('api_batch_shared', default=None)
+
+
+class BatchError(ValueError):
+    """Invalid batch request."""
+
+
+@contextmanager
+def shared_cache():
+    """Share get_shared() values between everything run in the block."""
+    token = _shared.set({})
+    try:
+        yield
+    finally:
+        _shared.reset(token)
+
+
+def get_shared(key, factory):
+    """
+    Get a value shared by the sub-requests of a batch.
+
+    Args:
+        key: Cache key
+        factory: Callable building the value
+
+    Returns:
+        The shared value (a fresh ``factory()`` outside a batch)
+    """
+    cache = _shared.get()
+    if cache is None:
+        return factory()
+    if key not in cache:
+        cache[key] = factory()
+    return cache[key]
+
+
+def get_batch_requests(preset=None, requests=None):
+    """
+    Combine a preset and explicit sub-requests.
+
+    Args:
+        preset (str): Preset name (optional)
+        requests (dict): {name: path} (optional)
+
+    Returns:
+        dict: {name: path}
+    """
+    presets = {**PRESETS, **getattr(settings, 'API_BATCH_PRESETS', {})}
+    batch = {}
+    if preset:
+        if preset not in presets:
+            raise BatchError(f"unknown preset '{preset}'")
+        batch.update(presets[preset])
+    if requests:
+        if not isinstance(requests, dict) or not all(isinstance(path, str) for path in requests.values()):
+            raise BatchError("requests must map names to paths")
+        batch.update(requests)
+    if not batch:
+        raise BatchError("no requests given")
+
+    max_requests = getattr(settings, 'API_BATCH_MAX_REQUESTS', 10)
+    if len(batch) > max_requests:
+        raise BatchError(f"a batch cannot have more than {max_requests} requests")
+    return batch
+
+
+def run_batch(request, batch):
+    """
+    Run sub-requests one after the other with a shared cache.
+
+    Args:
+        request: The batch request
+        batch (dict): {name: path}
+
+    Returns:
+        bytes: JSON ``{"responses": {name: {"status", "body"}}}``
+    """
+    # Resolved once, inherited by every sub-request
+    sites.find_for_request(request)
+
+    parts = []
+    with shared_cache():
+        for name, path in batch.items():
+            status, body = run_sub_request(request, path)
+            parts.append(b'%s:{"status":%d,"body":%s}' % (json.dumps(name).encode(), status, body))
+    return b'{"responses":{%s}}' % b','.join(parts)
+
+
+def run_sub_request(request, path):
+    """
+    Run a GET request against an API route.
+
+    Returns:
+        tuple: (status code, JSON body bytes)
+    """
+    url = urlsplit(path)
+    if url.scheme or url.netloc or not url.path.startswith('/api/v2/'):
+        return 400, error_body("only /api/v2/ paths can be batched")
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return 404, error_body("not found")
+    if getattr(match.func, 'api_batch', False):
+        return 400, error_body("batches cannot be nested")
+
+    # Shallow copy: shares the user, session and resolved site
+    sub_request = copy.copy(request)
+    sub_request.method = 'GET'
+    sub_request.path = sub_request.path_info = url.path
+    sub_request.GET = QueryDict(url.query)
+    sub_request.META = {
+        **{key: value for key, value in request.META.items() if key not in DROPPED_HEADERS},
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'HTTP_ACCEPT': 'application/json',
+    }
+    sub_request.resolver_match = match
+
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    try:
+        response = view(sub_request, *match.args, **match.kwargs)
+    except Http404:
+        return 404, error_body("not found")
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    if response.status_code == 204 or not response.content:
+        return response.status_code, b'null'
+    if 'json' not in response.get('Content-Type', ''):
+        return response.status_code, error_body("response is not JSON")
+    return response.status_code, response.content
+
+
+def error_body(message):
+    return json.dumps({'message': message}).encode()
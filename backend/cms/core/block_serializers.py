@@ -0,0 +1,389 @@
+"""
+StreamField Block Serializers for Wagtail Headless CMS
+
+Registry of serializer classes keyed by block type, shared by every
+StreamField the API exposes (HomePage body, GeneralPage / LandingPage body,
+HouseDesign additional content).
+
+Serializing a stream happens in two steps:
+
+1. ``prepare()`` looks up memoized output of every block (keyed by block
+   id, a hash of the block content, base URL and site, and a generation
+   counter) and, for the blocks that need serializing, registers the
+   images they declare with the context's rendition resolver and the
+   pages they link to with its link resolver - so all of them resolve in
+   one batch.
+2. ``serialize_stream()`` serializes the remaining blocks and memoizes them.
+
+Block values are built from the raw JSON by the context's RawStreamLoader
+(one query per chosen model for the whole payload) rather than by reading
+the StreamValue; set BLOCK_SERIALIZER_RAW = False to read it instead.
+
+The generation counter is bumped whenever something block output embeds
+changes outside the block content (images, renditions, page titles/URLs),
+which invalidates every memoized block at once.
+
+Usage:
+    @registry.register('quality_homes')
+    class QualityHomesSerializer(BlockSerializer):
+        image_fields = [('features.image', 'features.image')]
+
+        def serialize(self, value):
+            ...
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.batch import get_shared
+from core.links import PageLinkResolver, iter_raw_page_ids
+from core.raw_streams import RawStreamLoader
+from core.utils import get_image_data
+
+
+GENERATION_KEY = 'block-serializer-generation'
+GENERATION_TIME_KEY = 'block-serializer-generation-time'
+
+
+def get_cache():
+    """Get the cache backend configured by BLOCK_SERIALIZER_CACHE."""
+    return caches[getattr(settings, 'BLOCK_SERIALIZER_CACHE', 'default')]
+
+
+def get_generation():
+    """Get the current generation of memoized block output."""
+    return get_generation_info()[0]
+
+
+def get_generation_info():
+    """
+    Get the current generation and when it started.
+
+    Returns:
+        tuple: (generation, UNIX time of the last bump)
+    """
+    cache = get_cache()
+    values = cache.get_many([GENERATION_KEY, GENERATION_TIME_KEY])
+    if GENERATION_KEY not in values:
+        # Start from the current time, so a flushed cache never brings back
+        # a generation (and the ETags built from it) used before
+        now = int(time.time())
+        cache.add(GENERATION_KEY, now, timeout=None)
+        cache.add(GENERATION_TIME_KEY, now, timeout=None)
+        values = cache.get_many([GENERATION_KEY, GENERATION_TIME_KEY])
+    return values.get(GENERATION_KEY, 0), values.get(GENERATION_TIME_KEY)
+
+
+def bump_generation():
+    """Invalidate all memoized block output."""
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, int(time.time()), timeout=None)
+    cache.set(GENERATION_TIME_KEY, int(time.time()), timeout=None)
+
+
+def iter_value_path(value, path):
+    """
+    Walk a block value along a dotted path, fanning out over list values.
+
+    Args:
+        value: StructValue (or list of them)
+        path (str): e.g. 'featured_post.image' or 'projects.image'
+
+    Yields:
+        Every value found at the end of the path
+    """
+    yield from _iter_keys(value, path.split('.'))
+
+
+def _iter_keys(value, keys):
+    if value is None:
+        return
+    if not hasattr(value, 'get'):
+        # ListBlock value - walk every item
+        for item in value:
+            yield from _iter_keys(item, keys)
+        return
+    child = value.get(keys[0])
+    if len(keys) == 1:
+        yield child
+    else:
+        yield from _iter_keys(child, keys[1:])
+
+
+class SerializationContext:
+    """
+    State shared by every block serialized for one payload: the rendition
+    resolver images are registered with, the page link resolver, the raw
+    StreamField loader, and memoization bookkeeping.
+    """
+
+    def __init__(self, resolver=None, base_url='http://127.0.0.1:8000', request=None, site=None):
+        self.resolver = resolver
+        self.base_url = base_url
+        if site is not None:
+            # Built for a given site, whatever the request
+            self.links = PageLinkResolver(site=site)
+        else:
+            # Shared by the sub-requests of an API batch
+            self.links = get_shared(('page_links', request is not None), lambda: PageLinkResolver(request))
+        self.loader = RawStreamLoader(self.links)
+        self.prepared = {}
+        self._generation = None
+
+    @property
+    def generation(self):
+        if self._generation is None:
+            self._generation = get_generation()
+        return self._generation
+
+    def image_data(self, image_obj, component_type, field_path='image'):
+        """Serialize an image with the configured image backend."""
+        if not image_obj:
+            return None
+        if registry.image_data is None:
+            return get_image_data(image_obj, self.base_url)
+        return registry.image_data(
+            image_obj, component_type, field_path, base_url=self.base_url, resolver=self.resolver
+        )
+
+    def page_link(self, page):
+        """
+        Serialize a linked page as {'id', 'title', 'url'}.
+
+        Returns:
+            dict: Page link data, or None if the page does not exist
+        """
+        return self.links.get_link(page)
+
+
+class BlockSerializer:
+    """
+    Base class for block serializers.
+
+    Subclasses declare the images their output needs as value paths (dots
+    walk struct children, list values fan out), so their renditions can be
+    resolved for all blocks of a payload up front:
+
+        image_fields: (value path, COMPONENT_IMAGE_MAPPING field path) pairs
+
+    Linked pages need no declaration - every PageChooserBlock in the raw
+    block value is registered with the context's link resolver - and
+    neither do other chooser values, which the RawStreamLoader fetches.
+
+    Bump ``version`` when the output format changes, so memoized output
+    from the previous version is not served.
+    """
+
+    image_fields = []
+    version = 1
+
+    def __init__(self, block_type, block, context):
+        self.block_type = block_type
+        self.block = block
+        self.context = context
+
+    def serialize(self, value):
+        """Convert a block value to its API representation."""
+        raise NotImplementedError
+
+    @classmethod
+    def iter_images(cls, value):
+        """Yield (image, field path) for every declared image in a block value."""
+        for value_path, field_path in cls.image_fields:
+            for image_obj in iter_value_path(value, value_path):
+                if image_obj:
+                    yield image_obj, field_path
+
+    def collect(self, value, raw_value):
+        """Register the related objects of a block value with the context."""
+        self.context.links.add(iter_raw_page_ids(self.block, raw_value))
+        if self.context.resolver is not None:
+            for image_obj, field_path in self.iter_images(value):
+                self.context.resolver.add(image_obj, self.block_type, field_path)
+
+    def image(self, image_obj, field_path='image'):
+        """Responsive image data for one of the declared image fields."""
+        return self.context.image_data(image_obj, self.block_type, field_path)
+
+    def page_link(self, page):
+        """Linked page as {'id', 'title', 'url'} (None if not set)."""
+        if not page:
+            return None
+        return self.context.page_link(page)
+
+    def page_url(self, page, default='/'):
+        """URL of a linked page."""
+        link = self.page_link(page)
+        return link['url'] if link else default
+
+    def cta(self, cta, default_text='Learn More'):
+        """Serialize a CTA struct (button text, external URL or page link)."""
+        return {
+            'button_text': cta.get('button_text', default_text),
+            'is_external_link': cta.get('is_external_link', False),
+            'external_url': cta.get('external_url', ''),
+            'page_link': self.page_link(cta.get('page_link')),
+        }
+
+
+class DefaultBlockSerializer(BlockSerializer):
+    """Wagtail's own API representation, for blocks without a serializer."""
+
+    def serialize(self, value):
+        return self.block.get_api_representation(value)
+
+
+class BlockSerializerRegistry:
+    """
+    Serializer classes keyed by block type name or block class.
+
+    Block classes win over names, so a name reused by unrelated
+    StreamFields (e.g. 'content') can still get the right serializer.
+    """
+
+    def __init__(self):
+        self._serializers = {}
+        # Image backend (set by the app owning IMAGE_CONFIGS): resolver class
+        # batching renditions and a function building responsive image data
+        self.resolver_class = None
+        self.image_data = None
+
+    def register(self, *keys):
+        """Class decorator registering a serializer for block names or classes."""
+        def decorator(serializer_class):
+            for key in keys:
+                self._serializers[key] = serializer_class
+            return serializer_class
+        return decorator
+
+    def set_image_backend(self, resolver_class, image_data):
+        """Configure how declared images are batched and serialized."""
+        self.resolver_class = resolver_class
+        self.image_data = image_data
+
+    def get(self, block_type, block=None):
+        """Get the serializer class for a block."""
+        if block is not None:
+            for block_class in type(block).__mro__:
+                if block_class in self._serializers:
+                    return self._serializers[block_class]
+        return self._serializers.get(block_type, DefaultBlockSerializer)
+
+    def make_context(self, **kwargs):
+        """Create a context using the configured resolver class."""
+        if 'resolver' not in kwargs and self.resolver_class is not None:
+            kwargs['resolver'] = self.resolver_class()
+        return SerializationContext(**kwargs)
+
+    def prepare(self, stream_value, context, block_types=None):
+        """
+        Look up memoized output and register the related objects of every
+        block that still has to be serialized.
+
+        Args:
+            stream_value: StreamValue
+            context (SerializationContext): Shared payload context
+            block_types (list): Only prepare blocks of these types (optional)
+        """
+        key = (id(stream_value), tuple(block_types) if block_types is not None else None)
+        if key in context.prepared:
+            return context.prepared[key]
+
+        entries = []
+        for index, raw in enumerate(stream_value.raw_data if stream_value else []):
+            block = stream_value.stream_block.child_blocks.get(raw['type'])
+            if block is None or (block_types is not None and raw['type'] not in block_types):
+                continue
+            serializer = self.get(raw['type'], block)(raw['type'], block, context)
+            entries.append({
+                'index': index,
+                'type': raw['type'],
+                'id': raw.get('id'),
+                'serializer': serializer,
+                'memo_key': self._make_memo_key(serializer, raw, context),
+            })
+
+        memo_keys = [entry['memo_key'] for entry in entries if entry['memo_key']]
+        memoized = get_cache().get_many(memo_keys) if memo_keys else {}
+        to_serialize = []
+        for entry in entries:
+            if entry['memo_key'] in memoized:
+                entry['value'] = memoized[entry['memo_key']]
+            else:
+                entry['raw_value'] = stream_value.raw_data[entry['index']]['value']
+                to_serialize.append(entry)
+
+        use_raw = getattr(settings, 'BLOCK_SERIALIZER_RAW', True)
+        if use_raw:
+            # Chooser values of every block are fetched together on first use
+            for entry in to_serialize:
+                context.loader.add(entry['serializer'].block, entry['raw_value'])
+        for entry in to_serialize:
+            if use_raw:
+                entry['block_value'] = context.loader.to_python(entry['serializer'].block, entry['raw_value'])
+            else:
+                entry['block_value'] = stream_value[entry['index']].value
+            entry['serializer'].collect(entry['block_value'], entry['raw_value'])
+
+        context.prepared[key] = entries
+        return entries
+
+    def serialize_stream(self, stream_value, context=None, block_types=None):
+        """
+        Serialize a StreamField value.
+
+        Args:
+            stream_value: StreamValue
+            context (SerializationContext): Shared payload context (optional)
+            block_types (list): Only serialize blocks of these types (optional)
+
+        Returns:
+            list: {'type', 'value', 'id'} dicts, one per block
+        """
+        if not stream_value:
+            return []
+        if context is None:
+            context = self.make_context()
+
+        entries = self.prepare(stream_value, context, block_types)
+        if context.resolver is not None:
+            context.resolver.resolve()
+        context.links.resolve()
+
+        blocks = []
+        to_memoize = {}
+        for entry in entries:
+            if 'value' not in entry:
+                entry['value'] = entry['serializer'].serialize(entry['block_value'])
+                if entry['memo_key']:
+                    to_memoize[entry['memo_key']] = entry['value']
+            blocks.append({'type': entry['type'], 'value': entry['value'], 'id': entry['id']})
+
+        if to_memoize:
+            get_cache().set_many(to_memoize, timeout=getattr(settings, 'BLOCK_SERIALIZER_CACHE_TIMEOUT', None))
+        return blocks
+
+    def _make_memo_key(self, serializer, raw, context):
+        if not raw.get('id'):
+            return None
+        # Image URLs embed the base URL and page link URLs are relative to
+        # the site, so both are part of the content
+        content_hash = hashlib.sha1(json.dumps(
+            [context.base_url, context.links.get_site_id(), raw['value']], sort_keys=True, cls=DjangoJSONEncoder,
+        ).encode()).hexdigest()
+        serializer_class = type(serializer)
+        return (
+            f"block-api:{context.generation}:{serializer_class.__module__}.{serializer_class.__qualname__}"
+            f":{serializer_class.version}:{raw['type']}:{raw['id']}:{content_hash}"
+        )
+
+
+registry = BlockSerializerRegistry()
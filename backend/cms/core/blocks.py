@@ -13,6 +13,7 @@ from wagtail.blocks import PageChooserBlock
 from wagtail.documents.blocks import DocumentChooserBlock
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.contrib.table_block.blocks import TableBlock
+from core.links import get_page_url
 import re
 import urllib.parse
 
@@ -121,7 +122,7 @@ class HrefStructValue(blocks.StructValue):
         free_link = self.get('free_link')
         
         if page_link:
-            return page_link.url
+            return get_page_url(page_link)
         elif external_link:
             return external_link
         elif document_link:
@@ -0,0 +1,114 @@
+"""
+Cache-Control Policies for the Headless API
+
+Every API route declares how long its responses may be reused:
+
+- max_age: by browsers
+- s_maxage: by shared caches (the reverse proxy, a CDN)
+- stale_while_revalidate: how long a shared cache may keep serving an
+  expired response while it fetches a fresh one (RFC 5861)
+- stale_if_error: how long it may serve an expired response while the
+  API fails
+
+APICacheControlMiddleware (core/middleware.py) applies the policy of the
+longest matching route prefix to successful GET and HEAD responses that
+set no Cache-Control of their own. A page type overrides directives with
+``api_cache_control`` next to its ``api_fields``; the pages endpoint
+applies it to detail responses and to listings filtered by ``type``.
+
+Pages and site settings responses carry validators (core/conditional.py),
+so an expired response is usually revalidated with a 304.
+
+Usage:
+    class HouseDesignsIndexPage(Page):
+        api_cache_control = {'s_maxage': 30, 'stale_while_revalidate': 60}
+
+    return set_policy(response, get_model_policy([model]))
+"""
+
+from django.conf import settings
+
+
+DIRECTIVES = ['max_age', 's_maxage', 'stale_while_revalidate', 'stale_if_error']
+
+# Route prefix -> policy; API_CACHE_POLICIES adds or overrides routes
+POLICIES = {
+    # Changes maybe weekly - dropped from the server cache on change
+    '/api/v2/site-settings/': {
+        'max_age': 300, 's_maxage': 3600, 'stale_while_revalidate': 86400, 'stale_if_error': 604800,
+    },
+    # Changes on every publish
+    '/api/v2/pages/': {
+        'max_age': 0, 's_maxage': 60, 'stale_while_revalidate': 300, 'stale_if_error': 86400,
+    },
+    # Async endpoints (core/async_views.py)
+    '/api/v2/async/site-settings/': {
+        'max_age': 300, 's_maxage': 3600, 'stale_while_revalidate': 86400, 'stale_if_error': 604800,
+    },
+    '/api/v2/async/': {
+        'max_age': 0, 's_maxage': 60, 'stale_while_revalidate': 300, 'stale_if_error': 86400,
+    },
+    '/api/v2/batch/': {
+        'max_age': 0, 's_maxage': 60, 'stale_while_revalidate': 300, 'stale_if_error': 86400,
+    },
+    '/api/v2/images/': {
+        'max_age': 300, 's_maxage': 3600, 'stale_while_revalidate': 86400, 'stale_if_error': 604800,
+    },
+    '/api/v2/documents/': {
+        'max_age': 300, 's_maxage': 3600, 'stale_while_revalidate': 86400, 'stale_if_error': 604800,
+    },
+}
+
+
+def get_route_policy(path):
+    """
+    Get the policy of the longest route prefix matching a path.
+
+    Returns:
+        dict: Policy, or None if no route matches
+    """
+    policies = {**POLICIES, **getattr(settings, 'API_CACHE_POLICIES', {})}
+    prefixes = [prefix for prefix in policies if path.startswith(prefix)]
+    if not prefixes:
+        return None
+    return policies[max(prefixes, key=len)]
+
+
+def get_model_policy(models):
+    """
+    Get the ``api_cache_control`` overrides of page types.
+
+    Args:
+        models (list): Page models a response holds
+
+    Returns:
+        dict: The shortest value of each directive across the models
+    """
+    policy = {}
+    for model in models:
+        for directive, value in (getattr(model, 'api_cache_control', None) or {}).items():
+            policy[directive] = min(value, policy.get(directive, value))
+    return policy
+
+
+def set_policy(response, policy):
+    """Override directives of the route policy for a response."""
+    if policy:
+        response.api_cache_control = policy
+    return response
+
+
+def get_response_policy(request, response):
+    """
+    Get the policy of a response: its route policy with the overrides
+    set by the view.
+
+    Returns:
+        dict: Directives with a value, or None if no policy applies
+    """
+    route_policy = get_route_policy(request.path)
+    overrides = getattr(response, 'api_cache_control', None)
+    if route_policy is None and overrides is None:
+        return None
+    policy = {**(route_policy or {}), **(overrides or {})}
+    return {directive: policy[directive] for directive in DIRECTIVES if policy.get(directive) is not None}
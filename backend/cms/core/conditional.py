@@ -0,0 +1,132 @@
+"""
+Conditional GET for the Headless API
+
+Validators (ETag and Last-Modified) of the pages endpoints, computed
+from a few columns before anything is serialized, so a repeat request
+from the SPA is answered with 304 Not Modified for the cost of one small
+query. The site settings payload is cached with its own validators
+(core/site_settings.py).
+
+A validator combines:
+- the content stamp: ``last_published_at`` and ``live_revision_id`` of
+  the page (for listings, their maxima and the live page count)
+- the block serializer generation, bumped whenever something payloads
+  embed from elsewhere changes (linked page titles/URLs, images,
+  renditions, placeholders, house design snippets)
+- everything else the response depends on: path, query string (fields,
+  filters, projections), host and negotiated format
+
+Usage:
+    validators = get_page_validators(request, pk)
+    response = get_not_modified_response(request, validators)
+    if response is not None:
+        return response
+    ...
+    return set_validators(response, validators)
+"""
+
+import hashlib
+from collections import namedtuple
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from wagtail.models import Page
+
+from core.block_serializers import get_generation_info
+
+
+Validators = namedtuple('Validators', ['etag', 'last_modified'])
+
+
+def make_validators(request, stamp, last_modified=None):
+    """
+    Build the validators of a response.
+
+    Args:
+        request: Django or DRF request
+        stamp: Content stamp (any repr-able value)
+        last_modified (datetime): Modification time of the content (optional)
+
+    Returns:
+        Validators: Quoted strong ETag and Last-Modified timestamp (or None)
+    """
+    generation, generation_time = get_generation_info()
+    accepted_renderer = getattr(request, 'accepted_renderer', None)
+    parts = [
+        stamp,
+        generation,
+        request.get_full_path(),
+        request.get_host(),
+        request.scheme,
+        accepted_renderer.format if accepted_renderer else None,
+    ]
+    etag = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    # Embedded content (images, linked pages) may have changed since
+    timestamps = [int(last_modified.timestamp()) if last_modified else None, generation_time]
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return Validators(quote_etag(etag), max(timestamps) if timestamps else None)
+
+
+def get_page_stamp(pk):
+    """
+    Content stamp of a page.
+
+    Returns:
+        tuple: (last_published_at, live_revision_id, content_type_id), None
+        if the page does not exist
+    """
+    return Page.objects.filter(pk=pk).values_list(
+        'last_published_at', 'live_revision_id', 'content_type_id'
+    ).first()
+
+
+def get_page_validators(request, pk, stamp=None):
+    """
+    Validators of a page detail response, None if the page does not exist.
+
+    Args:
+        stamp (tuple): ``get_page_stamp()`` of the page, if already loaded
+    """
+    if stamp is None:
+        stamp = get_page_stamp(pk)
+    if stamp is None:
+        return None
+    return make_validators(request, ('page', pk) + stamp, stamp[0])
+
+
+def get_listing_validators(request):
+    """Validators of a pages listing response."""
+    stamp = Page.objects.live().aggregate(
+        last_published_at=Max('last_published_at'),
+        live_revision_id=Max('live_revision_id'),
+        count=Count('pk'),
+    )
+    return make_validators(request, ('pages', sorted(stamp.items())), stamp['last_published_at'])
+
+
+def get_not_modified_response(request, validators):
+    """
+    Answer If-None-Match / If-Modified-Since.
+
+    Returns:
+        HttpResponse: 304 (or 412) response, None if the request has to be served
+    """
+    if validators is None:
+        return None
+    response = get_conditional_response(
+        request, etag=validators.etag, last_modified=validators.last_modified
+    )
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response, validators):
+    """Add the ETag and Last-Modified headers to a successful response."""
+    if validators is not None and (200 <= response.status_code < 300 or response.status_code == 304):
+        response.headers['ETag'] = validators.etag
+        if validators.last_modified is not None:
+            response.headers['Last-Modified'] = http_date(validators.last_modified)
+    return response
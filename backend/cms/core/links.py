@@ -0,0 +1,173 @@
+"""
+Page Link Resolution for Wagtail Headless CMS
+
+Resolves the URLs of linked pages in bulk. ``page.url`` looks the site
+root paths up again for every page; the resolver instead collects page
+ids (from raw StreamField data, before any page object is loaded), loads
+id, title and url_path for all of them with one query and builds the
+URLs from a single read of the site root paths.
+
+URLs match ``page.url``: relative when a single site is configured (or
+the page belongs to the requesting site), absolute otherwise, and None
+for pages outside every site.
+
+Usage:
+    links = PageLinkResolver(request)
+    links.add_stream(page.body)
+    links.get_link(page_id)  # {'id', 'title', 'url'}
+"""
+
+from django.urls import NoReverseMatch, reverse
+from wagtail.blocks import PageChooserBlock
+from wagtail.coreutils import WAGTAIL_APPEND_SLASH
+from wagtail.models import Page, Site
+
+from core import sites
+from core.raw_streams import iter_raw_choices
+
+
+def iter_raw_page_ids(block, value):
+    """
+    Yield the id of every page chosen anywhere in a raw block value.
+
+    Args:
+        block: Block definition the value belongs to
+        value: Raw (JSON) value, as stored in the database
+
+    Yields:
+        int: Page ids
+    """
+    for chooser_block, page_id in iter_raw_choices(block, value):
+        if isinstance(chooser_block, PageChooserBlock):
+            yield page_id
+
+
+def build_page_url(url_path, root_paths, current_site_id=None):
+    """
+    Build the URL of a page from its url_path, like ``Page.get_url()``.
+
+    Args:
+        url_path (str): Page url_path (e.g., '/home/about/')
+        root_paths (list): ``Site.get_site_root_paths()``
+        current_site_id (int): Site serving the request (optional)
+
+    Returns:
+        str: Page URL, or None if the page is not routable
+    """
+    possible_sites = [root for root in root_paths if url_path.startswith(root.root_path)]
+    if not possible_sites:
+        return None
+
+    site_id, root_path, root_url = possible_sites[0][:3]
+    if current_site_id is not None:
+        for root in possible_sites:
+            if root.site_id == current_site_id:
+                site_id, root_path, root_url = root[:3]
+                break
+
+    try:
+        page_path = reverse('wagtail_serve', args=(url_path[len(root_path):],))
+    except NoReverseMatch:
+        return None
+    if not WAGTAIL_APPEND_SLASH and page_path != '/':
+        page_path = page_path.rstrip('/')
+
+    num_sites = len({root.site_id for root in root_paths})
+    if site_id == current_site_id or num_sites == 1:
+        return page_path
+    return root_url + page_path
+
+
+def get_page_url(page):
+    """URL of an already loaded page, without the per-page site lookups."""
+    return build_page_url(page.url_path, Site.get_site_root_paths())
+
+
+class PageLinkResolver:
+    """
+    Batched page link lookup for a whole response.
+
+    Page ids registered with ``add()`` / ``add_stream()`` are loaded
+    together on the first lookup; pages that were not registered are
+    loaded (again in one go with anything else pending) when asked for.
+
+    URLs are relative for pages of ``site`` (default: the site of
+    ``request``, or of the request being served).
+    """
+
+    def __init__(self, request=None, site=None):
+        self.request = request
+        self.site = site
+        self._links = {}
+        self._pending = set()
+        self._root_paths = None
+        self._current_site_id = None
+        self._site_resolved = False
+
+    def add(self, page_ids):
+        """Register page ids to resolve."""
+        for page_id in page_ids:
+            if page_id not in self._links:
+                self._pending.add(page_id)
+
+    def add_stream(self, stream_value):
+        """Register every page linked from a StreamField value."""
+        if stream_value:
+            self.add(iter_raw_page_ids(stream_value.stream_block, stream_value.raw_data))
+
+    def add_pages(self, pages):
+        """Resolve already loaded pages without querying them again."""
+        for page in pages:
+            self._links[page.pk] = self._make_link(page.pk, page.title, page.url_path)
+            self._pending.discard(page.pk)
+
+    def resolve(self):
+        """Load every pending page with a single query."""
+        if not self._pending:
+            return
+
+        pages = Page.objects.filter(pk__in=self._pending).values_list('id', 'title', 'url_path')
+        for page_id, title, url_path in pages:
+            self._links[page_id] = self._make_link(page_id, title, url_path)
+        # Deleted pages resolve to no link
+        for page_id in self._pending:
+            self._links.setdefault(page_id, None)
+        self._pending.clear()
+
+    def get_site_id(self):
+        """Get the id of the site whose pages get relative URLs (None if none)."""
+        if not self._site_resolved:
+            site = self.site or sites.find_for_request(self.request or sites.get_current_request())
+            self._current_site_id = site.pk if site else None
+            self._site_resolved = True
+        return self._current_site_id
+
+    def _make_link(self, page_id, title, url_path):
+        if self._root_paths is None:
+            self._root_paths = Site.get_site_root_paths()
+        return {
+            'id': page_id,
+            'title': title,
+            'url': build_page_url(url_path, self._root_paths, self.get_site_id()),
+        }
+
+    def get_link(self, page):
+        """
+        Get a page link.
+
+        Args:
+            page: Page object or page id
+
+        Returns:
+            dict: {'id', 'title', 'url'}, or None if the page does not exist
+        """
+        page_id = getattr(page, 'pk', page)
+        if page_id not in self._links:
+            self._pending.add(page_id)
+            self.resolve()
+        return self._links[page_id]
+
+    def get_url(self, page, default=None):
+        """Get the URL of a page (default if the page does not exist)."""
+        link = self.get_link(page)
+        return link['url'] if link else default
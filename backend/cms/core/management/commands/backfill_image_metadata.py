@@ -0,0 +1,45 @@
+"""
+Store file size, hash and placeholders for images uploaded before these
+were persisted.
+
+API serialization reads these stored values instead of asking the storage
+backend or decoding the image, so run this once after deploying to fill
+in older images.
+
+Usage:
+    python manage.py backfill_image_metadata
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from wagtail.images import get_image_model
+
+from core.placeholders import compute_placeholder
+
+
+class Command(BaseCommand):
+    help = "Persist missing file size, hash and placeholders of original images"
+
+    def handle(self, *args, **options):
+        Image = get_image_model()
+        images = Image.objects.filter(Q(file_size__isnull=True) | Q(file_hash=''))
+
+        updated = 0
+        for image in images.iterator():
+            try:
+                image._set_image_file_metadata()
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"image {image.pk} skipped: {e}")
+                continue
+            image.save(update_fields=['file_size', 'file_hash'])
+            updated += 1
+
+        # compute_placeholder() skips images whose placeholder is up to date
+        computed = 0
+        for image_id in Image.objects.values_list('pk', flat=True).iterator():
+            try:
+                computed += compute_placeholder(image_id) is not None
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"image {image_id} placeholder skipped: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} images, computed {computed} placeholders"))
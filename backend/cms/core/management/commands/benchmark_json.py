@@ -0,0 +1,115 @@
+"""
+Benchmark the JSON backends of the headless API.
+
+Fetches the API payload of live pages (``/api/v2/pages/<id>/``) and the
+site settings through the real views, then renders each payload with
+every API_JSON_RENDERER backend. Only rendering is timed - serialization,
+queries and rendition lookups are identical for all backends.
+
+Reports median render time, output size and whether the backends decode
+to the same data as JSON, so runs on different branches can be compared.
+
+Usage:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --pages 3 7 --runs 50
+    python manage.py benchmark_json --output after.json
+"""
+
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from wagtail.models import Page, Site
+
+from core.renderers import BACKENDS, orjson, render_json
+
+
+class Command(BaseCommand):
+    help = "Benchmark the API JSON backends on real page payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, nargs='*',
+            help="Page ids to benchmark (default: every live page of the default site)",
+        )
+        parser.add_argument(
+            '--runs', type=int, default=20,
+            help="Measured renders per payload and backend",
+        )
+        parser.add_argument(
+            '--output',
+            help="Write the JSON results to this file instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+
+        backends = BACKENDS if orjson is not None else ['json']
+        if orjson is None:
+            self.stderr.write("orjson is not installed - only the 'json' backend is measured")
+
+        results = []
+        for name, data in self.get_payloads(options['pages']):
+            reference = json.loads(render_json(data, 'json'))
+            for backend in backends:
+                runs = []
+                for _ in range(options['runs']):
+                    start = time.perf_counter()
+                    output = render_json(data, backend)
+                    runs.append((time.perf_counter() - start) * 1000)
+                results.append({
+                    'payload': name,
+                    'backend': backend,
+                    'render_ms': round(statistics.median(runs), 3),
+                    'render_ms_min': round(min(runs), 3),
+                    'bytes': len(output),
+                    'identical': json.loads(output) == reference,
+                })
+                self.stderr.write(
+                    f"{name:<32} {backend:<7} {results[-1]['render_ms']:>9.3f} ms "
+                    f"{results[-1]['bytes']:>9} bytes"
+                )
+
+        output = json.dumps({'runs': options['runs'], 'results': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Results written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def get_payloads(self, page_ids):
+        """Yield (name, response data) for each page and the site settings."""
+        site = Site.objects.filter(is_default_site=True).first()
+        if page_ids is None:
+            pages = Page.objects.live().specific()
+            if site:
+                pages = pages.descendant_of(site.root_page, inclusive=True)
+        else:
+            pages = Page.objects.filter(pk__in=page_ids).specific()
+
+        factory = RequestFactory(SERVER_NAME=site.hostname if site else 'localhost')
+        for page in pages:
+            data = self.get_data(factory, f'/api/v2/pages/{page.pk}/')
+            if data is not None:
+                yield f"{type(page).__name__} {page.pk}", data
+
+        data = self.get_data(factory, reverse('site_settings_api'))
+        if data is not None:
+            yield "site settings", data
+
+    def get_data(self, factory, path):
+        """Call the view behind an API path and return its unrendered data."""
+        match = resolve(path)
+        response = match.func(factory.get(path), *match.args, **match.kwargs)
+        if response.status_code != 200:
+            self.stderr.write(f"Skipping {path}: HTTP {response.status_code}")
+            return None
+        if hasattr(response, 'data'):
+            return response.data
+        # Plain Django views are already rendered - decode the payload again
+        return json.loads(response.content)
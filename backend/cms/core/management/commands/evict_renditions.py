@@ -0,0 +1,37 @@
+"""
+Evict least recently used renditions past the disk budget.
+
+Run periodically (e.g. from cron); pre-generation also queues a check at
+most once per RENDITION_ACCESS_INTERVAL. Evicted renditions are rendered
+again the next time a payload needs them.
+
+Usage:
+    python manage.py evict_renditions
+    python manage.py evict_renditions --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.rendition_budget import enforce_budget, get_budget
+
+
+class Command(BaseCommand):
+    help = "Evict least recently used renditions once RENDITION_STORAGE_BUDGET is exceeded"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report what would be evicted",
+        )
+
+    def handle(self, *args, **options):
+        budget = get_budget()
+        if not budget:
+            self.stdout.write("No RENDITION_STORAGE_BUDGET set, nothing to do")
+            return
+
+        used, freed, evicted = enforce_budget(dry_run=options['dry_run'])
+        verb = "Would evict" if options['dry_run'] else "Evicted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{used} of {budget} bytes used. {verb} {evicted} renditions, {freed} bytes freed"
+        ))
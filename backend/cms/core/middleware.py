@@ -0,0 +1,216 @@
+"""
+Middleware for the Headless API
+
+SiteMiddleware resolves the site of each request from the in-process site
+map (core/sites.py) - no query per request.
+
+APICacheControlMiddleware sets the Cache-Control policy of API routes
+(core/cache_control.py).
+
+APICompressionMiddleware compresses API responses with Brotli (when the
+optional ``brotli`` package is installed) or gzip, following the
+client's Accept-Encoding.
+
+Responses with an ETag (pages and site settings, see core/conditional.py)
+are served again and again with the same body, so their compressed bytes
+are stored in the API_COMPRESSION_CACHE keyed by a hash of the body and
+the encoding: a payload is compressed once - at a higher level, since the
+cost is paid once - instead of once per request. The ETag does not cover
+everything a body embeds (e.g. house design snippets), so it is never
+used as the key.
+"""
+
+import gzip
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from core import cache_control, sites
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Not worth compressing below this size
+MIN_SIZE = 200
+
+# (per request, stored) compression levels
+GZIP_LEVELS = (6, 9)
+BROTLI_QUALITIES = (5, 11)
+
+
+def get_cache():
+    """Get the cache backend configured by API_COMPRESSION_CACHE."""
+    return caches[getattr(settings, 'API_COMPRESSION_CACHE', 'default')]
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header.
+
+    Args:
+        header (str): e.g. 'gzip, deflate, br;q=0.9'
+
+    Returns:
+        dict: Quality value per (lowercase) encoding
+    """
+    encodings = {}
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        if not encoding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[encoding.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(header):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header (None for neither)."""
+    encodings = parse_accept_encoding(header)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    for encoding in candidates:
+        quality = encodings.get(encoding, encodings.get('*', 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(content, encoding, stored=False):
+    """
+    Compress response content.
+
+    Args:
+        content (bytes): Response body
+        encoding (str): 'br' or 'gzip'
+        stored (bool): Use the (slower, smaller) level for stored bytes
+
+    Returns:
+        bytes: Compressed content
+    """
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITIES[stored])
+    return gzip.compress(content, compresslevel=GZIP_LEVELS[stored], mtime=0)
+
+
+class SiteMiddleware:
+    """
+    Store the site of each request on it (see ``Site.find_for_request()``)
+    and make the request available to ``sites.get_current_request()``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sites.find_for_request(request)
+        with sites.request_context(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        await sites.afind_for_request(request)
+        with sites.request_context(request):
+            return await self.get_response(request)
+
+
+class APICacheControlMiddleware(MiddlewareMixin):
+    """
+    Add the Cache-Control policy of its route to successful API GET and
+    HEAD responses that set none themselves.
+
+    Responses to signed-in users are private, so every response given a
+    policy varies on Cookie.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304):
+            return response
+        if response.has_header('Cache-Control'):
+            return response
+        policy = cache_control.get_response_policy(request, response)
+        if not policy:
+            return response
+
+        # Shared caches must not hand a public response to a signed-in
+        # user, or store the private one
+        patch_vary_headers(response, ('Cookie',))
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            # Never stored by shared caches
+            patch_cache_control(response, private=True, max_age=policy.get('max_age', 0))
+        else:
+            patch_cache_control(response, public=True, **policy)
+        return response
+
+
+class APICompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses (paths under API_COMPRESSION_PREFIX) with
+    Brotli or gzip, reusing stored bytes for responses with an ETag.
+    """
+
+    def process_response(self, request, response):
+        if not request.path.startswith(getattr(settings, 'API_COMPRESSION_PREFIX', '/api/')):
+            return response
+        if response.status_code == 304:
+            # Repeat the ETag the compressed 200 carried
+            if choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+                self.weaken_etag(response)
+            return response
+        if response.streaming or response.status_code != 200 or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.has_header('ETag'):
+            compressed = self.get_stored(response.content, encoding)
+        else:
+            compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        self.weaken_etag(response)
+        return response
+
+    def weaken_etag(self, response):
+        # The bytes differ per encoding - a weak ETag still matches
+        # If-None-Match (RFC 9110 Section 8.8.1), like Django's GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+    def get_stored(self, content, encoding):
+        """Compressed bytes of a response body, compressed once per body."""
+        cache = get_cache()
+        key = f"api-compressed:{encoding}:{hashlib.sha1(content).hexdigest()}"
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress(content, encoding, stored=True)
+            cache.set(key, compressed, timeout=getattr(settings, 'API_COMPRESSION_CACHE_TIMEOUT', None))
+        return compressed
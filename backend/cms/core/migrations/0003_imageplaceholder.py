@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_sitesettings_copyright_text_and_more'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagePlaceholder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lqip', models.TextField(help_text='Tiny preview image as a data URI')),
+                ('dominant_color', models.CharField(help_text="Dominant colour as a hex string (e.g., '#a0b1c2')", max_length=7)),
+                ('file_hash', models.CharField(blank=True, help_text='Hash of the image file the placeholder was computed from', max_length=40)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='placeholder', to='wagtailimages.image')),
+            ],
+        ),
+    ]
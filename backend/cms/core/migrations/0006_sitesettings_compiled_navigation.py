@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_sitesettings_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitesettings',
+            name='compiled_navigation',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
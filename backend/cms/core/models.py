@@ -12,6 +12,9 @@ from wagtail.fields import RichTextField
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from modelcluster.fields import ParentalKey
 
+from core.placeholders import get_placeholder_data
+from core.utils import get_image_url
+
 
 class PageAbstract(models.Model):
     """
@@ -181,10 +184,11 @@ class HeroAbstract(models.Model):
         # Add image data
         if self.image:
             data['background_image'] = {
-                'url': f"{base_url}{self.image.file.url}",
+                'url': get_image_url(self.image, base_url),
                 'alt': self.image.title,
                 'width': self.image.width,
                 'height': self.image.height,
+                **get_placeholder_data(self.image),
             }
         
         # Add button data
@@ -336,6 +340,14 @@ class SiteSettings(BaseSiteSetting):
     linkedin_url = models.URLField(blank=True)
     youtube_url = models.URLField(blank=True)
     
+    # Modification stamp of the settings and their compiled navigation -
+    # Last-Modified of the site settings payload (core/site_settings.py)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # Header and footer with resolved page links, compiled on save
+    # (core/navigation.py)
+    compiled_navigation = models.JSONField(default=dict, blank=True, editable=False)
+    
     panels = [
         MultiFieldPanel([
             FieldPanel('header_logo_text'),
@@ -365,3 +377,66 @@ class SiteSettings(BaseSiteSetting):
     class Meta:
         verbose_name = "Site Settings"
 
+
+
+class ImagePlaceholder(models.Model):
+    """
+    Precomputed placeholder data for a Wagtail image.
+    
+    A tiny blurred preview (LQIP) and the dominant colour, so the frontend
+    can paint something instantly while the real rendition loads. Computed
+    in the background when an image is uploaded or its file changes
+    (core/placeholders.py) - never during a request.
+    """
+    
+    image = models.OneToOneField(
+        'wagtailimages.Image',
+        on_delete=models.CASCADE,
+        related_name='placeholder',
+    )
+    
+    lqip = models.TextField(
+        help_text="Tiny preview image as a data URI"
+    )
+    
+    dominant_color = models.CharField(
+        max_length=7,
+        help_text="Dominant colour as a hex string (e.g., '#a0b1c2')"
+    )
+    
+    file_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        help_text="Hash of the image file the placeholder was computed from"
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Placeholder for {self.image}"
+
+
+class RenditionAccess(models.Model):
+    """
+    When a rendition was last used by an API payload.
+    
+    Keyed like Wagtail renditions (image, filter spec, focal point key) so
+    rows survive a rendition being evicted and regenerated. Used to evict
+    the least recently used renditions (core/rendition_budget.py).
+    """
+    
+    image = models.ForeignKey(
+        'wagtailimages.Image',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    
+    filter_spec = models.CharField(max_length=255, db_index=True)
+    focal_point_key = models.CharField(max_length=16, blank=True, default='')
+    last_accessed = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        unique_together = [('image', 'filter_spec', 'focal_point_key')]
+    
+    def __str__(self):
+        return f"{self.image_id} {self.filter_spec}"
@@ -0,0 +1,195 @@
+"""
+Compiled Navigation for the Site Settings
+
+The header menu (NavigationBlock / SubMenuItemBlock) and the footer
+(FooterBlock / FooterColumnBlock / FooterLinkBlock) are compiled when
+SiteSettings are saved, straight from the raw StreamField data: every
+linked page is loaded with one query, its URL is built for the site of
+the settings, and links to deleted or unpublished pages are flagged. The
+result is stored in ``SiteSettings.compiled_navigation``, so building the
+site settings payload (core/site_settings.py) walks no blocks and loads
+no pages.
+
+Settings linking to a page (or a descendant) are compiled again when it
+is published, unpublished, deleted or moved, and all settings when a site
+changes (core/signals.py).
+
+Format:
+    {
+        'header': [{'label', 'aria_label', 'link', 'subItems'}],
+        'footer': [{'type', 'columns' | 'content' | 'contact'}],
+        'page_paths': [tree path of each linked page],
+        'broken_links': [{'location', 'page_id', 'reason'}],
+    }
+
+Flagged links ('deleted' or 'unpublished' pages) are served as ''.
+"""
+
+import logging
+
+from wagtail.models import Page, Site
+from wagtail.rich_text import expand_db_html
+
+from core.links import build_page_url, iter_raw_page_ids
+
+
+logger = logging.getLogger(__name__)
+
+
+def iter_list_items(block, value):
+    """Yield the raw item values of a ListBlock value (either storage format)."""
+    for item in value or []:
+        yield item['value'] if block._item_is_in_block_format(item) else item
+
+
+class NavigationCompiler:
+    """
+    Compile the navigation of one SiteSettings instance.
+
+    Args:
+        settings (SiteSettings): Settings to compile (saved or not)
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.pages = {}
+        self.broken_links = []
+
+    def compile(self):
+        """
+        Returns:
+            dict: Compiled navigation (see module docstring)
+        """
+        settings = self.settings
+        streams = [settings.header_menu_items, settings.footer_content]
+        page_ids = set()
+        for stream_value in streams:
+            if stream_value:
+                page_ids.update(iter_raw_page_ids(stream_value.stream_block, stream_value.raw_data))
+
+        # Every linked page with one query
+        root_paths = Site.get_site_root_paths()
+        pages = Page.objects.filter(pk__in=page_ids).values_list('id', 'path', 'url_path', 'live')
+        for page_id, path, url_path, live in pages:
+            self.pages[page_id] = {
+                'path': path,
+                'url': build_page_url(url_path, root_paths, settings.site_id),
+                'live': live,
+            }
+
+        return {
+            'header': self.compile_header(settings.header_menu_items),
+            'footer': self.compile_footer(settings.footer_content),
+            'page_paths': sorted(page['path'] for page in self.pages.values()),
+            'broken_links': self.broken_links,
+        }
+
+    def get_link(self, value, location):
+        """Resolved link of a raw link value (chosen page first, then URL)."""
+        page_id = value.get('page')
+        if not page_id:
+            return value.get('link') or ''
+
+        page = self.pages.get(page_id)
+        reason = None
+        if page is None:
+            reason = 'deleted'
+        elif not page['live']:
+            reason = 'unpublished'
+        if reason:
+            self.broken_links.append({'location': location, 'page_id': page_id, 'reason': reason})
+            return ''
+        return page['url'] or ''
+
+    def compile_header(self, stream_value):
+        if not stream_value:
+            return []
+        menu_block = stream_value.stream_block.child_blocks['menu_item']
+        sub_items_block = menu_block.child_blocks['sub_items']
+
+        header_menu = []
+        for child in stream_value.raw_data:
+            value = child['value'] or {}
+            location = f"Header > {value.get('label', '')}"
+            item_data = {
+                'label': value.get('label', ''),
+                'aria_label': value.get('aria_label', ''),
+                'link': self.get_link(value, location),
+            }
+
+            sub_items = list(iter_list_items(sub_items_block, value.get('sub_items')))
+            if sub_items:
+                item_data['subItems'] = [
+                    {
+                        'label': sub_item.get('label', ''),
+                        'link': self.get_link(sub_item, f"{location} > {sub_item.get('label', '')}"),
+                    }
+                    for sub_item in sub_items
+                ]
+
+            header_menu.append(item_data)
+        return header_menu
+
+    def compile_footer(self, stream_value):
+        if not stream_value:
+            return []
+        footer_block = stream_value.stream_block.child_blocks['footer_section']
+        columns_block = footer_block.child_blocks['columns']
+        links_block = columns_block.child_block.child_blocks['links']
+
+        settings = self.settings
+        footer_sections = []
+        for child in stream_value.raw_data:
+            value = child['value'] or {}
+            section_type = value.get('section_type') or 'columns'
+            section_data = {'type': section_type}
+
+            if section_type == 'columns':
+                section_data['columns'] = []
+                for column in iter_list_items(columns_block, value.get('columns')):
+                    location = f"Footer > {column.get('heading', '')}"
+                    section_data['columns'].append({
+                        'heading': column.get('heading', ''),
+                        'links': [
+                            {
+                                'text': link.get('text', ''),
+                                'link': self.get_link(link, f"{location} > {link.get('text', '')}"),
+                            }
+                            for link in iter_list_items(links_block, column.get('links'))
+                        ],
+                    })
+
+            elif section_type == 'text':
+                section_data['content'] = expand_db_html(value.get('content') or '')
+
+            elif section_type == 'contact':
+                section_data['contact'] = {
+                    'show_email': value.get('show_email', True),
+                    'show_phone': value.get('show_phone', True),
+                    'show_address': value.get('show_address', True),
+                    'email': settings.contact_email,
+                    'phone': settings.contact_phone,
+                    'address': settings.contact_address,
+                }
+
+            footer_sections.append(section_data)
+        return footer_sections
+
+
+def compile_navigation(settings):
+    """
+    Compile the navigation of site settings, logging flagged links.
+
+    Args:
+        settings (SiteSettings): Settings to compile
+
+    Returns:
+        dict: Compiled navigation (see module docstring)
+    """
+    navigation = NavigationCompiler(settings).compile()
+    for broken_link in navigation['broken_links']:
+        logger.warning(
+            "Site settings of site %s link to a %s page (%s, page %s)",
+            settings.site_id, broken_link['reason'], broken_link['location'], broken_link['page_id'],
+        )
+    return navigation
@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) Pagination for the Headless API
+
+Offset pagination scans and discards every row before the offset, and
+shifts items between pages while editors publish. Keyset pagination
+instead remembers the sort key of the last item served and asks for the
+rows after it, which uses the index on the sort key at every depth and
+never skips or repeats an item.
+
+The cursor is opaque to clients (URL-safe base64 of the ordering name and
+the sort key of the last item). Orderings always end in a unique field,
+so the order is total and stable.
+
+Usage (any DRF / Wagtail API listing):
+    paginator = CursorPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
+Query parameters:
+    cursor  '' for the first page, then meta.next_cursor of the previous one
+    order   one of CursorPagination.orderings (default 'path')
+    limit   page size (at most WAGTAILAPI_LIMIT_MAX)
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset pagination over a fixed set of orderings.
+
+    Nullable sort fields sort their nulls last in both directions.
+    """
+
+    # Ordering name -> (field, descending) keys, ending in a unique field
+    orderings = {
+        'path': [('path', False)],
+        'last_published_at': [('last_published_at', False), ('id', False)],
+        '-last_published_at': [('last_published_at', True), ('id', True)],
+    }
+    default_ordering = 'path'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        cursor = self.decode_cursor(request.GET['cursor']) if request.GET.get('cursor') else None
+
+        # Later pages keep the order of the cursor
+        ordering = request.GET.get('order') or (cursor[0] if cursor else self.default_ordering)
+        if ordering not in self.orderings:
+            raise BadRequestError(
+                "cursor pagination can only order by %s" % ", ".join(sorted(self.orderings))
+            )
+        keys = self.orderings[ordering]
+
+        if cursor:
+            if cursor[0] != ordering:
+                raise BadRequestError("cursor was created with a different order")
+            values = self.get_cursor_values(cursor[1], queryset.model, keys)
+            queryset = queryset.filter(self.get_after_filter(queryset.model, keys, values))
+
+        queryset = queryset.order_by(*[
+            F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+            for field, descending in keys
+        ])
+        # One extra row tells whether there is a next page
+        items = list(queryset[:limit + 1])
+
+        self.next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            self.next_cursor = self.encode_cursor(ordering, [getattr(items[-1], field) for field, _ in keys])
+        return items
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('meta', OrderedDict([
+                ('next_cursor', self.next_cursor),
+            ])),
+            ('items', data),
+        ]))
+
+    def get_limit(self, request):
+        limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20)
+        try:
+            limit = int(request.GET.get('limit', 20 if not limit_max else min(20, limit_max)))
+            if limit < 1:
+                raise ValueError()
+        except ValueError:
+            raise BadRequestError("limit must be a positive integer")
+        if limit_max and limit > limit_max:
+            raise BadRequestError("limit cannot be higher than %d" % limit_max)
+        return limit
+
+    def get_after_filter(self, model, keys, values):
+        """
+        Filter matching the rows after a sort key: for keys k1..kn, rows
+        equal on k1..ki-1 and after the cursor on ki, for any i.
+        """
+        after = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(keys, values):
+            nullable = model._meta.get_field(field).null
+            if value is None:
+                # Nulls sort last - only other nulls can follow
+                same = Q(**{f'{field}__isnull': True})
+            else:
+                beyond = Q(**{f'{field}__lt' if descending else f'{field}__gt': value})
+                if nullable:
+                    beyond |= Q(**{f'{field}__isnull': True})
+                after |= equal & beyond
+                same = Q(**{field: value})
+            equal &= same
+        return after
+
+    def encode_cursor(self, ordering, values):
+        # Full precision - DjangoJSONEncoder would round datetimes to milliseconds
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        data = json.dumps([ordering, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Returns:
+            tuple: (ordering name, raw sort key values)
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            ordering, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(ordering, str) or not isinstance(values, list):
+                raise ValueError()
+        except (binascii.Error, TypeError, ValueError):
+            raise BadRequestError("invalid cursor")
+        return ordering, values
+
+    def get_cursor_values(self, values, model, keys):
+        """Convert the sort key values of a cursor back to Python values."""
+        if len(values) != len(keys):
+            raise BadRequestError("invalid cursor")
+        try:
+            return [
+                None if value is None else model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(keys, values)
+            ]
+        except ValidationError:
+            raise BadRequestError("invalid cursor")
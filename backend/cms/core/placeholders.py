@@ -0,0 +1,191 @@
+"""
+Image Placeholders for Wagtail Headless CMS
+
+Computes a low-quality image placeholder (a tiny WebP data URI) and the
+dominant colour of each image in the background worker pool, and reads the
+stored values back for API payloads. Nothing is computed during requests.
+
+Lookups go through the rendition URL cache, keyed by the image file hash,
+so warm requests do not query the placeholders table either.
+"""
+
+import base64
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image as PILImage, ImageOps
+
+from core import rendition_cache
+from core.workers import run_on_commit
+
+
+# Longest side of the LQIP preview, in pixels
+LQIP_SIZE = 16
+LQIP_QUALITY = 40
+
+# Size the image is reduced to before picking the dominant colour
+DOMINANT_COLOR_SAMPLE_SIZE = 64
+
+EMPTY_PLACEHOLDER = {'lqip': None, 'dominant_color': None}
+
+# Images without a placeholder are looked up again after this many seconds
+MISS_CACHE_TIMEOUT = 60
+
+
+def make_cache_key(image):
+    """Build the cache key for the placeholder of an image file."""
+    return f"image-placeholder:{image.pk}:{image.file_hash}"
+
+
+def compute_placeholder(image_id):
+    """
+    Compute and store the placeholder of one image (runs in a worker process).
+    
+    Args:
+        image_id (int): Wagtail image id
+        
+    Returns:
+        tuple: (cache key, placeholder) if a placeholder was (re)computed,
+            otherwise None
+    """
+    from wagtail.images import get_image_model
+    from core.models import ImagePlaceholder
+    
+    Image = get_image_model()
+    try:
+        image = Image.objects.get(pk=image_id)
+    except Image.DoesNotExist:
+        return None
+    
+    existing = ImagePlaceholder.objects.filter(image=image).first()
+    if existing and image.file_hash and existing.file_hash == image.file_hash:
+        return None
+    
+    with image.open_file() as f, PILImage.open(f) as source:
+        source = ImageOps.exif_transpose(source).convert('RGB')
+        source.thumbnail((DOMINANT_COLOR_SAMPLE_SIZE, DOMINANT_COLOR_SAMPLE_SIZE))
+        dominant_color = get_dominant_color(source)
+        
+        source.thumbnail((LQIP_SIZE, LQIP_SIZE))
+        buffer = BytesIO()
+        source.save(buffer, format='WEBP', quality=LQIP_QUALITY)
+    
+    lqip = f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+    ImagePlaceholder.objects.update_or_create(image=image, defaults={
+        'lqip': lqip,
+        'dominant_color': dominant_color,
+        'file_hash': image.file_hash,
+    })
+    return make_cache_key(image), {'lqip': lqip, 'dominant_color': dominant_color}
+
+
+def store_placeholder(result):
+    """
+    Cache a placeholder computed by compute_placeholder() and drop the
+    memoized block output that went without it (runs in the process that
+    queued the job - a worker's cache is its own).
+    
+    Args:
+        result (tuple): Return value of compute_placeholder()
+    """
+    from core.block_serializers import bump_generation
+    
+    if result is None:
+        return
+    key, placeholder = result
+    rendition_cache.get_cache().set(
+        key, placeholder, timeout=getattr(settings, 'RENDITION_URL_CACHE_TIMEOUT', None),
+    )
+    bump_generation()
+
+
+def get_dominant_color(pil_image):
+    """
+    Get the most common colour of an image, after reducing it to a small palette.
+    
+    Args:
+        pil_image: RGB Pillow image
+        
+    Returns:
+        str: Hex colour (e.g., '#a0b1c2')
+    """
+    paletted = pil_image.quantize(colors=5)
+    _, index = max(paletted.getcolors())
+    red, green, blue = paletted.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def schedule_placeholders(image_ids):
+    """
+    Queue placeholder jobs once the current transaction has committed.
+    
+    Args:
+        image_ids (list): Wagtail image ids
+    """
+    if not getattr(settings, 'IMAGE_PLACEHOLDERS', True):
+        return
+    run_on_commit(compute_placeholder, [(image_id,) for image_id in image_ids], on_done=store_placeholder)
+
+
+def get_placeholders(images):
+    """
+    Bulk-read stored placeholders - cache first, then one query for the rest.
+    
+    Images without an up-to-date placeholder (not computed yet, or computed
+    from a previous file) get None values.
+    
+    Args:
+        images (list): Wagtail Image objects
+        
+    Returns:
+        dict: image id -> {'lqip': ..., 'dominant_color': ...}
+    """
+    from core.models import ImagePlaceholder
+    
+    images = {image.pk: image for image in images if image}
+    if not images:
+        return {}
+    
+    cache = rendition_cache.get_cache()
+    keys = {make_cache_key(image): pk for pk, image in images.items()}
+    placeholders = {keys[key]: value for key, value in cache.get_many(keys.keys()).items()}
+    
+    missing = [pk for pk in images if pk not in placeholders]
+    if missing:
+        stored = {
+            placeholder.image_id: placeholder
+            for placeholder in ImagePlaceholder.objects.filter(image_id__in=missing)
+        }
+        found, not_found = {}, {}
+        for pk in missing:
+            placeholder = stored.get(pk)
+            if placeholder and placeholder.file_hash == images[pk].file_hash:
+                value = found[make_cache_key(images[pk])] = {
+                    'lqip': placeholder.lqip, 'dominant_color': placeholder.dominant_color,
+                }
+            else:
+                # Remember the miss only briefly - the placeholder is written
+                # by a job or command whose cache writes may not reach this one
+                value = not_found[make_cache_key(images[pk])] = {}
+            placeholders[pk] = value
+        if found:
+            cache.set_many(found, timeout=getattr(settings, 'RENDITION_URL_CACHE_TIMEOUT', None))
+        if not_found:
+            cache.set_many(not_found, timeout=MISS_CACHE_TIMEOUT)
+    
+    return {pk: {**EMPTY_PLACEHOLDER, **value} for pk, value in placeholders.items()}
+
+
+def get_placeholder_data(image):
+    """
+    Get the stored placeholder of a single image.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        dict: {'lqip': ..., 'dominant_color': ...} (None values if not computed yet)
+    """
+    if not image:
+        return dict(EMPTY_PLACEHOLDER)
+    return get_placeholders([image])[image.pk]
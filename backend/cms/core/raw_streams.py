@@ -0,0 +1,158 @@
+"""
+Raw StreamField Loading for Wagtail Headless CMS
+
+Builds block values straight from the raw JSON a StreamField stores.
+Reading a StreamValue converts every block type separately, running one
+query per chooser field and block type. The loader instead collects every
+chooser id across all registered raw values first, fetches them with one
+query per model, and builds the block values with the fetched objects.
+
+Struct, list and stream blocks are rebuilt here (keeping custom value
+classes such as HrefStructValue); any other block converts its own raw
+value with ``to_python()``, which for non-chooser blocks needs no query.
+
+Usage:
+    loader = RawStreamLoader()
+    loader.add_stream(page.body)
+    for child in page.body.raw_data:
+        value = loader.to_python(page.body.stream_block.child_blocks[child['type']], child['value'])
+"""
+
+from collections import defaultdict
+
+from wagtail.blocks import ChooserBlock, ListBlock, StreamBlock, StreamValue, StructBlock
+from wagtail.blocks.list_block import ListValue
+from wagtail.models import Page
+
+
+def iter_raw_choices(block, value):
+    """
+    Yield every chooser value anywhere in a raw block value.
+
+    Args:
+        block: Block definition the value belongs to
+        value: Raw (JSON) value, as stored in the database
+
+    Yields:
+        tuple: (chooser block, chosen object id)
+    """
+    if value is None:
+        return
+    if isinstance(block, ChooserBlock):
+        if value:
+            yield block, value
+    elif isinstance(block, StreamBlock):
+        for child in value:
+            child_block = block.child_blocks.get(child.get('type'))
+            if child_block is not None:
+                yield from iter_raw_choices(child_block, child.get('value'))
+    elif isinstance(block, StructBlock):
+        if _has_custom_to_python(block, StructBlock):
+            return
+        for name, child_block in block.child_blocks.items():
+            yield from iter_raw_choices(child_block, value.get(name))
+    elif isinstance(block, ListBlock):
+        for item in value:
+            if block._item_is_in_block_format(item):
+                item = item['value']
+            yield from iter_raw_choices(block.child_block, item)
+
+
+def _has_custom_to_python(block, base):
+    """Whether a block converts raw values its own way (e.g. ImageBlock)."""
+    return type(block).to_python is not base.to_python
+
+
+class RawStreamLoader:
+    """
+    Bulk loader of the objects chosen in raw StreamField data.
+
+    Raw values registered with ``add()`` / ``add_stream()`` are loaded
+    together on the first ``to_python()`` call. Values converted without
+    being registered still work - their objects are loaded then, again
+    in one go with anything else pending.
+    """
+
+    def __init__(self, links=None):
+        # Page link resolver primed with the loaded pages (optional)
+        self.links = links
+        self._objects = defaultdict(dict)
+        self._pending = defaultdict(set)
+
+    def add(self, block, value):
+        """Register the chooser values of a raw block value."""
+        for chooser_block, object_id in iter_raw_choices(block, value):
+            model = chooser_block.model_class
+            if object_id not in self._objects[model]:
+                self._pending[model].add(object_id)
+
+    def add_stream(self, stream_value):
+        """Register the chooser values of a whole StreamField value."""
+        if stream_value:
+            self.add(stream_value.stream_block, stream_value.raw_data)
+
+    def load(self):
+        """Fetch every pending object with one query per model."""
+        for model, object_ids in self._pending.items():
+            if not object_ids:
+                continue
+            objects = model._default_manager.in_bulk(object_ids)
+            self._objects[model].update(objects)
+            # Objects that no longer exist resolve to None
+            for object_id in object_ids:
+                self._objects[model].setdefault(object_id, None)
+            if self.links is not None and issubclass(model, Page):
+                self.links.add_pages(objects.values())
+        self._pending.clear()
+
+    def to_python(self, block, value):
+        """
+        Convert a raw block value to its native value.
+
+        Args:
+            block: Block definition the value belongs to
+            value: Raw (JSON) value
+
+        Returns:
+            Native block value (StructValue, ListValue, StreamValue, model
+            instance, ...)
+        """
+        self.add(block, value)
+        if any(self._pending.values()):
+            self.load()
+        return self._to_python(block, value)
+
+    def _to_python(self, block, value):
+        if isinstance(block, ChooserBlock):
+            return self._objects[block.model_class].get(value) if value else None
+
+        if isinstance(block, StreamBlock) and not _has_custom_to_python(block, StreamBlock):
+            return StreamValue(block, [
+                (child['type'], self._to_python(block.child_blocks[child['type']], child.get('value')), child.get('id'))
+                for child in value or []
+                if child.get('type') in block.child_blocks
+            ])
+
+        if isinstance(block, StructBlock) and not _has_custom_to_python(block, StructBlock):
+            value = value or {}
+            return block._to_struct_value([
+                (
+                    name,
+                    # Defaults are already native values
+                    self._to_python(child_block, value[name]) if name in value else child_block.get_default(),
+                )
+                for name, child_block in block.child_blocks.items()
+            ])
+
+        if isinstance(block, ListBlock) and not _has_custom_to_python(block, ListBlock):
+            bound_blocks = []
+            for item in value or []:
+                item_id = None
+                if block._item_is_in_block_format(item):
+                    item_id, item = item['id'], item['value']
+                bound_blocks.append(ListValue.ListChild(
+                    block.child_block, self._to_python(block.child_block, item), id=item_id,
+                ))
+            return ListValue(block, bound_blocks=bound_blocks)
+
+        return block.to_python(value)
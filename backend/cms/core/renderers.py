@@ -0,0 +1,93 @@
+"""
+JSON Rendering for the Headless API
+
+Renders every ``/api/v2/`` response (Wagtail API endpoints and the custom
+views such as site settings). The backend is chosen with API_JSON_RENDERER:
+
+    'orjson'  orjson, several times faster on large StreamField payloads
+              (falls back to 'json' when orjson is not installed)
+    'json'    the standard library with DRF's encoder (previous behaviour)
+
+Both backends produce the same JSON: values orjson does not encode itself
+(Decimal, date/time, lazy translation strings, querysets, ...) go through
+DRF's encoder, so e.g. ``HouseDesign.base_price`` renders as a number and
+datetimes keep DRF's ISO 8601 format. U+2028 and U+2029, which orjson
+leaves as they are, are escaped like DRF does, so the output is also
+safe to embed in a <script>.
+
+Usage:
+    return api_json_response({'header': ...})
+
+Compare the backends with ``python manage.py benchmark_json``.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKENDS = ['orjson', 'json']
+
+# UTF-8 of U+2028 / U+2029
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+_encoder = JSONEncoder()
+
+
+def get_backend():
+    """Get the configured JSON backend, 'json' if orjson is unavailable."""
+    backend = getattr(settings, 'API_JSON_RENDERER', 'orjson')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown API_JSON_RENDERER {backend!r}, expected one of {BACKENDS}")
+    if backend == 'orjson' and orjson is None:
+        return 'json'
+    return backend
+
+
+def render_json(data, backend=None):
+    """
+    Encode data as compact UTF-8 JSON.
+
+    Args:
+        data: JSON-compatible data (DRF encoder types allowed)
+        backend (str): 'orjson' or 'json' (default: API_JSON_RENDERER)
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    if (backend or get_backend()) == 'orjson':
+        content = orjson.dumps(
+            data,
+            default=_encoder.default,
+            # Datetimes go through DRF's encoder to keep its format
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Escaped by DRF's JSONRenderer, not by orjson
+        if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+            content = content.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return content
+    return JSONRenderer().render(data)
+
+
+def api_json_response(data, status=200):
+    """JSON response for custom API views, rendered like the API router's."""
+    return HttpResponse(render_json(data), status=status, content_type='application/json')
+
+
+class HeadlessJSONRenderer(JSONRenderer):
+    """DRF renderer using the API_JSON_RENDERER backend."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Indented output (?format=json with an indent parameter) is for humans
+        if get_backend() == 'json' or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return render_json(data, 'orjson')
@@ -0,0 +1,197 @@
+"""
+Rendition Disk Budget for Wagtail Headless CMS
+
+Tracks when renditions were last used by an API payload and evicts the
+least recently used ones once rendition files exceed
+RENDITION_STORAGE_BUDGET bytes. Evicted renditions are regenerated by the
+normal resolver path (or the pre-generation pool) the next time a payload
+needs them.
+
+Access times are written at most once per RENDITION_ACCESS_INTERVAL per
+rendition, so tracking does not add a database write to every request.
+"""
+
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, F, OuterRef, Subquery
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core.workers import run_on_commit
+
+logger = logging.getLogger(__name__)
+
+# Sent after an eviction run with the ids of the images that lost renditions,
+# so payloads that embed rendition URLs (snapshots) can be rebuilt
+renditions_evicted = Signal()
+
+# Renditions read per query while picking the ones to evict
+EVICTION_CHUNK_SIZE = 500
+
+
+def get_budget():
+    """Get the rendition disk budget in bytes (None means unlimited)."""
+    return getattr(settings, 'RENDITION_STORAGE_BUDGET', None)
+
+
+def _get_cache():
+    return caches[getattr(settings, 'RENDITION_URL_CACHE', 'default')]
+
+
+def record_access(keys):
+    """
+    Record that renditions were used.
+    
+    Args:
+        keys (list): (image id, filter spec, focal point key) tuples
+    """
+    from core.models import RenditionAccess
+    
+    if not get_budget() or not keys:
+        return
+    
+    cache = _get_cache()
+    markers = {f"rendition-access:{pk}:{focal_point_key}:{spec}": (pk, spec, focal_point_key)
+               for pk, spec, focal_point_key in keys}
+    recent = cache.get_many(markers.keys())
+    stale = {marker: key for marker, key in markers.items() if marker not in recent}
+    if not stale:
+        return
+    
+    now = timezone.now()
+    RenditionAccess.objects.bulk_create(
+        [
+            RenditionAccess(image_id=pk, filter_spec=spec, focal_point_key=focal_point_key, last_accessed=now)
+            for pk, spec, focal_point_key in stale.values()
+        ],
+        update_conflicts=True,
+        unique_fields=['image', 'filter_spec', 'focal_point_key'],
+        update_fields=['last_accessed'],
+    )
+    cache.set_many(dict.fromkeys(stale, True), timeout=settings.RENDITION_ACCESS_INTERVAL)
+
+
+def enforce_budget(dry_run=False):
+    """
+    Evict least recently used renditions until the files fit the budget.
+    
+    Renditions without a recorded access go first. A shared file only
+    frees space once the last rendition using it is evicted.
+    
+    Args:
+        dry_run (bool): Only work out what would be evicted
+        
+    Returns:
+        tuple: (bytes used before, bytes freed, renditions evicted)
+    """
+    used, freed, evicted = _evict(dry_run)
+    return used, freed, len(evicted)
+
+
+def check_budget():
+    """
+    Enforce the budget (runs in a worker process).
+    
+    Returns:
+        list: Rendition URL cache keys of the evicted renditions
+    """
+    from core import rendition_cache
+    
+    return [
+        rendition_cache.make_cache_key(rendition.image, rendition.filter_spec, rendition.focal_point_key)
+        for rendition in _evict()[2]
+    ]
+
+
+def purge_evicted(keys):
+    """
+    Drop evicted renditions from the URL cache and the memoized block
+    output pointing at them (runs in the process that queued the check -
+    a worker's cache is its own).
+    
+    Args:
+        keys (list): Return value of check_budget()
+    """
+    from core import rendition_cache
+    from core.block_serializers import bump_generation
+    
+    if keys:
+        rendition_cache.get_cache().delete_many(keys)
+        bump_generation()
+
+
+def _evict(dry_run=False):
+    from wagtail.images import get_image_model
+    from wagtail.images.models import get_rendition_storage
+    from core.models import RenditionAccess
+    
+    budget = get_budget()
+    storage = get_rendition_storage()
+    if not budget or not hasattr(storage, 'get_usage'):
+        return 0, 0, []
+    
+    usage = storage.get_usage()
+    used = sum(usage.values())
+    if used <= budget:
+        return used, 0, []
+    
+    # Least recently used first, read in chunks until enough is freed
+    last_accessed = RenditionAccess.objects.filter(
+        image_id=OuterRef('image_id'),
+        filter_spec=OuterRef('filter_spec'),
+        focal_point_key=OuterRef('focal_point_key'),
+    ).values('last_accessed')[:1]
+    Rendition = get_image_model().get_rendition_model()
+    renditions = Rendition.objects.select_related('image').annotate(
+        last_accessed=Subquery(last_accessed),
+    ).order_by(F('last_accessed').asc(nulls_first=True), 'pk')
+    # Only files shared by several renditions need counting
+    references = Counter({
+        row['file']: row['count']
+        for row in Rendition.objects.values('file').annotate(count=Count('pk')).filter(count__gt=1)
+    })
+    
+    freed = 0
+    evicted = []
+    for rendition in renditions.iterator(chunk_size=EVICTION_CHUNK_SIZE):
+        if used - freed <= budget:
+            break
+        name = rendition.file.name
+        if references[name] > 1:
+            references[name] -= 1
+        else:
+            freed += usage.get(name, 0)
+        evicted.append(rendition)
+    
+    if not dry_run:
+        for rendition in evicted:
+            # post_delete handlers remove the file (once unreferenced) and purge the caches
+            rendition.delete()
+        for rendition in evicted:
+            RenditionAccess.objects.filter(
+                image_id=rendition.image_id,
+                filter_spec=rendition.filter_spec,
+                focal_point_key=rendition.focal_point_key,
+            ).delete()
+        logger.info("Evicted %d renditions, %d bytes freed", len(evicted), freed)
+        if evicted:
+            renditions_evicted.send(
+                sender=Rendition,
+                image_ids={rendition.image_id for rendition in evicted},
+            )
+    
+    return used, freed, evicted
+
+
+def schedule_budget_check():
+    """
+    Queue an eviction run in the worker pool, at most once per
+    RENDITION_ACCESS_INTERVAL.
+    """
+    if not get_budget():
+        return
+    if _get_cache().add('rendition-budget-check', True, timeout=settings.RENDITION_ACCESS_INTERVAL):
+        run_on_commit(check_budget, [()], on_done=purge_evicted)
@@ -0,0 +1,126 @@
+"""
+Rendition URL Cache for Wagtail Headless CMS
+
+Shared (cross-request) cache of rendition URLs and dimensions so warm API
+requests can build image data without touching the renditions table.
+
+Keys are built from the image id, the image file hash, the focal point
+key and the filter spec - replacing the file or moving the focal point
+produces new keys, so stale entries are never read. Deleted (evicted)
+renditions are dropped from the cache, and entries expire after
+RENDITION_URL_CACHE_TIMEOUT in case the purge went to another process'
+cache (e.g. the evict_renditions command).
+
+Reads and writes also count as rendition accesses for the disk budget.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from wagtail.images.models import Filter
+
+from core.rendition_budget import record_access
+
+
+# Minimal stand-in for a Rendition - exposes what the serializers read
+CachedRendition = namedtuple('CachedRendition', ['url', 'width', 'height'])
+
+
+def get_cache():
+    """Get the cache backend configured by RENDITION_URL_CACHE."""
+    return caches[getattr(settings, 'RENDITION_URL_CACHE', 'default')]
+
+
+def make_cache_key(image, spec, focal_point_key=None):
+    """
+    Build the cache key for one rendition of an image.
+
+    Args:
+        image: Wagtail Image object
+        spec (str): Filter spec (e.g., 'fill-800x600|format-webp')
+        focal_point_key (str): Focal point key of the rendition (worked
+            out from the image when not given)
+
+    Returns:
+        str: Cache key
+    """
+    if focal_point_key is None:
+        focal_point_key = Filter(spec=spec).get_cache_key(image)
+    return f"rendition-url:{image.pk}:{image.file_hash}:{focal_point_key}:{spec}"
+
+
+def _access_key(image, spec):
+    return image.pk, spec, Filter(spec=spec).get_cache_key(image)
+
+
+def delete(rendition):
+    """
+    Drop a rendition from the cache (it was deleted or evicted).
+
+    Args:
+        rendition: Wagtail Rendition object
+    """
+    get_cache().delete(make_cache_key(rendition.image, rendition.filter_spec, rendition.focal_point_key))
+
+
+def get_many(pairs):
+    """
+    Bulk-read cached renditions.
+
+    Args:
+        pairs (list): (image, spec) tuples
+
+    Returns:
+        dict: (image id, spec) -> CachedRendition for every cache hit
+    """
+    keys = {make_cache_key(image, spec): (image.pk, spec) for image, spec in pairs}
+    if not keys:
+        return {}
+
+    found = {
+        keys[key]: CachedRendition(*value)
+        for key, value in get_cache().get_many(keys.keys()).items()
+    }
+    record_access([_access_key(image, spec) for image, spec in pairs if (image.pk, spec) in found])
+    return found
+
+
+def set_many(pairs):
+    """
+    Bulk-write renditions to the cache.
+
+    Args:
+        pairs (list): (image, spec, rendition) tuples
+    """
+    values = {
+        make_cache_key(image, spec): (rendition.url, rendition.width, rendition.height)
+        for image, spec, rendition in pairs
+    }
+    if values:
+        get_cache().set_many(values, timeout=getattr(settings, 'RENDITION_URL_CACHE_TIMEOUT', None))
+        record_access([_access_key(image, spec) for image, spec, _ in pairs])
+
+
+def get_renditions(image, specs):
+    """
+    Get renditions of one image, from the cache where possible.
+
+    Args:
+        image: Wagtail Image object
+        specs (list): Filter specs
+
+    Returns:
+        dict: spec -> Rendition or CachedRendition
+    """
+    specs = list(dict.fromkeys(specs))
+    cached = get_many([(image, spec) for spec in specs])
+    found = {spec: cached[(image.pk, spec)] for spec in specs if (image.pk, spec) in cached}
+
+    missing = [spec for spec in specs if spec not in found]
+    if missing:
+        renditions = image.get_renditions(*missing)
+        set_many([(image, spec, renditions[spec]) for spec in missing])
+        found.update(renditions)
+
+    return found
@@ -0,0 +1,111 @@
+"""
+Signal handlers for the core app
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from core import navigation, rendition_cache, site_settings, sites
+from core.block_serializers import bump_generation
+from core.models import ImagePlaceholder, SiteSettings
+from core.placeholders import schedule_placeholders
+
+
+@receiver(pre_save, sender=get_image_model())
+def store_image_file_metadata(sender, instance, **kwargs):
+    """
+    Persist file size and hash when they are missing (images created outside
+    the admin upload form), so serialization never has to ask the storage.
+    """
+    if instance.file and (instance.file_size is None or not instance.file_hash):
+        instance._set_image_file_metadata()
+
+
+@receiver(post_save, sender=get_image_model())
+def compute_image_placeholder(sender, instance, raw=False, **kwargs):
+    """
+    Queue the placeholder (LQIP and dominant colour) of an uploaded or
+    changed image. Unchanged files are skipped by the job itself.
+    """
+    if raw:
+        return
+    schedule_placeholders([instance.pk])
+
+
+@receiver(post_delete, sender=get_image_model().get_rendition_model())
+def purge_rendition_url(sender, instance, **kwargs):
+    """
+    Drop a deleted (pruned or evicted) rendition from the URL cache so the
+    next payload regenerates it instead of pointing at a missing file.
+    """
+    rendition_cache.delete(instance)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model().get_rendition_model())
+@receiver(post_save, sender=ImagePlaceholder)
+def invalidate_block_serializers(sender, **kwargs):
+    """
+    Drop memoized StreamField block output when something it embeds (page
+    titles and URLs, image renditions and placeholders) changes. Waits for
+    the commit so the output is not rebuilt from the old rows.
+    """
+    transaction.on_commit(bump_generation)
+
+
+@receiver(pre_save, sender=SiteSettings)
+def compile_site_navigation(sender, instance, raw=False, **kwargs):
+    """Compile the header and footer with their page links resolved."""
+    if raw:
+        return
+    instance.compiled_navigation = navigation.compile_navigation(instance)
+
+
+@receiver(post_save, sender=SiteSettings)
+def invalidate_site_settings(sender, instance, **kwargs):
+    """Rebuild the site settings payload of a site after its settings change."""
+    transaction.on_commit(lambda: site_settings.invalidate_site(instance.site_id))
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_map(sender, instance, **kwargs):
+    """
+    Reload the site map of every process, and compile every navigation
+    again - links to pages of other sites include their hostname.
+    """
+    site_id = instance.pk
+
+    def invalidate():
+        sites.bump_version()
+        site_settings.invalidate_site(site_id)
+        site_settings.refresh_navigation()
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def invalidate_site_settings_links(sender, instance, **kwargs):
+    """
+    Compile the navigation linking to a page (or a descendant, whose URL
+    includes its slug) again when it is published - possibly renamed -
+    unpublished or deleted.
+    """
+    page_path = instance.path
+    transaction.on_commit(lambda: site_settings.refresh_navigation(page_path))
+
+
+@receiver(post_page_move)
+def invalidate_site_settings_after_move(sender, **kwargs):
+    """Moves change the URL of a whole subtree - compile every navigation."""
+    transaction.on_commit(site_settings.refresh_navigation)
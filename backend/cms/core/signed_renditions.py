@@ -0,0 +1,57 @@
+"""
+Signed Rendition URLs for Wagtail Headless CMS
+
+With IMAGE_URL_MODE = 'signed' the API returns signed URLs pointing at the
+image serve view instead of rendition files. Building the URL and the
+output dimensions needs no Pillow work and no database access - the serve
+view creates (and caches) the rendition the first time the URL is fetched,
+so renditions no client asks for are never generated.
+"""
+
+from django.conf import settings
+from wagtail.images.models import Filter
+from wagtail.images.views.serve import generate_image_url
+
+from core.rendition_cache import CachedRendition
+
+
+def is_enabled():
+    """Whether the API should return signed serve-view URLs."""
+    return getattr(settings, 'IMAGE_URL_MODE', 'rendition') == 'signed'
+
+
+def get_rendition(image, spec):
+    """
+    Build the signed URL and output size of a rendition without creating it.
+    
+    Args:
+        image: Wagtail Image object
+        spec (str): Filter spec (e.g., 'fill-800x600|format-webp')
+        
+    Returns:
+        CachedRendition: Signed URL with the width and height the rendition will have
+    """
+    image_filter = Filter(spec=spec)
+    width, height = image_filter.get_transform(image).size
+    
+    url = generate_image_url(image, spec)
+    # The signature only covers id and spec - version the URL so caches
+    # in front of the serve view notice a new file or focal point
+    version = f"{image.file_hash[:8]}{image_filter.get_cache_key(image)}"
+    if version:
+        url = f"{url}?v={version}"
+    return CachedRendition(url, width, height)
+
+
+def get_renditions(image, specs):
+    """
+    Build signed renditions for several specs of one image.
+    
+    Args:
+        image: Wagtail Image object
+        specs (list): Filter specs
+        
+    Returns:
+        dict: spec -> CachedRendition
+    """
+    return {spec: get_rendition(image, spec) for spec in specs}
@@ -0,0 +1,179 @@
+"""
+Site Settings Payload for the Headless API
+
+The site settings endpoint serves a payload built from the SiteSettings of
+the requesting site (core/sites.py) - menus, footer, contact and social
+links - that changes maybe weekly. Menus and footer come precompiled with
+their page links (core/navigation.py); the payload is built from them once
+per site, rendered to JSON and cached together with its validators, so a
+request is answered from the cache with no queries.
+
+The cached payload is dropped (after the transaction commits) when:
+- the site's SiteSettings are saved
+- any site is saved or deleted (URLs of pages of other sites include
+  their hostname) - after compiling every navigation again
+- a page linked from the menus or footer - or one of its ancestors,
+  whose slug is part of the URL - is published, unpublished or deleted,
+  after compiling the navigation linking to it again
+- any page is moved (URLs of the whole subtree change), after compiling
+  every navigation again
+
+Usage:
+    payload = get_site_settings_payload(site)  # or await aget_site_settings_payload(site)
+    payload['body'], payload['etag'], payload['last_modified']
+"""
+
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings as django_settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.http import quote_etag
+
+from core.batch import get_shared
+from core.models import SiteSettings
+from core.navigation import compile_navigation
+from core.renderers import render_json
+
+
+def get_cache():
+    """Get the cache backend configured by SITE_SETTINGS_CACHE."""
+    return caches[getattr(django_settings, 'SITE_SETTINGS_CACHE', 'default')]
+
+
+def get_payload_key(site_id):
+    return f'site-settings-api:{site_id}'
+
+
+def get_site_settings_payload(site):
+    """
+    Get the site settings payload of a site, building it on a miss.
+
+    Args:
+        site (Site): Site serving the request
+
+    Returns:
+        dict: 'body' (JSON bytes), 'etag' and 'last_modified' (UNIX time)
+    """
+    cache = get_cache()
+    payload = cache.get(get_payload_key(site.pk))
+    if payload is not None:
+        return payload
+
+    # Shared with the other sub-requests of an API batch
+    site_settings = get_shared(('site_settings', site.pk), lambda: SiteSettings.for_site(site))
+    payload = build_payload(site_settings)
+    cache.set(get_payload_key(site.pk), payload, timeout=getattr(django_settings, 'SITE_SETTINGS_CACHE_TIMEOUT', None))
+    return payload
+
+
+async def aget_site_settings_payload(site):
+    """Async version of get_site_settings_payload()."""
+    cache = get_cache()
+    payload = await cache.aget(get_payload_key(site.pk))
+    if payload is not None:
+        return payload
+
+    site_settings, _ = await SiteSettings.base_queryset().aget_or_create(site=site)
+    if site_settings.compiled_navigation:
+        payload = build_payload(site_settings)
+    else:
+        payload = await sync_to_async(build_payload)(site_settings)
+    await cache.aset(
+        get_payload_key(site.pk), payload, timeout=getattr(django_settings, 'SITE_SETTINGS_CACHE_TIMEOUT', None)
+    )
+    return payload
+
+
+def build_payload(site_settings):
+    """Render the payload of site settings (see get_site_settings_payload())."""
+    body = render_json(build_site_settings_data(site_settings))
+    # Set on save and whenever linked page changes compile the navigation
+    # again, so rebuilding the cached payload does not move it forward
+    updated_at = site_settings.updated_at
+    return {
+        'body': body,
+        'etag': quote_etag(hashlib.sha1(body).hexdigest()),
+        'last_modified': int(updated_at.timestamp()) if updated_at else int(time.time()),
+    }
+
+
+def invalidate_site(site_id):
+    """Drop the payload of a site."""
+    get_cache().delete(get_payload_key(site_id))
+
+
+def refresh_navigation(page_path=None):
+    """
+    Compile the navigation of site settings linking to a page or one of
+    its descendants again - of all settings when no path is given - and
+    drop their payloads.
+    """
+    for site_settings in SiteSettings.objects.all():
+        page_paths = site_settings.compiled_navigation.get('page_paths', [])
+        if page_path is not None and not any(path.startswith(page_path) for path in page_paths):
+            continue
+        navigation = compile_navigation(site_settings)
+        SiteSettings.objects.filter(pk=site_settings.pk).update(
+            compiled_navigation=navigation, updated_at=timezone.now(),
+        )
+        invalidate_site(site_settings.site_id)
+
+
+def get_navigation(settings):
+    """
+    Get the compiled navigation of site settings, compiling (and storing)
+    it for settings saved before navigation was compiled.
+    """
+    if not settings.compiled_navigation:
+        settings.compiled_navigation = compile_navigation(settings)
+        if settings.pk:
+            SiteSettings.objects.filter(pk=settings.pk).update(compiled_navigation=settings.compiled_navigation)
+    return settings.compiled_navigation
+
+
+def build_site_settings_data(settings):
+    """
+    Serialize site settings for the frontend (header, footer, contact, social).
+
+    Args:
+        settings (SiteSettings): Settings of the site
+
+    Returns:
+        dict: Site settings payload
+    """
+    # Menus and footer with their page links, compiled on save
+    navigation = get_navigation(settings)
+
+    # Build social media links
+    social_links = {}
+    if settings.facebook_url:
+        social_links['facebook'] = settings.facebook_url
+    if settings.twitter_url:
+        social_links['twitter'] = settings.twitter_url
+    if settings.instagram_url:
+        social_links['instagram'] = settings.instagram_url
+    if settings.linkedin_url:
+        social_links['linkedin'] = settings.linkedin_url
+    if settings.youtube_url:
+        social_links['youtube'] = settings.youtube_url
+
+    # Build response
+    return {
+        'header': {
+            'logo_text': settings.header_logo_text,
+            'menu_items': navigation['header'],
+        },
+        'footer': {
+            'sections': navigation['footer'],
+            'copyright': settings.footer_copyright,
+        },
+        'contact': {
+            'email': settings.contact_email,
+            'phone': settings.contact_phone,
+            'address': settings.contact_address,
+        },
+        'social': social_links,
+    }
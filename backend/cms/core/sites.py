@@ -0,0 +1,203 @@
+"""
+Request Host Site Resolution
+
+Several brands are served from one deployment, each a Wagtail Site with
+its own hostname. ``Site.find_for_request()`` resolves the site of every
+request with a query; instead, every process keeps a table of all sites
+(with their root pages) and matches the request host against it with
+Wagtail's rules:
+
+1. hostname and port
+2. hostname of the default site
+3. the only site with the hostname
+4. the default site
+
+The table is reloaded when the site map version - a token in the
+SITE_MAP_CACHE, replaced whenever a Site is saved or deleted - differs
+from the one it was loaded with, so resolving a site costs one cache read
+and no query. It is also reloaded once it is SITE_MAP_MAX_AGE seconds
+old, so a change reaches processes that do not share the cache (the
+default cache is per process) within that time. SiteMiddleware (core/middleware.py) stores the site on the
+request, where ``Site.find_for_request()`` - and with it the pages API -
+picks it up, and makes the request available to code building URLs
+without one (``get_current_request()``).
+
+Usage:
+    site = find_for_request(request)
+    site = await afind_for_request(request)
+    site = get_site_for_host('brand.example.com', 443)
+"""
+
+import contextvars
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http.request import split_domain_port
+from wagtail.models import Site
+
+
+VERSION_KEY = 'site-map-version'
+
+_site_map = None
+_lock = threading.Lock()
+_current_request = contextvars.ContextVar('current_request', default=None)
+
+
+def get_cache():
+    """Get the cache backend configured by SITE_MAP_CACHE."""
+    return caches[getattr(settings, 'SITE_MAP_CACHE', 'default')]
+
+
+def get_version():
+    """Get the current site map version."""
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # A flushed cache starts a new version, so every process reloads
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_version():
+    """Async version of get_version()."""
+    version = await get_cache().aget(VERSION_KEY)
+    if version is None:
+        version = await sync_to_async(get_version)()
+    return version
+
+
+def bump_version():
+    """Make every process reload its site map."""
+    get_cache().set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+class SiteMap:
+    """Sites of the deployment, indexed by hostname."""
+
+    def __init__(self, sites, version=None):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.default_site = None
+        self.by_hostname = defaultdict(list)
+        for site in sites:
+            self.by_hostname[site.hostname].append(site)
+            if site.is_default_site:
+                self.default_site = site
+
+    def find(self, hostname, port):
+        """
+        Find the site serving a host, like ``Site.find_for_request()``.
+
+        Args:
+            hostname (str): Request hostname
+            port (int): Request port
+
+        Returns:
+            Site: Matching site, or None
+        """
+        matches = self.by_hostname.get(hostname, [])
+        for site in matches:
+            if site.port == port:
+                return site
+        if self.default_site is not None and self.default_site.hostname == hostname:
+            return self.default_site
+        if len(matches) == 1:
+            return matches[0]
+        # Several sites share the hostname but none the port
+        return self.default_site
+
+    def is_current(self, version):
+        """Check the map was loaded for a site map version and is not too old."""
+        max_age = getattr(settings, 'SITE_MAP_MAX_AGE', 60)
+        return self.version == version and time.monotonic() - self.loaded_at < max_age
+
+
+def get_site_map():
+    """Get the site map of this process, reloading it if a Site changed or it is too old."""
+    global _site_map
+    version = get_version()
+    site_map = _site_map
+    if site_map is None or not site_map.is_current(version):
+        with _lock:
+            site_map = _site_map
+            if site_map is None or not site_map.is_current(version):
+                sites = Site.objects.select_related('root_page').order_by('pk')
+                site_map = _site_map = SiteMap(list(sites), version)
+    return site_map
+
+
+async def aget_site_map():
+    """Async version of get_site_map() - loading the table runs in a thread."""
+    version = await aget_version()
+    site_map = _site_map
+    if site_map is None or not site_map.is_current(version):
+        site_map = await sync_to_async(get_site_map)()
+    return site_map
+
+
+def get_site_for_host(hostname, port):
+    """
+    Get the site serving a hostname and port.
+
+    Args:
+        hostname (str): Request hostname
+        port (int or str): Request port
+
+    Returns:
+        Site: Matching site, or None
+    """
+    return get_site_map().find(hostname, parse_port(port))
+
+
+def parse_port(port):
+    try:
+        return int(port)
+    except (TypeError, ValueError):
+        return None
+
+
+def find_for_request(request):
+    """
+    Get the site serving a request, stored on the request like
+    ``Site.find_for_request()`` does.
+    """
+    if request is None:
+        return None
+    if not hasattr(request, '_wagtail_site'):
+        # The raw host, like Wagtail - ALLOWED_HOSTS is checked elsewhere
+        hostname = split_domain_port(request._get_raw_host())[0]
+        request._wagtail_site = get_site_for_host(hostname, request.get_port())
+    return request._wagtail_site
+
+
+async def afind_for_request(request):
+    """Async version of find_for_request()."""
+    if request is None:
+        return None
+    if not hasattr(request, '_wagtail_site'):
+        hostname = split_domain_port(request._get_raw_host())[0]
+        site_map = await aget_site_map()
+        request._wagtail_site = site_map.find(hostname, parse_port(request.get_port()))
+    return request._wagtail_site
+
+
+def get_current_request():
+    """Get the request being served in this context (None outside requests)."""
+    return _current_request.get()
+
+
+@contextmanager
+def request_context(request):
+    """Make a request available to get_current_request() in the block."""
+    token = _current_request.set(request)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
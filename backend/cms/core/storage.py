@@ -0,0 +1,85 @@
+"""
+Content-Addressed Rendition Storage for Wagtail Headless CMS
+
+Rendition files are named after the hash of their content
+(``images/ab/ab12...ef.webp``), so identical outputs - the same image
+uploaded twice, specs that collapse to the same size - share one file.
+
+A file is only removed from disk once no rendition references it any more.
+Enable with WAGTAILIMAGES_RENDITION_STORAGE = 'core.storage.ContentAddressedStorage'.
+"""
+
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+
+# Directory of rendition files, relative to the storage root
+RENDITION_DIR = 'images'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names rendition files by content hash.
+    """
+    
+    def _save(self, name, content):
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            # Same bytes are already stored - share the file
+            return name
+        return super()._save(name, content)
+    
+    def get_content_name(self, name, content):
+        """
+        Build the content-addressed name of a file.
+        
+        Args:
+            name (str): Name suggested by Wagtail (only the extension is kept)
+            content: File being saved
+            
+        Returns:
+            str: e.g. 'images/ab/ab12...ef.webp'
+        """
+        digest = hashlib.sha1()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        
+        content_hash = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        return f"{RENDITION_DIR}/{content_hash[:2]}/{content_hash}{extension}"
+    
+    def delete(self, name):
+        """Delete a file unless another rendition still uses it."""
+        from wagtail.images import get_image_model
+        
+        Rendition = get_image_model().get_rendition_model()
+        if Rendition.objects.filter(file=name).exists():
+            return
+        super().delete(name)
+    
+    def get_usage(self, path=RENDITION_DIR):
+        """
+        Get the size of every file below a directory.
+        
+        Args:
+            path (str): Directory relative to the storage root
+            
+        Returns:
+            dict: file name -> size in bytes
+        """
+        usage = {}
+        if not self.exists(path):
+            return usage
+        directories, files = self.listdir(path)
+        for file_name in files:
+            name = f"{path}/{file_name}"
+            usage[name] = self.size(name)
+        for directory in directories:
+            usage.update(self.get_usage(f"{path}/{directory}"))
+        return usage
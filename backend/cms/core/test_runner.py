@@ -0,0 +1,27 @@
+"""
+Test Runner for Wagtail Headless CMS
+
+Runs background jobs (core/workers.py) inline for the whole test run.
+Pool workers are spawned processes that set Django up from the default
+settings, so they would read and write the development database instead
+of the test database.
+
+Usage:
+    TEST_RUNNER = "core.test_runner.TestRunner"
+"""
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner that never sends jobs to the worker pool."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._rendition_workers = settings.RENDITION_WORKERS
+        settings.RENDITION_WORKERS = 0
+
+    def teardown_test_environment(self, **kwargs):
+        settings.RENDITION_WORKERS = self._rendition_workers
+        super().teardown_test_environment(**kwargs)
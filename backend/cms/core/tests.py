@@ -0,0 +1,464 @@
+import datetime
+import gzip
+import json
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from wagtail import blocks
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, Site
+
+from core import sites
+from core.api import ImageSerializerMixin
+from core.block_serializers import DefaultBlockSerializer, registry
+from core.links import PageLinkResolver, iter_raw_page_ids
+from core.middleware import APICompressionMiddleware
+from core.models import SiteSettings
+from core.renderers import HeadlessJSONRenderer, render_json
+from core.rendition_budget import enforce_budget
+from core.utils import get_image_data, get_rendition_data
+from home.models import HomePage
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImageDataTests(TestCase):
+    """
+    Tests for image serialization from persisted metadata.
+    """
+
+    def setUp(self):
+        self.image = Image.objects.create(title="Test", file=get_test_image_file())
+
+    def test_image_data_makes_no_storage_calls(self):
+        image = Image.objects.get(pk=self.image.pk)
+        with mock.patch.object(FileSystemStorage, 'size', side_effect=AssertionError), \
+                mock.patch.object(FileSystemStorage, 'url', side_effect=AssertionError):
+            data = get_image_data(image, 'http://testserver')
+            ImageSerializerMixin.image_serializer(image)
+
+        self.assertEqual(data['url'], f"http://testserver/media/{image.file.name}")
+        self.assertEqual(data['file_size'], self.image.file.size)
+        self.assertEqual((data['width'], data['height']), (640, 480))
+
+    @override_settings(MEDIA_PUBLIC_URL='https://cdn.example.com/media/')
+    def test_absolute_public_url_ignores_base_url(self):
+        data = get_image_data(self.image, 'http://testserver')
+        self.assertEqual(data['url'], f"https://cdn.example.com/media/{self.image.file.name}")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class ImagePlaceholderTests(TestCase):
+    """
+    Tests for placeholders computed on upload.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_placeholder_is_computed_on_upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = Image.objects.create(title="Test", file=get_test_image_file(colour='red'))
+
+        data = get_image_data(image, 'http://testserver')
+        self.assertTrue(data['lqip'].startswith('data:image/webp;base64,'))
+        self.assertEqual(data['dominant_color'], '#ff0000')
+
+    def test_placeholder_is_not_computed_per_request(self):
+        image = Image.objects.create(title="Test", file=get_test_image_file())
+
+        data = get_image_data(image, 'http://testserver')
+        self.assertIsNone(data['lqip'])
+        self.assertIsNone(data['dominant_color'])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class RenditionStorageTests(TestCase):
+    """
+    Tests for content-addressed rendition files and LRU eviction.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.images = [
+            Image.objects.create(title=f"Test {i}", file=get_test_image_file(f"test{i}.png"))
+            for i in range(2)
+        ]
+
+    def test_identical_renditions_share_a_file(self):
+        first, second = [image.get_rendition('fill-100x100') for image in self.images]
+        self.assertEqual(first.file.name, second.file.name)
+
+        first.delete()
+        self.assertTrue(second.file.storage.exists(second.file.name))
+
+    def test_least_recently_used_renditions_are_evicted(self):
+        rendition = self.images[0].get_rendition('fill-200x150')
+        size = rendition.file.size
+        with override_settings(RENDITION_STORAGE_BUDGET=size):
+            get_rendition_data(self.images[0], 'fill-100x100')
+            self.images[0].get_rendition('fill-200x150')
+
+            with self.captureOnCommitCallbacks(execute=True):
+                used, freed, evicted = enforce_budget()
+
+            self.assertEqual((evicted, freed), (1, size))
+            self.assertFalse(rendition.file.storage.exists(rendition.file.name))
+            self.assertTrue(self.images[0].renditions.filter(filter_spec='fill-100x100').exists())
+
+            # Evicted renditions come back on next use
+            data = get_rendition_data(self.images[0], 'fill-200x150')
+            self.assertEqual((data['width'], data['height']), (200, 150))
+            self.assertTrue(self.images[0].renditions.filter(filter_spec='fill-200x150').exists())
+
+
+class PageLinkTests(TestCase):
+    """
+    Tests for bulk page link resolution.
+    """
+
+    def setUp(self):
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.pages = [
+            root_page.add_child(instance=Page(title=f"Page {i}", slug=f"page-{i}"))
+            for i in range(3)
+        ]
+
+    def test_raw_stream_page_ids(self):
+        stream_block = blocks.StreamBlock([
+            ('links', blocks.ListBlock(blocks.StructBlock([('page', blocks.PageChooserBlock())]))),
+        ])
+        value = stream_block.to_python([
+            {'type': 'links', 'value': [{'page': page.pk} for page in self.pages]},
+        ])
+        self.assertEqual(list(iter_raw_page_ids(stream_block, value.raw_data)), [page.pk for page in self.pages])
+
+    def test_links_resolve_in_one_query(self):
+        expected = [{'id': page.pk, 'title': page.title, 'url': page.url} for page in self.pages]
+
+        links = PageLinkResolver()
+        links.add(page.pk for page in self.pages)
+        with self.assertNumQueries(1):
+            self.assertEqual([links.get_link(page) for page in self.pages], expected)
+
+
+class JSONRendererTests(SimpleTestCase):
+    """
+    Tests for the API JSON backends.
+    """
+
+    data = {
+        'base_price': Decimal('450000.00'),
+        'bathrooms': Decimal('2.5'),
+        'published': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+        'date': datetime.date(2025, 1, 2),
+        'label': gettext_lazy('Single Storey'),
+        'title': 'Café',
+        1: None,
+    }
+
+    def test_backends_render_the_same_json(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(json.loads(render_json(self.data, 'orjson')), json.loads(expected))
+        self.assertEqual(json.loads(render_json(self.data, 'json')), json.loads(expected))
+
+    def test_backends_escape_line_separators_alike(self):
+        data = {'text': 'Line\u2028Paragraph\u2029End'}
+        self.assertEqual(render_json(data, 'orjson'), render_json(data, 'json'))
+        self.assertNotIn('\u2028'.encode(), render_json(data, 'orjson'))
+
+    @override_settings(API_JSON_RENDERER='json')
+    def test_stdlib_backend_is_selectable(self):
+        with mock.patch('core.renderers.orjson.dumps', side_effect=AssertionError):
+            self.assertEqual(HeadlessJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+
+class APICompressionTests(TestCase):
+    """
+    Tests for compressed API responses.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_compressed_bytes_are_stored_per_body(self):
+        response = self.client.get('/api/v2/pages/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertIn('items', json.loads(gzip.decompress(response.content)))
+
+        # Unchanged content is not compressed again and still validates
+        with mock.patch('core.middleware.compress', side_effect=AssertionError):
+            repeat = self.client.get('/api/v2/pages/', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(repeat.content, response.content)
+            not_modified = self.client.get(
+                '/api/v2/pages/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response.headers['ETag'],
+            )
+        self.assertEqual(not_modified.status_code, 304)
+
+        response = self.client.get('/api/v2/pages/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        # A changed body is compressed again even if its ETag is not
+        middleware = APICompressionMiddleware(lambda request: None)
+        self.assertEqual(gzip.decompress(middleware.get_stored(b'a' * 300, 'gzip')), b'a' * 300)
+        self.assertEqual(gzip.decompress(middleware.get_stored(b'b' * 300, 'gzip')), b'b' * 300)
+
+
+class CursorPaginationTests(TestCase):
+    """
+    Tests for keyset pagination of the pages listing.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.pages = [root.add_child(instance=Page(title=f"Page {i}", slug=f"page-{i}")) for i in range(5)]
+        # Pages published in turn, the rest never published (no last_published_at)
+        for page in self.pages[1:4]:
+            page.save_revision().publish()
+
+    def walk(self, order):
+        ids, cursor = [], ''
+        while cursor is not None:
+            data = self.client.get('/api/v2/pages/', {'cursor': cursor, 'limit': 2, 'order': order}).json()
+            ids += [item['id'] for item in data['items']]
+            cursor = data['meta']['next_cursor']
+        return ids
+
+    def test_every_page_is_served_once_in_order(self):
+        live_pages = Page.objects.live().descendant_of(Site.objects.get(is_default_site=True).root_page, inclusive=True)
+        self.assertEqual(self.walk('path'), list(live_pages.order_by('path').values_list('id', flat=True)))
+
+        published = [page.pk for page in reversed(self.pages[1:4])]
+        ids = self.walk('-last_published_at')
+        self.assertEqual(ids[:3], published)
+        self.assertEqual(sorted(ids), sorted(live_pages.values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v2/pages/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class APIBatchTests(TestCase):
+    """
+    Tests for the batched API endpoint.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_app_shell_preset(self):
+        response = self.client.get('/api/v2/batch/', {'preset': 'app-shell'})
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual(list(responses), ['site_settings', 'home', 'house_designs'])
+        self.assertEqual({result['status'] for result in responses.values()}, {200})
+        self.assertEqual(responses['site_settings']['body'], self.client.get('/api/v2/site-settings/').json())
+
+    def test_sub_requests(self):
+        response = self.client.post('/api/v2/batch/', {'requests': {
+            'pages': '/api/v2/pages/?limit=1',
+            'nested': '/api/v2/batch/?preset=app-shell',
+            'external': 'https://example.com/api/v2/pages/',
+        }}, content_type='application/json')
+        responses = response.json()['responses']
+        self.assertEqual(responses['pages']['status'], 200)
+        self.assertEqual(len(responses['pages']['body']['items']), 1)
+        self.assertEqual(responses['nested']['status'], 400)
+        self.assertEqual(responses['external']['status'], 400)
+
+        response = self.client.get('/api/v2/batch/', {'preset': 'unknown'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SiteSettingsPayloadTests(TestCase):
+    """
+    Tests for the cached site settings payload.
+    """
+
+    def setUp(self):
+        cache.clear()
+        site = Site.objects.get(is_default_site=True)
+        self.page = site.root_page.add_child(instance=Page(title="About", slug="about"))
+        self.settings = SiteSettings.for_site(site)
+        self.settings.header_menu_items = [('menu_item', {'label': 'About', 'page': self.page})]
+        self.settings.save()
+
+    def get_menu(self):
+        return self.client.get('/api/v2/site-settings/').json()['header']['menu_items']
+
+    def test_payload_is_served_from_cache(self):
+        self.assertEqual(self.get_menu()[0]['link'], self.page.url)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v2/site-settings/')
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v2/site-settings/', HTTP_IF_NONE_MATCH=response.headers['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # Last-Modified is the settings' modification time, not the build time
+        updated_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        SiteSettings.objects.filter(pk=self.settings.pk).update(updated_at=updated_at)
+        cache.clear()
+        response = self.client.get('/api/v2/site-settings/')
+        self.assertEqual(response.headers['Last-Modified'], http_date(updated_at.timestamp()))
+
+    def test_linked_page_changes_invalidate_payload(self):
+        self.get_menu()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.slug = 'about-us'
+            self.page.save_revision().publish()
+        self.assertEqual(self.get_menu()[0]['link'], '/about-us/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.header_menu_items = [('menu_item', {'label': 'Contact', 'link': '/contact/'})]
+            self.settings.save()
+        self.assertEqual(self.get_menu()[0]['label'], 'Contact')
+
+    def test_navigation_is_compiled_on_save(self):
+        self.assertEqual(self.settings.compiled_navigation['header'][0]['link'], '/about/')
+        self.assertEqual(self.settings.compiled_navigation['broken_links'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.unpublish()
+        self.settings.refresh_from_db()
+        self.assertEqual(self.settings.compiled_navigation['broken_links'], [
+            {'location': 'Header > About', 'page_id': self.page.pk, 'reason': 'unpublished'},
+        ])
+        self.assertEqual(self.get_menu()[0]['link'], '')
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class SiteResolutionTests(TestCase):
+    """
+    Tests for request host based site resolution.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.default_site = Site.objects.get(is_default_site=True)
+        root = Page.objects.get(depth=1)
+        self.brand_root = root.add_child(instance=Page(title="Brand", slug="brand"))
+        self.brand_page = self.brand_root.add_child(instance=Page(title="Ranges", slug="ranges"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.brand_site = Site.objects.create(hostname='brand.example.com', root_page=self.brand_root)
+
+        settings = SiteSettings.for_site(self.brand_site)
+        settings.header_menu_items = [('menu_item', {'label': 'Ranges', 'page': self.brand_page})]
+        settings.save()
+
+    def test_host_selects_site(self):
+        response = self.client.get('/api/v2/site-settings/', HTTP_HOST='brand.example.com')
+        self.assertEqual(response.json()['header']['menu_items'][0]['link'], '/ranges/')
+        response = self.client.get('/api/v2/site-settings/')
+        self.assertEqual(response.json()['header']['menu_items'], [])
+
+        # Site and payload both come from memory / cache
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v2/site-settings/', HTTP_HOST='brand.example.com:80')
+        self.assertEqual(response.json()['header']['menu_items'][0]['label'], 'Ranges')
+
+        response = self.client.get('/api/v2/pages/', HTTP_HOST='brand.example.com')
+        self.assertEqual(
+            {item['id'] for item in response.json()['items']}, {self.brand_root.pk, self.brand_page.pk}
+        )
+
+    def test_memoized_blocks_are_kept_per_site(self):
+        serializer = DefaultBlockSerializer('text', blocks.CharBlock(), None)
+        raw = {'type': 'text', 'id': 'block-1', 'value': 'Text'}
+        memo_keys = set()
+        for host in ['brand.example.com', 'localhost']:
+            request = RequestFactory().get('/api/v2/pages/', HTTP_HOST=host)
+            with sites.request_context(request):
+                # Same base URL, so only the site tells the keys apart
+                memo_keys.add(registry._make_memo_key(serializer, raw, registry.make_context(base_url='http://cdn')))
+        self.assertEqual(len(memo_keys), 2)
+
+    def test_site_changes_reload_site_map(self):
+        self.client.get('/api/v2/site-settings/', HTTP_HOST='brand.example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.brand_site.hostname = 'other.example.com'
+            self.brand_site.save()
+        response = self.client.get('/api/v2/site-settings/', HTTP_HOST='brand.example.com')
+        self.assertEqual(response.json()['header']['menu_items'], [])
+        response = self.client.get('/api/v2/site-settings/', HTTP_HOST='other.example.com')
+        self.assertEqual(len(response.json()['header']['menu_items']), 1)
+
+        # Changes whose version bump went to another process's cache show once the map is too old
+        Site.objects.filter(pk=self.brand_site.pk).update(hostname='third.example.com')
+        self.assertEqual(sites.get_site_for_host('third.example.com', 80), self.default_site)
+        with override_settings(SITE_MAP_MAX_AGE=0):
+            self.assertEqual(sites.get_site_for_host('third.example.com', 80), self.brand_site)
+
+
+class APICacheControlTests(TestCase):
+    """
+    Tests for the Cache-Control policies of API routes.
+    """
+
+    def test_route_policies(self):
+        response = self.client.get('/api/v2/site-settings/')
+        self.assertEqual(
+            response.headers['Cache-Control'],
+            'public, max-age=300, s-maxage=3600, stale-while-revalidate=86400, stale-if-error=604800',
+        )
+        self.assertIn('Cookie', response.headers['Vary'])
+
+        response = self.client.get('/api/v2/pages/')
+        self.assertIn('s-maxage=60', response.headers['Cache-Control'])
+        response = self.client.get('/api/v2/pages/', HTTP_IF_NONE_MATCH=response.headers['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('s-maxage=60', response.headers['Cache-Control'])
+
+    def test_page_type_overrides_policy(self):
+        with mock.patch.object(HomePage, 'api_cache_control', {'s_maxage': 5}, create=True):
+            response = self.client.get('/api/v2/pages/?type=home.HomePage')
+        self.assertEqual(
+            response.headers['Cache-Control'],
+            'public, max-age=0, s-maxage=5, stale-while-revalidate=300, stale-if-error=86400',
+        )
+
+        root = Site.objects.get(is_default_site=True).root_page
+        page = root.add_child(instance=Page(title="About", slug="about"))
+        response = self.client.get(f'/api/v2/pages/{page.pk}/')
+        self.assertIn('s-maxage=60', response.headers['Cache-Control'])
+
+
+class AsyncAPITests(TestCase):
+    """
+    Tests for the async read endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        # The search index is updated on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page = root.add_child(instance=Page(title="Display Homes", slug="display-homes"))
+
+    async def test_site_settings_match_sync_endpoint(self):
+        response = await self.async_client.get('/api/v2/async/site-settings/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response.headers['Cache-Control'])
+        sync_response = await sync_to_async(self.client.get)('/api/v2/site-settings/')
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_search(self):
+        response = await self.async_client.get('/api/v2/async/search/', {'query': 'display'})
+        self.assertEqual(response.json()['items'], [
+            {'id': self.page.pk, 'title': 'Display Homes', 'type': 'wagtailcore.Page', 'url': '/display-homes/'},
+        ])
+        response = await self.async_client.get('/api/v2/async/search/', {'query': 'display', 'limit': 1000})
+        self.assertEqual(response.status_code, 400)
@@ -5,8 +5,13 @@ Common helper functions used across the project.
 """
 
 import re
+from django.conf import settings
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from django.utils.encoding import filepath_to_uri
+
+from core import rendition_cache, signed_renditions, sites
+from core.placeholders import get_placeholder_data
 
 
 def is_email_valid(email):
@@ -30,43 +35,89 @@ def get_base_url(request=None):
     """
     Get the base URL for the site.
     
+    Without a request, the request being served (core/sites.py) is used,
+    so URLs point at the host - and brand - the client asked for.
+    
     Args:
         request: Django request object (optional)
         
     Returns:
         str: Base URL (e.g., 'http://127.0.0.1:8000')
     """
+    request = request or sites.get_current_request()
     if request:
-        return f"{request.scheme}://{request.get_host()}"
+        # Built once per request
+        if not hasattr(request, '_base_url'):
+            request._base_url = f"{request.scheme}://{request.get_host()}"
+        return request._base_url
     
     # Fallback to settings or default
-    from django.conf import settings
     return getattr(settings, 'BASE_URL', 'http://127.0.0.1:8000')
 
 
+def get_image_url(image, base_url='http://127.0.0.1:8000'):
+    """
+    Build the public URL of an original image file.
+    
+    Works purely from the stored file name, so no storage backend call
+    (stat, signing, network round trip) is made.
+    
+    Args:
+        image: Wagtail Image object
+        base_url (str): Base URL used when MEDIA_PUBLIC_URL is relative
+        
+    Returns:
+        str: Absolute image URL
+    """
+    url = f"{settings.MEDIA_PUBLIC_URL}{filepath_to_uri(image.file.name)}"
+    if url.startswith(('http://', 'https://', '//')):
+        return url
+    return f"{base_url}{url}"
+
+
 def get_image_data(image, base_url='http://127.0.0.1:8000'):
     """
     Convert Wagtail image to API-friendly data structure.
     
+    Uses persisted metadata only (file_size, width, height and the stored
+    file name) - serializing images costs no storage calls.
+    
     Args:
         image: Wagtail Image object
         base_url (str): Base URL for image URLs
         
     Returns:
-        dict: Image data with URL, alt text, dimensions
+        dict: Image data with URL, alt text, dimensions, LQIP and dominant colour
     """
     if not image:
         return None
     
     return {
-        'url': f"{base_url}{image.file.url}",
+        'url': get_image_url(image, base_url),
         'alt': image.title,
         'width': image.width,
         'height': image.height,
-        'file_size': image.file.size,
+        'file_size': image.file_size,
+        **get_placeholder_data(image),
     }
 
 
+def get_renditions(image, specs):
+    """
+    Get renditions of an image in the configured IMAGE_URL_MODE.
+    
+    Args:
+        image: Wagtail Image object
+        specs (list): Rendition specifications
+        
+    Returns:
+        dict: spec -> rendition (or signed stand-in) with url, width, height
+    """
+    if signed_renditions.is_enabled():
+        return signed_renditions.get_renditions(image, specs)
+    return rendition_cache.get_renditions(image, specs)
+
+
 def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
     """
     Get specific rendition of an image.
@@ -82,7 +133,7 @@ def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
     if not image:
         return None
     
-    rendition = image.get_rendition(rendition_spec)
+    rendition = get_renditions(image, [rendition_spec])[rendition_spec]
     return {
         'url': f"{base_url}{rendition.url}",
         'alt': image.title,
@@ -105,12 +156,22 @@ def get_responsive_image_data(image, base_url='http://127.0.0.1:8000'):
     if not image:
         return None
     
-    return {
-        'original': get_image_data(image, base_url),
-        'thumbnail': get_rendition_data(image, 'fill-400x300', base_url),
-        'medium': get_rendition_data(image, 'fill-800x600', base_url),
-        'large': get_rendition_data(image, 'fill-1200x900', base_url),
+    sizes = {
+        'thumbnail': 'fill-400x300',
+        'medium': 'fill-800x600',
+        'large': 'fill-1200x900',
     }
+    renditions = get_renditions(image, sizes.values())
+    
+    data = {'original': get_image_data(image, base_url)}
+    for name, spec in sizes.items():
+        data[name] = {
+            'url': f"{base_url}{renditions[spec].url}",
+            'alt': image.title,
+            'width': renditions[spec].width,
+            'height': renditions[spec].height,
+        }
+    return data
 
 
 def sanitize_slug(text):
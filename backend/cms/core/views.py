@@ -1,130 +1,211 @@
 """
-API Views for Core App - Site Settings
+API Views for Core App - Site Settings, Batch and Pages API
 """
 
-from django.http import JsonResponse
-from wagtail.models import Site
-from core.models import SiteSettings
-from core.utils import get_base_url, get_image_data
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework.renderers import BrowsableAPIRenderer
+from wagtail.api.v2.filters import OrderingFilter, SearchFilter
+from wagtail.api.v2.utils import BadRequestError, page_models_from_string
+from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.documents.api.v2.views import DocumentsAPIViewSet
+from wagtail.images.api.v2.views import ImagesAPIViewSet
+from core import sites
+from core.api import ProjectionSerializerMixin
+from core.batch import BatchError, get_batch_requests, run_batch
+from core.cache_control import get_model_policy, set_policy
+from core.conditional import (
+    Validators, get_listing_validators, get_not_modified_response, get_page_stamp, get_page_validators,
+    set_validators,
+)
+from core.pagination import CursorPagination
+from core.renderers import HeadlessJSONRenderer, api_json_response
+from core.site_settings import get_site_settings_payload
 
 
 def site_settings_api(request):
     """
     API endpoint to retrieve site-wide settings (header/footer configuration).
     
-    Returns header navigation, footer content, contact info, and social links.
+    Returns header navigation, footer content, contact info, and social links
+    of the site serving the request host (core/sites.py), built once and
+    served from cache until the settings or a linked page change
+    (core/site_settings.py).
     """
-    try:
-        site = Site.objects.get(is_default_site=True)
-        settings = SiteSettings.for_site(site)
-        base_url = get_base_url(request)
-        
-        # Serialize header menu items
-        header_menu = []
-        for menu_item in settings.header_menu_items:
-            item_data = {
-                'label': menu_item.value.get('label', ''),
-                'aria_label': menu_item.value.get('aria_label', ''),
-                'link': menu_item.value.get('link', ''),
-            }
-            
-            # Check if page is selected instead of URL
-            if menu_item.value.get('page'):
-                page = menu_item.value['page']
-                item_data['link'] = page.url if hasattr(page, 'url') else ''
-            
-            # Serialize sub-items
-            sub_items = menu_item.value.get('sub_items', [])
-            if sub_items:
-                item_data['subItems'] = []
-                for sub_item in sub_items:
-                    sub_data = {
-                        'label': sub_item.get('label', ''),
-                        'link': sub_item.get('link', ''),
-                    }
-                    if sub_item.get('page'):
-                        page = sub_item['page']
-                        sub_data['link'] = page.url if hasattr(page, 'url') else ''
-                    item_data['subItems'].append(sub_data)
-            
-            header_menu.append(item_data)
-        
-        # Serialize footer sections
-        footer_sections = []
-        for section in settings.footer_content:
-            section_data = {
-                'type': section.value.get('section_type', 'columns'),
-            }
-            
-            if section.value.get('section_type') == 'columns':
-                columns = section.value.get('columns', [])
-                section_data['columns'] = []
-                for column in columns:
-                    column_data = {
-                        'heading': column.get('heading', ''),
-                        'links': []
-                    }
-                    for link in column.get('links', []):
-                        link_data = {
-                            'text': link.get('text', ''),
-                            'link': link.get('link', ''),
-                        }
-                        if link.get('page'):
-                            page = link['page']
-                            link_data['link'] = page.url if hasattr(page, 'url') else ''
-                        column_data['links'].append(link_data)
-                    section_data['columns'].append(column_data)
-            
-            elif section.value.get('section_type') == 'text':
-                section_data['content'] = section.value.get('content', '')
-            
-            elif section.value.get('section_type') == 'contact':
-                section_data['contact'] = {
-                    'show_email': section.value.get('show_email', True),
-                    'show_phone': section.value.get('show_phone', True),
-                    'show_address': section.value.get('show_address', True),
-                    'email': settings.contact_email,
-                    'phone': settings.contact_phone,
-                    'address': settings.contact_address,
-                }
-            
-            footer_sections.append(section_data)
-        
-        # Build social media links
-        social_links = {}
-        if settings.facebook_url:
-            social_links['facebook'] = settings.facebook_url
-        if settings.twitter_url:
-            social_links['twitter'] = settings.twitter_url
-        if settings.instagram_url:
-            social_links['instagram'] = settings.instagram_url
-        if settings.linkedin_url:
-            social_links['linkedin'] = settings.linkedin_url
-        if settings.youtube_url:
-            social_links['youtube'] = settings.youtube_url
-        
-        # Build response
-        response_data = {
-            'header': {
-                'logo_text': settings.header_logo_text,
-                'menu_items': header_menu,
-            },
-            'footer': {
-                'sections': footer_sections,
-                'copyright': settings.footer_copyright,
-            },
-            'contact': {
-                'email': settings.contact_email,
-                'phone': settings.contact_phone,
-                'address': settings.contact_address,
-            },
-            'social': social_links,
-        }
-        
-        return JsonResponse(response_data)
+    site = sites.find_for_request(request)
+    if site is None:
+        return api_json_response({'error': 'No site is configured for this host'}, status=404)
     
+    try:
+        payload = get_site_settings_payload(site)
     except Exception as e:
-        return JsonResponse(
+        return api_json_response(
             {'error': f'Failed to load site settings: {str(e)}'},
             status=500
         )
+    
+    # Repeat visits are answered without sending the payload again
+    validators = Validators(payload['etag'], payload['last_modified'])
+    not_modified = get_not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(HttpResponse(payload['body'], content_type='application/json'), validators)
+
+
+# Read-only sub-requests - nothing for CSRF to protect
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def api_batch(request):
+    """
+    API endpoint running several API GET requests in one round trip.
+    
+    Takes a named preset (``?preset=app-shell``) and/or, as a POST JSON
+    body, ``{"preset": ..., "requests": {name: path}}``. See core/batch.py.
+    """
+    preset, requests = request.GET.get('preset'), None
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return api_json_response({'message': 'invalid JSON body'}, status=400)
+        if not isinstance(data, dict):
+            return api_json_response({'message': 'body must be a JSON object'}, status=400)
+        preset, requests = data.get('preset', preset), data.get('requests')
+    
+    try:
+        batch = get_batch_requests(preset, requests)
+    except BatchError as e:
+        return api_json_response({'message': str(e)}, status=400)
+    return HttpResponse(run_batch(request, batch), content_type='application/json')
+
+
+# Sub-requests never run another batch
+api_batch.api_batch = True
+
+
+# Wagtail's API endpoints set their renderers explicitly, so each one is
+# subclassed to render JSON with the API_JSON_RENDERER backend
+API_RENDERER_CLASSES = [HeadlessJSONRenderer, BrowsableAPIRenderer]
+
+
+class HeadlessPagesAPIViewSet(PagesAPIViewSet):
+    """
+    Pages API endpoint with sub field projection.
+    
+    Fields a page model lists in ``api_projectable_fields`` accept sub
+    fields in the ``fields`` parameter, e.g.
+    ``fields=body_content_data(blog_section,quality_homes)`` or
+    ``fields=house_designs_data(id,name,image)``. The model reads them with
+    ``get_api_projection()`` and skips everything else, including image
+    renditions of unrequested blocks.
+    
+    Listing and detail responses carry ETag / Last-Modified validators
+    (core/conditional.py); a matching conditional request gets a 304
+    before the pages are loaded.
+    
+    Listings passing ``cursor`` (empty for the first page) are paginated
+    by keyset instead of offset (core/pagination.py).
+    
+    Page types override the Cache-Control policy of the endpoint with
+    ``api_cache_control`` (core/cache_control.py).
+    """
+    
+    renderer_classes = API_RENDERER_CLASSES
+    known_query_parameters = PagesAPIViewSet.known_query_parameters.union(['cursor'])
+    
+    def listing_view(self, request):
+        validators = get_listing_validators(request)
+        policy = self.get_listing_cache_policy(request)
+        not_modified = get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return set_policy(not_modified, policy)
+        if 'cursor' in request.GET:
+            response = self.cursor_listing_view(request)
+        else:
+            response = super().listing_view(request)
+        return set_policy(set_validators(response, validators), policy)
+    
+    def cursor_listing_view(self, request):
+        if 'offset' in request.GET:
+            raise BadRequestError("offset cannot be combined with cursor")
+        if 'search' in request.GET:
+            raise BadRequestError("search results cannot be paginated with cursor")
+        
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        # The paginator applies (and validates) the order itself
+        for backend in self.filter_backends:
+            if backend not in (OrderingFilter, SearchFilter):
+                queryset = backend().filter_queryset(request, queryset, self)
+        
+        paginator = CursorPagination()
+        pages = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(pages, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    def detail_view(self, request, pk):
+        stamp = get_page_stamp(pk)
+        validators = get_page_validators(request, pk, stamp) if stamp else None
+        policy = None
+        if stamp:
+            policy = get_model_policy([ContentType.objects.get_for_id(stamp[2]).model_class()])
+        not_modified = get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return set_policy(not_modified, policy)
+        return set_policy(set_validators(super().detail_view(request, pk), validators), policy)
+    
+    def get_listing_cache_policy(self, request):
+        """``api_cache_control`` of the page types a listing is filtered to."""
+        try:
+            models = page_models_from_string(request.GET.get('type', 'wagtailcore.Page'))
+        except (LookupError, ValueError):
+            return None
+        return get_model_policy(models)
+    
+    @classmethod
+    def _get_serializer_class(cls, router, model, fields_config, show_details=False, nested=False):
+        projectable_fields = getattr(model, 'api_projectable_fields', [])
+        projections = {}
+        plain_fields_config = []
+        for field_name, negated, sub_fields in fields_config:
+            if sub_fields and field_name in projectable_fields:
+                projections[field_name] = cls._get_projection(field_name, sub_fields)
+                sub_fields = None
+            plain_fields_config.append((field_name, negated, sub_fields))
+        
+        serializer_class = super()._get_serializer_class(
+            router, model, plain_fields_config, show_details=show_details, nested=nested
+        )
+        if nested:
+            return serializer_class
+        return type(serializer_class.__name__, (ProjectionSerializerMixin, serializer_class), {
+            'projections': projections,
+        })
+    
+    @staticmethod
+    def _get_projection(field_name, sub_fields):
+        """Turn parsed sub fields into a list of names (None for '*')."""
+        if sub_fields[0][0] == '*':
+            return None
+        for sub_field_name, negated, nested in sub_fields:
+            if negated or nested or sub_field_name == '_':
+                raise BadRequestError(
+                    "'%s' sub fields must be a list of names" % field_name
+                )
+        return [sub_field_name for sub_field_name, _, _ in sub_fields]
+
+
+class HeadlessImagesAPIViewSet(ImagesAPIViewSet):
+    """Images API endpoint rendered with the API_JSON_RENDERER backend."""
+    
+    renderer_classes = API_RENDERER_CLASSES
+
+
+class HeadlessDocumentsAPIViewSet(DocumentsAPIViewSet):
+    """Documents API endpoint rendered with the API_JSON_RENDERER backend."""
+    
+    renderer_classes = API_RENDERER_CLASSES
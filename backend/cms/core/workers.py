@@ -0,0 +1,114 @@
+"""
+Background Worker Pool for Wagtail Headless CMS
+
+Shared pool of worker processes for image work (rendition pre-generation,
+placeholders) that must not run inside API requests.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _init_worker():
+    """Set up Django inside a freshly spawned worker process."""
+    import django
+    django.setup()
+
+
+def get_executor():
+    """
+    Get the shared process pool (created on first use).
+    
+    Returns:
+        ProcessPoolExecutor: Pool sized by the RENDITION_WORKERS setting
+    """
+    global _executor
+    if _executor is None:
+        _executor = create_executor(settings.RENDITION_WORKERS)
+    return _executor
+
+
+def create_executor(workers):
+    """
+    Create a process pool whose workers have Django set up.
+    
+    Args:
+        workers (int): Number of worker processes
+        
+    Returns:
+        ProcessPoolExecutor: New pool
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    )
+
+
+def _make_done_callback(on_done=None):
+    """Done-callback logging failures and passing results to ``on_done``."""
+    def callback(future):
+        exception = future.exception()
+        if exception is not None:
+            logger.error("Background job failed: %s", exception)
+            return
+        if on_done is None:
+            return
+        try:
+            on_done(future.result())
+        except Exception:
+            logger.exception("Background job callback failed")
+    return callback
+
+
+def run_on_commit(func, jobs, on_done=None):
+    """
+    Run ``func(*args)`` for every args tuple once the current transaction
+    has committed.
+    
+    Jobs go to the shared pool. With RENDITION_WORKERS set to 0 they run
+    inline instead, which is what tests and management commands want.
+    
+    Workers are separate processes with caches of their own (the default
+    cache is per process), so cache writes a job needs the web process to
+    see - generation bumps, cache entries, purges - go in ``on_done``,
+    which is called with the result of each successful job in the process
+    that queued it. It must not query the database: in the pool it runs
+    on the executor's management thread.
+    
+    Args:
+        func: Module-level function (it is pickled for the workers)
+        jobs (list): Argument tuples, one per job
+        on_done: Function called with the result of each job (optional)
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    
+    def run():
+        if not settings.RENDITION_WORKERS:
+            # Failures are logged like in the pool - they must not fail the request
+            for args in jobs:
+                try:
+                    result = func(*args)
+                except Exception as e:
+                    logger.error("Background job failed: %s", e)
+                    continue
+                if on_done is not None:
+                    on_done(result)
+            return
+        
+        executor = get_executor()
+        callback = _make_done_callback(on_done)
+        for args in jobs:
+            executor.submit(func, *args).add_done_callback(callback)
+    
+    transaction.on_commit(run)
@@ -4,6 +4,15 @@ This file defines the exact image sizes required by each frontend component
 to ensure crisp, properly sized images without blur or stretching.
 """
 
+from collections import defaultdict
+from itertools import chain
+
+from django.db.models import Prefetch, prefetch_related_objects
+from wagtail.images.models import Filter
+
+from core import rendition_cache, signed_renditions
+from core.placeholders import get_placeholders
+
 # Desktop breakpoint: 1400px max container
 # Tablet breakpoint: 768px - 1024px  
 # Mobile breakpoint: < 768px
@@ -105,6 +114,32 @@ COMPONENT_IMAGE_MAPPING = {
     }
 }
 
+# Format ladder - every breakpoint spec is also rendered in these formats
+# (best first) and at these fractions of its width, for <picture> sources.
+# Ladder renditions are only ever rendered by the pre-generation pool and
+# are left out of the payload until they exist.
+RESPONSIVE_FORMATS = ['avif', 'webp', 'jpeg']
+SRCSET_SCALES = [0.5, 1]
+
+# Per-config overrides of the ladder, e.g. skip AVIF for 4K lightbox images
+SRCSET_CONFIGS = {
+    'hero_slide_full': {'formats': ['webp', 'jpeg']},
+}
+
+# Media query for each breakpoint, in the order <picture> should try them
+BREAKPOINT_MEDIA = [
+    ('desktop', '(min-width: 1025px)'),
+    ('tablet', '(min-width: 768px)'),
+    ('mobile', None),
+]
+
+IMAGE_MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+}
+
+
 def get_image_renditions(component_type, field_path='image'):
     """
     Get the appropriate image renditions for a component type and field.
@@ -116,16 +151,66 @@ def get_image_renditions(component_type, field_path='image'):
     Returns:
         dict: Dictionary with desktop, tablet, mobile rendition strings
     """
-    # Get component mapping or use default
+    return IMAGE_CONFIGS[get_image_config_key(component_type, field_path)]
+
+def get_image_config_key(component_type, field_path='image'):
+    """Get the IMAGE_CONFIGS key used for a component field."""
     component_mapping = COMPONENT_IMAGE_MAPPING.get(component_type, COMPONENT_IMAGE_MAPPING['default'])
-    
-    # Get config key for this field path
     config_key = component_mapping.get(field_path, component_mapping.get('image', 'content_image'))
+    return config_key if config_key in IMAGE_CONFIGS else 'content_image'
+
+
+def get_srcset_specs(spec, config_key=None):
+    """
+    Expand a breakpoint spec into its format ladder.
     
-    # Get the actual image config
-    return IMAGE_CONFIGS.get(config_key, IMAGE_CONFIGS['content_image'])
+    Args:
+        spec (str): Breakpoint spec (e.g., 'fill-1200x480|format-webp')
+        config_key (str): IMAGE_CONFIGS key, for SRCSET_CONFIGS overrides
+        
+    Returns:
+        list: (format, spec) tuples, e.g. ('avif', 'fill-600x240|format-avif')
+    """
+    overrides = SRCSET_CONFIGS.get(config_key, {})
+    operations = spec.split('|')
+    resize = operations[0]
+    others = [op for op in operations[1:] if not op.startswith('format-')]
+    
+    variants = []
+    for image_format in overrides.get('formats', RESPONSIVE_FORMATS):
+        for scale in overrides.get('scales', SRCSET_SCALES):
+            variants.append((
+                image_format,
+                '|'.join([_scale_operation(resize, scale), *others, f'format-{image_format}']),
+            ))
+    return variants
+
 
-def generate_responsive_image_data(image_obj, component_type, field_path='image', base_url='http://127.0.0.1:8000'):
+def _scale_operation(operation, scale):
+    """Scale the dimensions of a resize operation ('fill-1200x480' -> 'fill-600x240')."""
+    method, _, size = operation.partition('-')
+    size, _, extra = size.partition('-')
+    if scale == 1 or not size:
+        return operation
+    try:
+        dimensions = [str(max(1, round(int(d) * scale))) for d in size.split('x')]
+    except ValueError:
+        return operation
+    scaled = f"{method}-{'x'.join(dimensions)}"
+    return f"{scaled}-{extra}" if extra else scaled
+
+
+def get_managed_specs():
+    """Return every spec IMAGE_CONFIGS can produce, ladder included."""
+    specs = set()
+    for config_key, config in IMAGE_CONFIGS.items():
+        for spec in config.values():
+            specs.add(spec)
+            specs.update(ladder_spec for _, ladder_spec in get_srcset_specs(spec, config_key))
+    return specs
+
+
+def generate_responsive_image_data(image_obj, component_type, field_path='image', base_url='http://127.0.0.1:8000', resolver=None):
     """
     Generate responsive image data for a Wagtail image object.
     
@@ -134,19 +219,210 @@ def generate_responsive_image_data(image_obj, component_type, field_path='image'
         component_type (str): Type of component using the image
         field_path (str): Path to the image field
         base_url (str): Base URL for the site
+        resolver (RenditionResolver): Optional resolver holding renditions
+            that were fetched up front
         
     Returns:
-        dict: Image data with src, desktop, tablet, mobile URLs and alt text
+        dict: Image data with src, desktop, tablet, mobile URLs, alt text,
+            <picture> sources (one per breakpoint and format), a srcset
+            for the desktop image, LQIP and dominant colour
     """
     if not image_obj:
         return None
         
+    if resolver is None:
+        resolver = RenditionResolver()
+        resolver.add(image_obj, component_type, field_path)
+        resolver.resolve()
+    
     renditions = get_image_renditions(component_type, field_path)
+    resolved = resolver.get_renditions(image_obj, renditions.values())
+    
+    desktop_url = f"{base_url}{resolved[renditions['desktop']].url}"
+    
+    sources = []
+    srcsets = {}
+    for breakpoint, media in BREAKPOINT_MEDIA:
+        for image_format, ladder in resolver.get_srcset(image_obj, component_type, field_path, breakpoint).items():
+            srcset = ', '.join(f"{base_url}{rendition.url} {rendition.width}w" for rendition in ladder)
+            # Formats go best first, so the <img> fallback keeps the most compatible one
+            srcsets[breakpoint] = srcset
+            source = {'type': IMAGE_MIME_TYPES.get(image_format, f'image/{image_format}'), 'srcset': srcset}
+            if media:
+                source['media'] = media
+            sources.append(source)
     
     return {
-        'src': f"{base_url}{image_obj.get_rendition(renditions['desktop']).url}",
-        'desktop': f"{base_url}{image_obj.get_rendition(renditions['desktop']).url}",
-        'tablet': f"{base_url}{image_obj.get_rendition(renditions['tablet']).url}",
-        'mobile': f"{base_url}{image_obj.get_rendition(renditions['mobile']).url}",
+        'src': desktop_url,
+        'desktop': desktop_url,
+        'tablet': f"{base_url}{resolved[renditions['tablet']].url}",
+        'mobile': f"{base_url}{resolved[renditions['mobile']].url}",
         'alt': image_obj.title or 'Image',
-    }
\ No newline at end of file
+        'srcset': srcsets.get('desktop', f"{desktop_url} {resolved[renditions['desktop']].width}w"),
+        'sources': sources,
+        **resolver.get_placeholder(image_obj),
+    }
+
+
+class RenditionResolver:
+    """
+    Batched rendition lookup for a whole page payload.
+    
+    Serializers first register every (image, component, field) they are
+    going to render with ``add()``. ``resolve()`` then loads the existing
+    renditions for all images with a single query and creates the missing
+    ones together, so building the payload needs no further lookups.
+    Renditions found in the shared URL cache skip the query altogether.
+    Stored image placeholders (LQIP, dominant colour) are loaded in bulk too.
+    
+    Format ladder renditions are optional: existing ones are picked up by
+    the same query, missing ones are never rendered here but reported by
+    ``get_missing()`` for the pre-generation pool.
+    
+    In signed URL mode (IMAGE_URL_MODE = 'signed') nothing is looked up:
+    every spec resolves to a signed serve-view URL that renders on demand.
+    
+    Usage:
+        resolver = RenditionResolver()
+        resolver.add(image, 'hero', 'slides.image')
+        resolver.resolve()
+        generate_responsive_image_data(image, 'hero', 'slides.image', resolver=resolver)
+    """
+    
+    def __init__(self):
+        self._images = {}
+        self._specs = defaultdict(dict)
+        self._optional = defaultdict(dict)
+        self._renditions = defaultdict(dict)
+        self._missing = defaultdict(dict)
+        self._placeholders = {}
+    
+    def add(self, image_obj, component_type, field_path='image'):
+        """Register the renditions an image needs for a component field."""
+        if not image_obj:
+            return
+        self._images.setdefault(image_obj.pk, image_obj)
+        config_key = get_image_config_key(component_type, field_path)
+        for spec in IMAGE_CONFIGS[config_key].values():
+            self._specs[image_obj.pk][spec] = None
+            for _, ladder_spec in get_srcset_specs(spec, config_key):
+                if ladder_spec not in self._specs[image_obj.pk]:
+                    self._optional[image_obj.pk][ladder_spec] = None
+    
+    def get_specs(self):
+        """Return every registered spec (ladder included) keyed by image id"""
+        return {
+            pk: list(dict.fromkeys([*specs, *self._optional[pk]]))
+            for pk, specs in self._specs.items()
+        }
+    
+    def get_missing(self):
+        """Return ladder specs that do not exist yet, keyed by image id"""
+        return {pk: list(specs) for pk, specs in self._missing.items() if specs}
+    
+    def _unresolved(self, pk):
+        resolved = self._renditions[pk]
+        return (
+            [spec for spec in self._specs[pk] if spec not in resolved],
+            [spec for spec in self._optional[pk] if spec not in resolved and spec not in self._missing[pk]],
+        )
+    
+    def resolve(self):
+        """Fetch and create all registered renditions that are not resolved yet."""
+        # Stored placeholders for every new image in one go (cache first)
+        new_images = [image_obj for pk, image_obj in self._images.items() if pk not in self._placeholders]
+        if new_images:
+            self._placeholders.update(get_placeholders(new_images))
+        
+        pending = [self._images[pk] for pk in self._images if any(self._unresolved(pk))]
+        if not pending:
+            return
+        
+        if signed_renditions.is_enabled():
+            for image_obj in pending:
+                required, optional = self._unresolved(image_obj.pk)
+                self._renditions[image_obj.pk].update(
+                    signed_renditions.get_renditions(image_obj, required + optional)
+                )
+            return
+        
+        # Shared URL cache first - warm requests stop here
+        pairs = []
+        for image_obj in pending:
+            required, optional = self._unresolved(image_obj.pk)
+            pairs.extend((image_obj, spec) for spec in required + optional)
+        for (pk, spec), rendition in rendition_cache.get_many(pairs).items():
+            self._renditions[pk][spec] = rendition
+        pending = [image_obj for image_obj in pending if any(self._unresolved(image_obj.pk))]
+        if not pending:
+            return
+        
+        # One query for the renditions of every pending image
+        Rendition = pending[0].get_rendition_model()
+        all_specs = {spec for image_obj in pending for spec in chain(*self._unresolved(image_obj.pk))}
+        for image_obj in pending:
+            # Drop stale prefetches so the new query is used
+            if hasattr(image_obj, 'prefetched_renditions'):
+                del image_obj.prefetched_renditions
+        prefetch_related_objects(pending, Prefetch(
+            'renditions',
+            queryset=Rendition.objects.filter(filter_spec__in=all_specs),
+            to_attr='prefetched_renditions',
+        ))
+        
+        # Prefetched renditions are reused, missing ones are created per image in one go.
+        # Missing ladder renditions are left for the pre-generation pool.
+        to_cache = []
+        for image_obj in pending:
+            required, optional = self._unresolved(image_obj.pk)
+            renditions = image_obj.get_renditions(*required) if required else {}
+            found = image_obj.find_existing_renditions(*[Filter(spec=spec) for spec in optional])
+            renditions.update({f.spec: rendition for f, rendition in found.items()})
+            for spec in optional:
+                if spec not in renditions:
+                    self._missing[image_obj.pk][spec] = None
+            self._renditions[image_obj.pk].update(renditions)
+            to_cache.extend((image_obj, spec, rendition) for spec, rendition in renditions.items())
+        rendition_cache.set_many(to_cache)
+    
+    def get_renditions(self, image_obj, specs):
+        """
+        Return renditions for an image keyed by spec, resolving anything
+        that was not registered beforehand.
+        """
+        specs = list(specs)
+        if any(spec not in self._renditions[image_obj.pk] for spec in specs):
+            self._images.setdefault(image_obj.pk, image_obj)
+            for spec in specs:
+                self._specs[image_obj.pk][spec] = None
+            self.resolve()
+        return {spec: self._renditions[image_obj.pk][spec] for spec in specs}
+    
+    def get_placeholder(self, image_obj):
+        """Return the stored LQIP and dominant colour of an image."""
+        if image_obj.pk not in self._placeholders:
+            self._images.setdefault(image_obj.pk, image_obj)
+            self.resolve()
+        return self._placeholders[image_obj.pk]
+    
+    def get_srcset(self, image_obj, component_type, field_path, breakpoint):
+        """
+        Return the existing ladder renditions of one breakpoint.
+        
+        Returns:
+            dict: format -> renditions ordered by width (formats best first)
+        """
+        config_key = get_image_config_key(component_type, field_path)
+        spec = IMAGE_CONFIGS[config_key][breakpoint]
+        resolved = self._renditions[image_obj.pk]
+        
+        ladder = defaultdict(list)
+        for image_format, ladder_spec in get_srcset_specs(spec, config_key):
+            rendition = resolved.get(ladder_spec)
+            # Ladder steps that collapse to the same width add nothing to a srcset
+            if rendition is not None and all(r.width != rendition.width for r in ladder[image_format]):
+                ladder[image_format].append(rendition)
+        return {
+            image_format: sorted(renditions, key=lambda r: r.width)
+            for image_format, renditions in ladder.items()
+        }
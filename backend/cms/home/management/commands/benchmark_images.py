@@ -0,0 +1,345 @@
+"""
+Benchmark the image path of the HomePage API payload.
+
+Builds a HomePage (hero slides, projects, horizontal slider, multi-image
+content, blog section) on synthetic originals of several sizes and formats,
+then measures ``hero_section_data`` and ``body_content_data`` in three
+scenarios:
+
+    cold    no renditions exist, nothing cached
+    warm    every rendition exists, caches empty
+    cached  every rendition exists, rendition URL cache primed
+
+For each it reports wall time, time spent rendering in Pillow (summed over
+Wagtail's rendering threads, so it can exceed wall time), DB query count
+and peak RSS as JSON, so runs on different branches (or Wagtail /
+Pillow versions) can be compared. Everything runs in a rolled back
+transaction with a temporary MEDIA_ROOT and local memory cache, so
+content, media and shared caches are left untouched.
+
+Usage:
+    python manage.py benchmark_images
+    python manage.py benchmark_images --runs 5 --output before.json
+    python manage.py benchmark_images --output after.json --compare before.json
+"""
+
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.images import ImageFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from PIL import Image as PILImage, ImageDraw
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+from wagtail.models import Page
+
+from home.models import HomePage
+from home.renditions import get_page_image_specs, render_image_specs
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# (width, height, format) of the synthetic originals, used in turn
+ORIGINALS = [
+    (1920, 1080, 'JPEG'),
+    (4000, 3000, 'JPEG'),
+    (2400, 1600, 'PNG'),
+    (1600, 1200, 'WEBP'),
+    (3000, 2000, 'AVIF'),
+]
+
+SCENARIOS = ['cold', 'warm', 'cached']
+TARGETS = ['hero_section_data', 'body_content_data']
+PACKAGES = ['Django', 'wagtail', 'Pillow', 'Willow', 'pillow_heif']
+
+
+class Command(BaseCommand):
+    help = "Benchmark HomePage image serialization cold, warm and cached"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs', type=int, default=3,
+            help="Measured runs per scenario and target",
+        )
+        parser.add_argument(
+            '--slides', type=int, default=4,
+            help="Hero slides (also used for the number of projects)",
+        )
+        parser.add_argument(
+            '--url-mode', choices=['rendition', 'signed'], default='rendition',
+            help="IMAGE_URL_MODE to benchmark",
+        )
+        parser.add_argument(
+            '--output',
+            help="Write the JSON results to this file instead of stdout",
+        )
+        parser.add_argument(
+            '--compare',
+            help="JSON results of a previous run to compare wall times against",
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+
+        media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+        try:
+            with override_settings(
+                MEDIA_ROOT=media_root,
+                CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'benchmark-images',
+                }},
+                RENDITION_URL_CACHE='default',
+                RENDITION_PREGENERATION=False,
+                RENDITION_STORAGE_BUDGET=None,
+                IMAGE_PLACEHOLDERS=False,
+                IMAGE_URL_MODE=options['url_mode'],
+            ):
+                with transaction.atomic():
+                    results = self.run_benchmark(options)
+                    transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Results written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            self.compare(results, options['compare'])
+
+    def run_benchmark(self, options):
+        images = self.create_originals(options['slides'] * 2 + 13)
+        page = self.create_page(images, options['slides'])
+
+        results = []
+        for scenario in SCENARIOS:
+            for target in TARGETS:
+                runs = []
+                for _ in range(options['runs']):
+                    self.prepare(scenario, page, images, target)
+                    fresh_page = HomePage.objects.get(pk=page.pk)
+                    runs.append(self.measure(lambda: getattr(fresh_page, target)))
+                results.append(self.summarize(scenario, target, runs))
+                self.stderr.write(
+                    f"{scenario:>6} {target:<18} {results[-1]['wall_ms']:>9.1f} ms "
+                    f"{results[-1]['pillow_ms']:>9.1f} ms pillow {results[-1]['queries']:>4} queries"
+                )
+
+        return {
+            'environment': self.get_environment(),
+            'config': {
+                'runs': options['runs'],
+                'slides': options['slides'],
+                'url_mode': options['url_mode'],
+                'images': len(images),
+                'originals': [f"{w}x{h} {image_format}" for w, h, image_format in ORIGINALS],
+            },
+            'results': results,
+        }
+
+    def create_originals(self, count):
+        """Create deterministic synthetic originals, cycling through ORIGINALS."""
+        Image = get_image_model()
+        images = []
+        for i in range(count):
+            width, height, image_format = ORIGINALS[i % len(ORIGINALS)]
+            extension = image_format.lower().replace('jpeg', 'jpg')
+            images.append(Image.objects.create(
+                title=f"Benchmark {i}",
+                file=ImageFile(make_original(width, height, image_format, seed=i), name=f"benchmark{i}.{extension}"),
+            ))
+        return images
+
+    def create_page(self, images, slides):
+        """Build a HomePage using every image-bearing block type."""
+        images = iter(images)
+        page = HomePage(
+            title="Image Benchmark",
+            slug=f"image-benchmark-{int(time.time())}",
+            hero_section=[{'type': 'hero', 'value': {
+                'hero_title': 'Benchmark',
+                'background_image': next(images).pk,
+                'slides': [
+                    {'title': f'Slide {i}', 'image': next(images).pk, 'full_image': next(images).pk}
+                    for i in range(slides)
+                ],
+            }}],
+            body=[
+                {'type': 'residential_projects', 'value': {
+                    'title': 'Projects',
+                    'projects': [{'title': f'Project {i}', 'image': next(images).pk} for i in range(3)],
+                }},
+                {'type': 'horizontal_slider', 'value': {
+                    'title': 'Services',
+                    'slides': [{'order': f'0{i}', 'title': f'Service {i}', 'image': next(images).pk} for i in range(3)],
+                }},
+                {'type': 'multi_image_content', 'value': {
+                    'section_title': 'Gallery',
+                    'images': [{'image': next(images).pk, 'alt_text': f'Image {i}'} for i in range(2)],
+                    'cta': {'button_text': 'More'},
+                }},
+                {'type': 'blog_section', 'value': {
+                    'featured_post': {
+                        'title': 'Featured', 'date': 'Today', 'category': 'News', 'excerpt': 'Text',
+                        'image': next(images).pk, 'additional_image': next(images).pk,
+                    },
+                    'sidebar_posts': [
+                        {'title': f'Post {i}', 'date': 'Today', 'category': 'News', 'excerpt': 'Text', 'image': next(images).pk}
+                        for i in range(2)
+                    ],
+                }},
+            ],
+        )
+        Page.get_first_root_node().add_child(instance=page)
+        return page
+
+    def prepare(self, scenario, page, images, target):
+        """Put renditions and caches in the state a scenario starts from."""
+        Rendition = get_image_model().get_rendition_model()
+        if scenario == 'cold':
+            Rendition.objects.filter(image__in=images).delete()
+            cache.clear()
+            return
+
+        for image_id, specs in get_page_image_specs(HomePage.objects.get(pk=page.pk)).items():
+            render_image_specs(image_id, specs)
+        cache.clear()
+        if scenario == 'cached':
+            getattr(HomePage.objects.get(pk=page.pk), target)
+
+    def measure(self, func):
+        """Run func once, timing it, its Pillow work and its queries."""
+        pillow_seconds = 0.0
+        run_filter = Filter.run
+
+        def timed_run(image_filter, *args, **kwargs):
+            nonlocal pillow_seconds
+            start = time.perf_counter()
+            try:
+                return run_filter(image_filter, *args, **kwargs)
+            finally:
+                pillow_seconds += time.perf_counter() - start
+
+        with mock.patch.object(Filter, 'run', timed_run), CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            wall_seconds = time.perf_counter() - start
+
+        return {
+            'wall_ms': wall_seconds * 1000,
+            'pillow_ms': pillow_seconds * 1000,
+            'queries': len(queries),
+            'peak_rss_mb': get_peak_rss_mb(),
+        }
+
+    def summarize(self, scenario, target, runs):
+        return {
+            'scenario': scenario,
+            'target': target,
+            'wall_ms': round(statistics.median(run['wall_ms'] for run in runs), 3),
+            'wall_ms_min': round(min(run['wall_ms'] for run in runs), 3),
+            'wall_ms_runs': [round(run['wall_ms'], 3) for run in runs],
+            'pillow_ms': round(statistics.median(run['pillow_ms'] for run in runs), 3),
+            'queries': runs[-1]['queries'],
+            'peak_rss_mb': runs[-1]['peak_rss_mb'],
+        }
+
+    def get_environment(self):
+        packages = {}
+        for package in PACKAGES:
+            try:
+                packages[package] = version(package)
+            except PackageNotFoundError:
+                packages[package] = None
+
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'database': connection.vendor,
+            'commit': commit,
+            'packages': packages,
+        }
+
+    def compare(self, results, baseline_path):
+        with open(baseline_path) as f:
+            baseline = {
+                (result['scenario'], result['target']): result
+                for result in json.load(f)['results']
+            }
+
+        self.stderr.write(f"\nWall time vs {baseline_path}:")
+        for result in results['results']:
+            before = baseline.get((result['scenario'], result['target']))
+            if not before or not before['wall_ms']:
+                continue
+            change = (result['wall_ms'] - before['wall_ms']) / before['wall_ms'] * 100
+            self.stderr.write(
+                f"{result['scenario']:>6} {result['target']:<18} "
+                f"{before['wall_ms']:>9.1f} -> {result['wall_ms']:>9.1f} ms ({change:+.1f}%)"
+            )
+
+
+def make_original(width, height, image_format, seed):
+    """
+    Render a deterministic test image with gradients and shapes, so
+    encoders see something closer to a photo than a flat colour.
+
+    Returns:
+        BytesIO: Encoded image
+    """
+    rng = random.Random(seed)
+    gradient = PILImage.linear_gradient('L').resize((width, height))
+    radial = PILImage.radial_gradient('L').resize((width, height))
+    image = PILImage.merge('RGB', (gradient, radial, gradient.transpose(PILImage.Transpose.ROTATE_180)))
+
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        size = rng.randrange(20, max(21, width // 6))
+        colour = tuple(rng.randrange(256) for _ in range(3))
+        draw.rectangle([x, y, x + size, y + size // 2], fill=colour)
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    buffer.seek(0)
+    return buffer
+
+
+def get_peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
@@ -0,0 +1,179 @@
+"""
+Audit, warm and prune image renditions based on actual content usage.
+
+Scans every live HomePage, GeneralPage, LandingPage and published
+HouseDesign, works out the renditions IMAGE_CONFIGS / COMPONENT_IMAGE_MAPPING
+say are needed and compares them with the renditions table.
+
+Every run starts from that audit, so an interrupted run simply resumes:
+renditions written before the interruption are found and skipped.
+
+Usage:
+    python manage.py warm_renditions --dry-run
+    python manage.py warm_renditions --workers 4
+    python manage.py warm_renditions --prune
+"""
+
+from concurrent.futures import as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+
+from core.block_serializers import registry
+from core.workers import create_executor
+from home.image_config import RenditionResolver, get_managed_specs
+from home.models import HomePage
+from home.renditions import render_image_specs, renditions_rendered
+from house_designs.models import HouseDesign
+from pages.models import GeneralPage, LandingPage
+
+
+# Specs managed by IMAGE_CONFIGS (format ladder included) - only these are
+# ever pruned, so renditions used by the Wagtail admin (thumbnails, focal
+# point editor) are left alone
+MANAGED_SPECS = get_managed_specs()
+
+
+class Command(BaseCommand):
+    help = "Generate missing renditions for live content and prune unused ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report what would be generated and pruned",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.RENDITION_WORKERS,
+            help="Worker processes used for generation (0 renders inline)",
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help="Delete renditions of managed specs that no content needs",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        needed = self.collect_needed_specs()
+        missing, unused = self.audit(needed)
+
+        self.stdout.write(
+            f"{sum(len(specs) for specs in needed.values())} renditions needed for "
+            f"{len(needed)} images, {sum(len(specs) for specs in missing.values())} missing, "
+            f"{len(unused)} unused"
+        )
+
+        if options['dry_run']:
+            for image_id, specs in missing.items():
+                self.log(f"  would generate image {image_id}: {', '.join(specs)}")
+            if options['prune']:
+                self.log(f"  would delete {len(unused)} unused renditions")
+            return
+
+        self.generate(missing, options)
+
+        if options['prune'] and unused:
+            self.prune(unused)
+
+    def log(self, message):
+        if self.verbosity > 1:
+            self.stdout.write(message)
+
+    def collect_needed_specs(self):
+        """Return image id -> set of specs needed by live content."""
+        resolver = RenditionResolver()
+
+        for page in HomePage.objects.live().specific():
+            page.collect_images(resolver)
+
+        # Only blocks whose serializer declares images get renditions - the
+        # rest are served through get_api_representation() (image ids)
+        stream_sources = [
+            (GeneralPage.objects.live(), 'body'),
+            (LandingPage.objects.live(), 'body'),
+            (HouseDesign.objects.filter(is_published=True), 'additional_content'),
+        ]
+        for queryset, field_name in stream_sources:
+            for obj in queryset:
+                for block in getattr(obj, field_name) or []:
+                    serializer_class = registry.get(block.block_type, block.block)
+                    for image_obj, field_path in serializer_class.iter_images(block.value):
+                        resolver.add(image_obj, block.block_type, field_path)
+
+        return {pk: set(specs) for pk, specs in resolver.get_specs().items()}
+
+    def audit(self, needed):
+        """
+        Compare needed specs with the renditions table.
+
+        Returns:
+            tuple: (image id -> missing specs, ids of unused renditions)
+        """
+        Image = get_image_model()
+        Rendition = Image.get_rendition_model()
+        images = Image.objects.in_bulk(needed.keys())
+
+        # Renditions are only valid for the image's current focal point
+        wanted = set()
+        for image_id, specs in needed.items():
+            image = images.get(image_id)
+            if image is None:
+                continue
+            for spec in specs:
+                wanted.add((image_id, spec, Filter(spec=spec).get_cache_key(image)))
+
+        existing = set()
+        unused = []
+        for rendition in Rendition.objects.filter(filter_spec__in=MANAGED_SPECS).values(
+            'id', 'image_id', 'filter_spec', 'focal_point_key'
+        ):
+            key = (rendition['image_id'], rendition['filter_spec'], rendition['focal_point_key'])
+            if key in wanted:
+                existing.add(key)
+            else:
+                unused.append(rendition['id'])
+
+        missing = {}
+        for image_id, spec, focal_point_key in sorted(wanted - existing):
+            missing.setdefault(image_id, []).append(spec)
+
+        return missing, unused
+
+    def generate(self, missing, options):
+        """Render missing renditions, reporting progress per image."""
+        total = len(missing)
+        completed = 0
+
+        def report(image_id, count):
+            nonlocal completed
+            completed += 1
+            self.stdout.write(f"[{completed}/{total}] image {image_id}: {count} renditions")
+
+        if options['workers']:
+            with create_executor(options['workers']) as executor:
+                futures = {
+                    executor.submit(render_image_specs, image_id, specs): image_id
+                    for image_id, specs in missing.items()
+                }
+                for future in as_completed(futures):
+                    try:
+                        report(futures[future], future.result())
+                    except Exception as e:
+                        self.stderr.write(f"image {futures[future]} failed: {e}")
+        else:
+            for image_id, specs in missing.items():
+                report(image_id, render_image_specs(image_id, specs))
+        # Once for the whole run, in this process (a worker's cache is its own)
+        renditions_rendered(completed)
+
+        self.stdout.write(self.style.SUCCESS(f"Generated renditions for {completed} of {total} images"))
+
+    def prune(self, unused):
+        """Delete renditions no content needs (their files are removed too)."""
+        Rendition = get_image_model().get_rendition_model()
+        deleted = 0
+        for rendition in Rendition.objects.filter(pk__in=unused).iterator():
+            rendition.delete()
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} unused renditions"))
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from wagtail.models import Page
 from wagtail.fields import StreamField
@@ -7,7 +8,15 @@ from wagtail.images.api.fields import ImageRenditionField
 
 # Import blocks and image configuration
 from .blocks import BodyStreamBlock, HeroSectionBlock
+from core import sites
+from core.api import get_api_projection, is_api_field_requested, project
+from core.block_serializers import registry
+from core.links import iter_raw_page_ids
+from core.utils import get_base_url
+
 from .image_config import generate_responsive_image_data
+from .renditions import schedule_renditions
+from . import serializers  # noqa: F401 - registers the body block serializers
 
 
 class HomePage(Page):
@@ -32,6 +41,24 @@ class HomePage(Page):
         help_text="Main page content using flexible blocks"
     )
     
+    # Serialized API payload of the live revision, written after publishing
+    # (home/snapshots.py) so API reads skip StreamField serialization
+    api_snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        encoder=DjangoJSONEncoder,
+    )
+    
+    api_snapshot_revision = models.ForeignKey(
+        'wagtailcore.Revision',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    
     # Admin panel configuration
     content_panels = Page.content_panels + [
         FieldPanel("hero_section", heading="Hero Section"),
@@ -46,27 +73,188 @@ class HomePage(Page):
         APIField("body_content_data"),  # Custom property for proper serialization
     ]
     
+    # Accept sub fields, e.g. ?fields=body_content_data(blog_section,quality_homes)
+    # or ?fields=hero_section_data(title,cta) (see HeadlessPagesAPIViewSet)
+    api_projectable_fields = ['hero_section_data', 'body_content_data']
+    
+    exclude_fields_in_copy = ['api_snapshot', 'api_snapshot_revision']
+    
+    def serializable_data(self):
+        # The snapshot is derived from the live revision - keep it out of revisions
+        data = super().serializable_data()
+        data.pop('api_snapshot', None)
+        data.pop('api_snapshot_revision', None)
+        return data
+    
+    def serve_preview(self, request, mode_name):
+        # Previews show unpublished content, never the published snapshot
+        self._skip_api_snapshot = True
+        return super().serve_preview(request, mode_name)
+    
+    def get_api_snapshot(self):
+        """
+        Return the stored API payload if it was built from the live revision
+        for the site and host being served, otherwise None (not built yet,
+        stale, draft or preview instance, another brand's host).
+        """
+        if getattr(self, '_skip_api_snapshot', False) or not self.api_snapshot:
+            return None
+        if not self.live or self.api_snapshot_revision_id != self.live_revision_id:
+            return None
+        site, base_url = self._get_serialization_target()
+        site_id = site.pk if site else None
+        if self.api_snapshot.get('site_id') != site_id or self.api_snapshot.get('base_url') != base_url:
+            return None
+        return self.api_snapshot
+    
+    def save_api_snapshot(self):
+        """
+        Serialize the payload of this (live) page for its own site and
+        store it
+        """
+        site = self.get_site()
+        self._serialization_target = (site, site.root_url if site else get_base_url())
+        self._serialization_context = None
+        snapshot = {
+            'hero_section_data': self.build_hero_section_data(),
+            'body_content_data': self.build_body_content_data(),
+            # Tree paths of the linked pages, to find the snapshots a page
+            # change makes stale (home/snapshots.py)
+            'page_paths': self._get_linked_page_paths(),
+            # What links and image URLs were built for
+            'site_id': site.pk if site else None,
+            'base_url': self._serialization_target[1],
+        }
+        HomePage.objects.filter(pk=self.pk).update(
+            api_snapshot=snapshot,
+            api_snapshot_revision=self.live_revision_id,
+        )
+        self.api_snapshot = snapshot
+        self.api_snapshot_revision_id = self.live_revision_id
+    
+    def _get_linked_page_paths(self):
+        page_ids = set()
+        for stream_value in [self.hero_section, self.body]:
+            if stream_value:
+                page_ids.update(iter_raw_page_ids(stream_value.stream_block, stream_value.raw_data))
+        return sorted(Page.objects.filter(pk__in=page_ids).values_list('path', flat=True))
+    
+    def _get_hero_block(self, loader=None):
+        """
+        Return the value of the first (and only) hero block, built from
+        the raw JSON when a RawStreamLoader is given
+        """
+        if loader is None:
+            for block in self.hero_section:
+                if block.block_type == 'hero':
+                    return block.value
+            return None
+        
+        for raw in self.hero_section.raw_data:
+            if raw['type'] == 'hero':
+                return loader.to_python(self.hero_section.stream_block.child_blocks['hero'], raw['value'])
+        return None
+    
+    def _get_serialization_context(self):
+        """
+        Collect every image and linked page used by the hero and body
+        StreamFields and resolve their renditions in bulk (cached on the
+        instance).
+        
+        Body blocks with memoized output are skipped - their images and
+        links are not needed - and so are fields, hero keys and body block
+        types left out of the API request's projection.
+        """
+        context = getattr(self, '_serialization_context', None)
+        if context is not None:
+            return context
+        
+        site, base_url = self._get_serialization_target()
+        context = registry.make_context(base_url=base_url, site=site)
+        include_hero = self.hero_section and is_api_field_requested(self, 'hero_section_data')
+        # Hero and body chooser values are fetched together
+        if include_hero:
+            context.loader.add_stream(self.hero_section)
+            context.links.add_stream(self.hero_section)
+        if is_api_field_requested(self, 'body_content_data'):
+            registry.prepare(self.body, context, get_api_projection(self, 'body_content_data'))
+        if include_hero:
+            self._collect_hero_images(
+                context.resolver, self._get_hero_block(context.loader),
+                get_api_projection(self, 'hero_section_data'),
+            )
+        context.resolver.resolve()
+        # Format ladder renditions are never encoded during the request
+        schedule_renditions(context.resolver.get_missing())
+        self._serialization_context = context
+        return context
+    
+    def _get_serialization_target(self):
+        """
+        Return the (site, base URL) links and image URLs are built for:
+        the request being served, unless building a snapshot
+        """
+        target = getattr(self, '_serialization_target', None)
+        if target is not None:
+            return target
+        request = sites.get_current_request()
+        return sites.find_for_request(request), get_base_url(request)
+    
+    def _collect_hero_images(self, resolver, hero_block, fields=None):
+        if not hero_block:
+            return
+        if fields is None or 'slides' in fields:
+            for slide in hero_block.get('slides', []):
+                resolver.add(slide.get('image'), 'hero', 'slides.image')
+                # Main image doubles as the full image when none is set
+                resolver.add(slide.get('full_image') or slide.get('image'), 'hero', 'slides.full_image')
+        if fields is None or 'background' in fields:
+            resolver.add(hero_block.get('background_image'), 'hero', 'background_image')
+    
+    def collect_images(self, resolver):
+        """Register every image rendition the API payload needs with a resolver"""
+        self._collect_hero_images(resolver, self._get_hero_block() if self.hero_section else None)
+        for block in self.body or []:
+            for image_obj, field_path in registry.get(block.block_type, block.block).iter_images(block.value):
+                resolver.add(image_obj, block.block_type, field_path)
+    
+    def _responsive_image_data(self, image_obj, component_type, field_path='image'):
+        """Responsive image data using the page's batched renditions"""
+        return generate_responsive_image_data(
+            image_obj, component_type, field_path, resolver=self._get_serialization_context().resolver
+        )
+    
     @property
     def hero_section_data(self):
+        """
+        Hero section payload - from the publish-time snapshot when current
+        """
+        fields = get_api_projection(self, 'hero_section_data')
+        snapshot = self.get_api_snapshot()
+        if snapshot is not None:
+            return project(snapshot['hero_section_data'], fields)
+        return self.build_hero_section_data(fields)
+    
+    def build_hero_section_data(self, fields=None):
         """
         Transform hero section StreamField to frontend-compatible format
+        
+        Args:
+            fields (list): Only build these top-level keys (optional)
         """
         if not self.hero_section:
             return None
             
         # Get the first (and only) hero block
-        hero_block = None
-        for block in self.hero_section:
-            if block.block_type == 'hero':
-                hero_block = block.value
-                break
+        hero_block = self._get_hero_block(self._get_serialization_context().loader)
                 
         if not hero_block:
             return None
         
         # Transform slides data
         slides_data = []
-        for slide in hero_block.get('slides', []):
+        slides = hero_block.get('slides', []) if fields is None or 'slides' in fields else []
+        for slide in slides:
             slide_data = {
                 'id': len(slides_data) + 1,  # Simple incremental ID
                 'title': slide.get('title', ''),
@@ -87,16 +275,9 @@ class HomePage(Page):
                     'is_external': True
                 }
             elif not is_external and slide.get('page_link'):
-                # Get the page URL
-                page_url = '/'
-                try:
-                    if hasattr(slide['page_link'], 'url'):
-                        page_url = slide['page_link'].url
-                    elif hasattr(slide['page_link'], 'get_url'):
-                        page_url = slide['page_link'].get_url()
-                except:
-                    page_url = '/'
-                    
+                # Get the page URL (resolved with the other links of the page)
+                page_url = self._get_serialization_context().links.get_url(slide['page_link'], default='/')
+                
                 slide_data['button'] = {
                     'text': button_text,
                     'url': page_url,
@@ -119,18 +300,18 @@ class HomePage(Page):
             
             # Main slider image - using global config
             if slide.get('image'):
-                slide_data['image'] = generate_responsive_image_data(
+                slide_data['image'] = self._responsive_image_data(
                     slide['image'], 'hero', 'slides.image'
                 )
             
             # Full image for lightbox/fullscreen - using global config
             if slide.get('full_image'):
-                slide_data['full_image'] = generate_responsive_image_data(
+                slide_data['full_image'] = self._responsive_image_data(
                     slide['full_image'], 'hero', 'slides.full_image'
                 )
             elif slide.get('image'):
                 # Use main image as fallback
-                slide_data['full_image'] = generate_responsive_image_data(
+                slide_data['full_image'] = self._responsive_image_data(
                     slide['image'], 'hero', 'slides.full_image'
                 )
             
@@ -141,8 +322,8 @@ class HomePage(Page):
         if hero_block.get('background_video'):
             background_data['video_url'] = hero_block['background_video']
             
-        if hero_block.get('background_image'):
-            background_data['image'] = generate_responsive_image_data(
+        if hero_block.get('background_image') and (fields is None or 'background' in fields):
+            background_data['image'] = self._responsive_image_data(
                 hero_block['background_image'], 'hero', 'background_image'
             )
         
@@ -154,7 +335,7 @@ class HomePage(Page):
         except (ValueError, TypeError):
             autoplay_delay = 5000
         
-        return {
+        return project({
             'title': hero_block.get('hero_title', 'Transform your<br/>outdoor dreams'),
             'cta': {
                 'text': hero_block.get('cta_text', 'Get a Free Site Visit'),
@@ -166,447 +347,39 @@ class HomePage(Page):
                 'autoplay_enabled': hero_block.get('autoplay_enabled', True),
                 'autoplay_delay': autoplay_delay,
             }
-        }
+        }, fields)
 
     @property
     def body_content_data(self):
+        """
+        Body content payload - from the publish-time snapshot when current
+        """
+        block_types = get_api_projection(self, 'body_content_data')
+        snapshot = self.get_api_snapshot()
+        if snapshot is not None:
+            if block_types is None:
+                return snapshot['body_content_data']
+            return [block for block in snapshot['body_content_data'] if block['type'] in block_types]
+        return self.build_body_content_data(block_types)
+    
+    def build_body_content_data(self, block_types=None):
         """
         Transform body StreamField blocks to frontend-compatible format with proper image URLs
+        
+        Args:
+            block_types (list): Only include blocks of these types (optional)
         """
         if not self.body:
             return []
-            
-        body_data = []
-        
-        for block in self.body:
-            block_data = {
-                'type': block.block_type,
-                'id': f"{block.block_type}_{block.id}",
-                'value': {}
-            }
-            
-            if block.block_type == 'residential_projects':
-                block_data['value'] = self._serialize_projects_block(block.value)
-            elif block.block_type == 'commercial_projects':
-                block_data['value'] = self._serialize_projects_block(block.value)
-            elif block.block_type == 'horizontal_slider':
-                block_data['value'] = self._serialize_horizontal_slider_block(block.value)
-            elif block.block_type == 'multi_image_content':
-                block_data['value'] = self._serialize_multi_image_content_block(block.value)
-            elif block.block_type == 'quality_homes':
-                block_data['value'] = self._serialize_quality_homes_block(block.value)
-            elif block.block_type == 'dream_home_journey':
-                block_data['value'] = self._serialize_dream_home_journey_block(block.value)
-            elif block.block_type == 'blog_section':
-                block_data['value'] = self._serialize_blog_section_block(block.value)
-            else:
-                # Fallback for unknown block types
-                block_data['value'] = dict(block.value) if hasattr(block.value, 'items') else block.value
-                
-            body_data.append(block_data)
-            
-        return body_data
-    
-    def _serialize_projects_block(self, block_value):
-        """Serialize residential/commercial projects blocks with proper image URLs"""
-        projects_data = []
         
-        for project in block_value.get('projects', []):
-            project_data = {
-                'title': project.get('title', ''),
-                'description': project.get('description', ''),
-                'button_text': project.get('button_text', 'Learn More'),
-                'is_external_link': project.get('is_external_link', False),
-                'external_url': project.get('external_url', ''),
+        return [
+            {
+                'type': block_data['type'],
+                'id': f"{block_data['type']}_{block_data['id']}",
+                'value': block_data['value'],
             }
-            
-            # Handle page link
-            if project.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(project['page_link'], 'url'):
-                        page_url = project['page_link'].url
-                    elif hasattr(project['page_link'], 'get_url'):
-                        page_url = project['page_link'].get_url()
-                    project_data['page_link'] = {
-                        'id': project['page_link'].id,
-                        'title': project['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    project_data['page_link'] = None
-            else:
-                project_data['page_link'] = None
-            
-            # Handle project image with global config - detect block type dynamically  
-            if project.get('image'):
-                # Use the correct block type for this serialization call
-                block_type = 'commercial_projects' if 'commercial' in str(type(self)).lower() else 'residential_projects'
-                project_data['image'] = generate_responsive_image_data(
-                    project['image'], 'residential_projects', 'projects.image'  # Both use same config anyway
-                )
-            else:
-                project_data['image'] = None
-                
-            projects_data.append(project_data)
-        
-        return {
-            'title': block_value.get('title', ''),
-            'subtitle': block_value.get('subtitle', ''),
-            'projects': projects_data
-        }
-    
-    
-    def _serialize_horizontal_slider_block(self, block_value):
-        """Serialize horizontal slider block"""
-        slides_data = []
-        
-        for slide in block_value.get('slides', []):
-            slide_data = {
-                'order': slide.get('order', '1'),
-                'title': slide.get('title', ''),
-                'description': slide.get('description', ''),
-                'button_text': slide.get('button_text', 'Learn More'),
-                'is_external_link': slide.get('is_external_link', False),
-                'external_url': slide.get('external_url', ''),
-            }
-            
-            # Handle page link
-            if slide.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(slide['page_link'], 'url'):
-                        page_url = slide['page_link'].url
-                    elif hasattr(slide['page_link'], 'get_url'):
-                        page_url = slide['page_link'].get_url()
-                    slide_data['page_link'] = {
-                        'id': slide['page_link'].id,
-                        'title': slide['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    slide_data['page_link'] = None
-            else:
-                slide_data['page_link'] = None
-            
-            # Handle slide image with global config
-            if slide.get('image'):
-                slide_data['image'] = generate_responsive_image_data(
-                    slide['image'], 'horizontal_slider', 'slides.image'
-                )
-            else:
-                slide_data['image'] = None
-                
-            slides_data.append(slide_data)
-        
-        return {
-            'title': block_value.get('title', ''),
-            'description': block_value.get('description', ''),
-            'slides': slides_data,
-            'autoplay_enabled': block_value.get('autoplay_enabled', True),
-            'autoplay_delay': block_value.get('autoplay_delay', '3000'),
-        }
-    
-    def _serialize_multi_image_content_block(self, block_value):
-        """Serialize multi-image content block for StudioSection.tsx"""
-        
-        # Serialize images with global configuration
-        images_data = []
-        for image_block in block_value.get('images', []):
-            if image_block.get('image'):
-                image_data = generate_responsive_image_data(
-                    image_block['image'], 'multi_image_content', 'images.image'
-                )
-                # Override alt text if provided in block
-                if image_block.get('alt_text'):
-                    image_data['alt'] = image_block['alt_text']
-                images_data.append(image_data)
-        
-        # Serialize CTA button
-        cta_data = {}
-        cta_block = block_value.get('cta', {})
-        if cta_block:
-            cta_data = {
-                'button_text': cta_block.get('button_text', 'Get Started'),
-                'is_external_link': cta_block.get('is_external_link', False),
-                'external_url': cta_block.get('external_url', ''),
-            }
-            
-            # Handle internal page link
-            if cta_block.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(cta_block['page_link'], 'url'):
-                        page_url = cta_block['page_link'].url
-                    elif hasattr(cta_block['page_link'], 'get_url'):
-                        page_url = cta_block['page_link'].get_url()
-                    cta_data['page_link'] = {
-                        'id': cta_block['page_link'].id,
-                        'title': cta_block['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    cta_data['page_link'] = None
-            else:
-                cta_data['page_link'] = None
-        
-        # Convert rich text to formatted text array (preserve paragraphs and line breaks)
-        description_text = []
-        if block_value.get('description'):
-            import re
-            rich_text = str(block_value['description'])
-            
-            # Split by paragraph tags and preserve line breaks
-            # Replace <br> tags with line breaks
-            rich_text = re.sub(r'<br\s*/?>', '\n', rich_text)
-            
-            # Split by paragraph tags
-            paragraphs = re.split(r'</?p[^>]*>', rich_text)
-            
-            # Clean up each paragraph and filter out empty ones
-            for paragraph in paragraphs:
-                # Remove remaining HTML tags but preserve line breaks
-                clean_paragraph = re.sub(r'<[^>]+>', '', paragraph).strip()
-                if clean_paragraph:
-                    description_text.append(clean_paragraph)
-        
-        return {
-            'title': block_value.get('section_title', 'Bring your dream home to life'),
-            'subtitle': block_value.get('section_subtitle', ''),
-            'description': description_text,
-            'images': images_data,
-            'cta': cta_data
-        }
-    
-    def _serialize_quality_homes_block(self, block_value):
-        """Serialize quality homes block with proper image URLs and CTA"""
-        features_data = []
-        
-        for feature in block_value.get('features', []):
-            feature_data = {
-                'icon': feature.get('icon', '✓'),
-                'title': feature.get('title', ''),
-                'description': feature.get('description', ''),
-            }
-            
-            # Handle feature image with global config
-            if feature.get('image'):
-                feature_data['image'] = generate_responsive_image_data(
-                    feature['image'], 'quality_homes', 'features.image'
-                )
-            else:
-                feature_data['image'] = None
-                
-            features_data.append(feature_data)
-        
-        # Handle CTA data
-        cta_data = None
-        if block_value.get('cta'):
-            cta = block_value['cta']
-            cta_data = {
-                'button_text': cta.get('button_text', 'Learn More'),
-                'is_external_link': cta.get('is_external_link', False),
-                'external_url': cta.get('external_url', ''),
-            }
-            
-            # Handle page link
-            if cta.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(cta['page_link'], 'url'):
-                        page_url = cta['page_link'].url
-                    elif hasattr(cta['page_link'], 'get_url'):
-                        page_url = cta['page_link'].get_url()
-                    cta_data['page_link'] = {
-                        'id': cta['page_link'].id,
-                        'title': cta['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    cta_data['page_link'] = None
-            else:
-                cta_data['page_link'] = None
-        
-        return {
-            'main_title': block_value.get('main_title', 'Building quality homes for over 40 years'),
-            'features': features_data,
-            'cta': cta_data
-        }
-    
-    def _serialize_dream_home_journey_block(self, block_value):
-        """Serialize dream home journey block with background image and dual CTAs"""
-        
-        # Handle primary CTA data
-        primary_cta_data = None
-        if block_value.get('primary_cta'):
-            primary_cta = block_value['primary_cta']
-            primary_cta_data = {
-                'button_text': primary_cta.get('button_text', 'Learn More'),
-                'is_external_link': primary_cta.get('is_external_link', False),
-                'external_url': primary_cta.get('external_url', ''),
-            }
-            
-            # Handle page link
-            if primary_cta.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(primary_cta['page_link'], 'url'):
-                        page_url = primary_cta['page_link'].url
-                    elif hasattr(primary_cta['page_link'], 'get_url'):
-                        page_url = primary_cta['page_link'].get_url()
-                    primary_cta_data['page_link'] = {
-                        'id': primary_cta['page_link'].id,
-                        'title': primary_cta['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    primary_cta_data['page_link'] = None
-            else:
-                primary_cta_data['page_link'] = None
-        
-        # Handle secondary CTA data
-        secondary_cta_data = None
-        if block_value.get('secondary_cta'):
-            secondary_cta = block_value['secondary_cta']
-            secondary_cta_data = {
-                'button_text': secondary_cta.get('button_text', 'Learn More'),
-                'is_external_link': secondary_cta.get('is_external_link', False),
-                'external_url': secondary_cta.get('external_url', ''),
-            }
-            
-            # Handle page link
-            if secondary_cta.get('page_link'):
-                try:
-                    page_url = '/'
-                    if hasattr(secondary_cta['page_link'], 'url'):
-                        page_url = secondary_cta['page_link'].url
-                    elif hasattr(secondary_cta['page_link'], 'get_url'):
-                        page_url = secondary_cta['page_link'].get_url()
-                    secondary_cta_data['page_link'] = {
-                        'id': secondary_cta['page_link'].id,
-                        'title': secondary_cta['page_link'].title,
-                        'url': page_url
-                    }
-                except:
-                    secondary_cta_data['page_link'] = None
-            else:
-                secondary_cta_data['page_link'] = None
-        
-        # Handle background image with global config
-        background_image_data = None
-        if block_value.get('background_image'):
-            background_image_data = generate_responsive_image_data(
-                block_value['background_image'], 'dream_home_journey', 'background_image'
-            )
-        
-        return {
-            'title': block_value.get('title', 'Begin your dream home journey with Shambala Homes'),
-            'description': block_value.get('description', 'Discover modern house designs and packages to turn your vision into reality — from open living spaces to stunning alfresco homes.'),
-            'primary_cta': primary_cta_data,
-            'secondary_cta': secondary_cta_data,
-            'background_image': background_image_data
-        }
-    
-    def _serialize_blog_post(self, post_data, is_featured=False):
-        """Helper method to serialize a single blog post"""
-        # Handle link configuration
-        post_link = '#'
-        if post_data.get('is_external_link') and post_data.get('external_url'):
-            post_link = post_data.get('external_url')
-        elif not post_data.get('is_external_link') and post_data.get('page_link'):
-            try:
-                if hasattr(post_data['page_link'], 'url'):
-                    post_link = post_data['page_link'].url
-                elif hasattr(post_data['page_link'], 'get_url'):
-                    post_link = post_data['page_link'].get_url()
-            except:
-                post_link = '#'
-        
-        # Handle main image
-        image_data = None
-        if post_data.get('image'):
-            image_config = 'blog_featured' if is_featured else 'blog_post'
-            image_data = generate_responsive_image_data(
-                post_data['image'], 'blog_section', f'{image_config}.image'
-            )
-        
-        blog_post = {
-            'id': hash(str(post_data.get('title', '') + str(post_data.get('date', '')))),  # Generate unique ID
-            'title': post_data.get('title', ''),
-            'date': post_data.get('date', ''),
-            'category': post_data.get('category', 'Design Tips'),
-            'excerpt': post_data.get('excerpt', ''),
-            'imageSrc': image_data['src'] if image_data else None,
-            'imageAlt': image_data['alt'] if image_data else '',
-            'link': post_link,
-            'featured': is_featured
-        }
-        
-        # Add additional content for featured posts
-        if is_featured:
-            blog_post['additional_text'] = post_data.get('additional_text', '')
-            
-            # Handle additional image
-            if post_data.get('additional_image'):
-                additional_image_data = generate_responsive_image_data(
-                    post_data['additional_image'], 'blog_section', 'blog_additional.image'
-                )
-                blog_post['additional_image'] = {
-                    'src': additional_image_data['src'],
-                    'alt': additional_image_data['alt']
-                }
-            else:
-                blog_post['additional_image'] = None
-        
-        return blog_post
-    
-    def _serialize_blog_section_block(self, block_value):
-        """Serialize blog section block with featured post and sidebar posts"""
-        
-        # Serialize featured post (left side)
-        featured_post = None
-        if block_value.get('featured_post'):
-            featured_post = self._serialize_blog_post(block_value['featured_post'], is_featured=True)
-        
-        # Serialize sidebar posts (right side)
-        sidebar_posts = []
-        for post in block_value.get('sidebar_posts', []):
-            sidebar_posts.append(self._serialize_blog_post(post, is_featured=False))
-        
-        # Combine all posts for the component
-        all_posts = []
-        if featured_post:
-            all_posts.append(featured_post)
-        all_posts.extend(sidebar_posts)
-        
-        # Handle section CTA
-        cta_data = None
-        if block_value.get('cta'):
-            cta = block_value['cta']
-            cta_text = cta.get('button_text', 'View all blog posts')
-            cta_link = '#'
-            
-            if cta.get('is_external_link') and cta.get('external_url'):
-                cta_link = cta.get('external_url')
-            elif not cta.get('is_external_link') and cta.get('page_link'):
-                try:
-                    if hasattr(cta['page_link'], 'url'):
-                        cta_link = cta['page_link'].url
-                    elif hasattr(cta['page_link'], 'get_url'):
-                        cta_link = cta['page_link'].get_url()
-                except:
-                    cta_link = '#'
-            
-            cta_data = {
-                'text': cta_text,
-                'link': cta_link
-            }
-        
-        return {
-            'section_title': block_value.get('section_title', 'Design and building tips from our blog'),
-            'posts': all_posts,
-            'cta': cta_data
-        }
+            for block_data in registry.serialize_stream(self.body, self._get_serialization_context(), block_types)
+        ]
     
     class Meta:
         verbose_name = "Home Page"
\ No newline at end of file
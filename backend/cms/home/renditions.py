@@ -0,0 +1,119 @@
+"""
+Rendition Pre-generation
+
+Renders the renditions that IMAGE_CONFIGS / COMPONENT_IMAGE_MAPPING say a
+page needs ahead of time, in a pool of worker processes, so API requests
+find them ready instead of running Pillow work themselves.
+
+Jobs are queued when a page that uses an image is published or when an
+image used by a page is saved again (new file or focal point).
+"""
+
+import hashlib
+
+from django.conf import settings
+
+from core import rendition_cache, signed_renditions
+from core.block_serializers import bump_generation
+from core.rendition_budget import record_access, schedule_budget_check
+from core.workers import run_on_commit
+
+from .image_config import RenditionResolver
+
+
+# Seconds a queued rendition job keeps identical jobs from being queued
+JOB_MARKER_TIMEOUT = 5 * 60
+
+
+def render_image_specs(image_id, specs):
+    """
+    Create any missing renditions of one image (runs in a worker process).
+
+    Args:
+        image_id (int): Wagtail image id
+        specs (list): Filter specs to render
+
+    Returns:
+        int: Number of specs processed
+    """
+    from wagtail.images import get_image_model
+
+    Image = get_image_model()
+    try:
+        image = Image.objects.get(pk=image_id)
+    except Image.DoesNotExist:
+        return 0
+
+    # get_renditions() reuses existing renditions and creates the rest in one go
+    renditions = image.get_renditions(*specs)
+    # Fresh renditions count as used, so eviction does not pick them first
+    record_access([
+        (image_id, spec, rendition.focal_point_key) for spec, rendition in renditions.items()
+    ])
+    return len(specs)
+
+
+def renditions_rendered(count):
+    """
+    Drop memoized block output after a rendition job, as it left out the
+    format ladder renditions that were missing (runs in the process that
+    queued the job - a worker's cache is its own).
+
+    Args:
+        count (int): Return value of render_image_specs()
+    """
+    if count:
+        bump_generation()
+
+
+def schedule_renditions(specs_by_image):
+    """
+    Queue rendition jobs once the current transaction has committed.
+
+    With RENDITION_WORKERS set to 0 the jobs run inline instead, which is
+    what tests and management commands want. In signed URL mode nothing is
+    queued - renditions are rendered when their URL is first fetched.
+
+    Jobs for the same specs of an image are queued once per
+    JOB_MARKER_TIMEOUT, however many requests miss them meanwhile.
+
+    Args:
+        specs_by_image (dict): Image id -> list of filter specs
+    """
+    if not specs_by_image or not getattr(settings, 'RENDITION_PREGENERATION', True):
+        return
+    if signed_renditions.is_enabled():
+        return
+
+    cache = rendition_cache.get_cache()
+    jobs = []
+    for image_id, specs in specs_by_image.items():
+        specs = sorted(specs)
+        marker = f"rendition-job:{image_id}:{hashlib.sha1('|'.join(specs).encode()).hexdigest()}"
+        if cache.add(marker, True, timeout=JOB_MARKER_TIMEOUT):
+            jobs.append((image_id, specs))
+    if not jobs:
+        return
+
+    run_on_commit(render_image_specs, jobs, on_done=renditions_rendered)
+    schedule_budget_check()
+
+
+def get_page_image_specs(page, image_id=None):
+    """
+    Work out the renditions a page's API payload needs.
+
+    Args:
+        page: Page object providing ``collect_images(resolver)``
+        image_id (int): Only return specs for this image (optional)
+
+    Returns:
+        dict: Image id -> list of filter specs
+    """
+    resolver = RenditionResolver()
+    page.collect_images(resolver)
+    specs_by_image = resolver.get_specs()
+
+    if image_id is not None:
+        return {image_id: specs_by_image[image_id]} if image_id in specs_by_image else {}
+    return specs_by_image
@@ -0,0 +1,240 @@
+"""
+HomePage Body Block Serializers
+
+Frontend-compatible API output of the HomePage body blocks, registered
+with the block serializer registry. Image fields are declared up front so
+the renditions of every block on the page resolve in one batch.
+"""
+
+import re
+
+from core.block_serializers import BlockSerializer, registry
+
+from .blocks import (
+    BlogSectionBlock, CommercialProjectsBlock, DreamHomeJourneyBlock, HorizontalSliderBlock,
+    MultiImageContentBlock, QualityHomesBlock, ResidentialProjectsBlock,
+)
+from .image_config import RenditionResolver, generate_responsive_image_data
+
+
+registry.set_image_backend(RenditionResolver, generate_responsive_image_data)
+
+
+@registry.register(ResidentialProjectsBlock, CommercialProjectsBlock)
+class ProjectsSerializer(BlockSerializer):
+    """Serialize residential/commercial projects blocks with proper image URLs"""
+
+    image_fields = [('projects.image', 'projects.image')]
+
+    def serialize(self, value):
+        projects_data = []
+
+        for project in value.get('projects', []):
+            projects_data.append({
+                'title': project.get('title', ''),
+                'description': project.get('description', ''),
+                'button_text': project.get('button_text', 'Learn More'),
+                'is_external_link': project.get('is_external_link', False),
+                'external_url': project.get('external_url', ''),
+                'page_link': self.page_link(project.get('page_link')),
+                # Both project blocks map to the same image config
+                'image': self.image(project.get('image'), 'projects.image'),
+            })
+
+        return {
+            'title': value.get('title', ''),
+            'subtitle': value.get('subtitle', ''),
+            'projects': projects_data
+        }
+
+
+@registry.register(HorizontalSliderBlock)
+class HorizontalSliderSerializer(BlockSerializer):
+    """Serialize horizontal slider block"""
+
+    image_fields = [('slides.image', 'slides.image')]
+
+    def serialize(self, value):
+        slides_data = []
+
+        for slide in value.get('slides', []):
+            slides_data.append({
+                'order': slide.get('order', '1'),
+                'title': slide.get('title', ''),
+                'description': slide.get('description', ''),
+                'button_text': slide.get('button_text', 'Learn More'),
+                'is_external_link': slide.get('is_external_link', False),
+                'external_url': slide.get('external_url', ''),
+                'page_link': self.page_link(slide.get('page_link')),
+                'image': self.image(slide.get('image'), 'slides.image'),
+            })
+
+        return {
+            'title': value.get('title', ''),
+            'description': value.get('description', ''),
+            'slides': slides_data,
+            'autoplay_enabled': value.get('autoplay_enabled', True),
+            'autoplay_delay': value.get('autoplay_delay', '3000'),
+        }
+
+
+@registry.register(MultiImageContentBlock)
+class MultiImageContentSerializer(BlockSerializer):
+    """Serialize multi-image content block for StudioSection.tsx"""
+
+    image_fields = [('images.image', 'images.image')]
+
+    def serialize(self, value):
+        # Serialize images with global configuration
+        images_data = []
+        for image_block in value.get('images', []):
+            if image_block.get('image'):
+                image_data = self.image(image_block['image'], 'images.image')
+                # Override alt text if provided in block
+                if image_block.get('alt_text'):
+                    image_data['alt'] = image_block['alt_text']
+                images_data.append(image_data)
+
+        cta_data = {}
+        if value.get('cta', {}):
+            cta_data = self.cta(value['cta'], default_text='Get Started')
+
+        return {
+            'title': value.get('section_title', 'Bring your dream home to life'),
+            'subtitle': value.get('section_subtitle', ''),
+            'description': self.split_paragraphs(value.get('description')),
+            'images': images_data,
+            'cta': cta_data
+        }
+
+    def split_paragraphs(self, rich_text):
+        """Convert rich text to a list of plain text paragraphs (line breaks kept)"""
+        if not rich_text:
+            return []
+
+        # Replace <br> tags with line breaks, then split by paragraph tags
+        rich_text = re.sub(r'<br\s*/?>', '\n', str(rich_text))
+        paragraphs = re.split(r'</?p[^>]*>', rich_text)
+
+        # Remove remaining HTML tags and filter out empty paragraphs
+        description_text = []
+        for paragraph in paragraphs:
+            clean_paragraph = re.sub(r'<[^>]+>', '', paragraph).strip()
+            if clean_paragraph:
+                description_text.append(clean_paragraph)
+        return description_text
+
+
+@registry.register(QualityHomesBlock)
+class QualityHomesSerializer(BlockSerializer):
+    """Serialize quality homes block with proper image URLs and CTA"""
+
+    image_fields = [('features.image', 'features.image')]
+
+    def serialize(self, value):
+        features_data = []
+
+        for feature in value.get('features', []):
+            features_data.append({
+                'icon': feature.get('icon', '✓'),
+                'title': feature.get('title', ''),
+                'description': feature.get('description', ''),
+                'image': self.image(feature.get('image'), 'features.image'),
+            })
+
+        return {
+            'main_title': value.get('main_title', 'Building quality homes for over 40 years'),
+            'features': features_data,
+            'cta': self.cta(value['cta']) if value.get('cta') else None
+        }
+
+
+@registry.register(DreamHomeJourneyBlock)
+class DreamHomeJourneySerializer(BlockSerializer):
+    """Serialize dream home journey block with background image and dual CTAs"""
+
+    image_fields = [('background_image', 'background_image')]
+
+    def serialize(self, value):
+        return {
+            'title': value.get('title', 'Begin your dream home journey with Shambala Homes'),
+            'description': value.get('description', 'Discover modern house designs and packages to turn your vision into reality — from open living spaces to stunning alfresco homes.'),
+            'primary_cta': self.cta(value['primary_cta']) if value.get('primary_cta') else None,
+            'secondary_cta': self.cta(value['secondary_cta']) if value.get('secondary_cta') else None,
+            'background_image': self.image(value.get('background_image'), 'background_image')
+        }
+
+
+@registry.register(BlogSectionBlock)
+class BlogSectionSerializer(BlockSerializer):
+    """Serialize blog section block with featured post and sidebar posts"""
+
+    image_fields = [
+        ('featured_post.image', 'blog_featured.image'),
+        ('featured_post.additional_image', 'blog_additional.image'),
+        ('sidebar_posts.image', 'blog_post.image'),
+    ]
+
+    def serialize(self, value):
+        # Featured post (left side) first, then the sidebar posts (right side)
+        all_posts = []
+        if value.get('featured_post'):
+            all_posts.append(self.serialize_post(value['featured_post'], is_featured=True))
+        for post in value.get('sidebar_posts', []):
+            all_posts.append(self.serialize_post(post, is_featured=False))
+
+        # Handle section CTA
+        cta_data = None
+        if value.get('cta'):
+            cta = value['cta']
+            cta_data = {
+                'text': cta.get('button_text', 'View all blog posts'),
+                'link': self.link(cta),
+            }
+
+        return {
+            'section_title': value.get('section_title', 'Design and building tips from our blog'),
+            'posts': all_posts,
+            'cta': cta_data
+        }
+
+    def link(self, link_data):
+        """Resolve the external URL or page link of a post or CTA"""
+        if link_data.get('is_external_link') and link_data.get('external_url'):
+            return link_data.get('external_url')
+        if not link_data.get('is_external_link') and link_data.get('page_link'):
+            return self.page_url(link_data['page_link'], default='#')
+        return '#'
+
+    def serialize_post(self, post_data, is_featured=False):
+        """Serialize a single blog post"""
+        image_data = None
+        if post_data.get('image'):
+            image_config = 'blog_featured' if is_featured else 'blog_post'
+            image_data = self.image(post_data['image'], f'{image_config}.image')
+
+        blog_post = {
+            'id': hash(str(post_data.get('title', '') + str(post_data.get('date', '')))),  # Generate unique ID
+            'title': post_data.get('title', ''),
+            'date': post_data.get('date', ''),
+            'category': post_data.get('category', 'Design Tips'),
+            'excerpt': post_data.get('excerpt', ''),
+            'imageSrc': image_data['src'] if image_data else None,
+            'imageAlt': image_data['alt'] if image_data else '',
+            'link': self.link(post_data),
+            'featured': is_featured
+        }
+
+        # Add additional content for featured posts
+        if is_featured:
+            blog_post['additional_text'] = post_data.get('additional_text', '')
+
+            blog_post['additional_image'] = None
+            if post_data.get('additional_image'):
+                additional_image_data = self.image(post_data['additional_image'], 'blog_additional.image')
+                blog_post['additional_image'] = {
+                    'src': additional_image_data['src'],
+                    'alt': additional_image_data['alt']
+                }
+
+        return blog_post
@@ -0,0 +1,73 @@
+"""
+Signal handlers for the home app
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from core.models import ImagePlaceholder
+from core.rendition_budget import renditions_evicted
+
+from .models import HomePage
+from .snapshots import get_live_pages_using_images, refresh_snapshots_linking_to, schedule_snapshots
+
+
+@receiver(page_published, sender=HomePage)
+def build_published_page_snapshot(sender, instance, **kwargs):
+    """
+    Render everything the published homepage needs and store its API
+    payload, outside the request cycle
+    """
+    schedule_snapshots([instance.pk])
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def refresh_linking_snapshots(sender, instance, **kwargs):
+    """
+    Rebuild the snapshots linking to a page (or a descendant, whose URL
+    includes its slug) when it is published - possibly renamed -
+    unpublished or deleted. A published homepage rebuilds its own.
+    """
+    page_path, page_id = instance.path, instance.pk
+    transaction.on_commit(lambda: refresh_snapshots_linking_to(page_path, exclude=page_id))
+
+
+@receiver(post_page_move)
+def refresh_snapshots_after_move(sender, **kwargs):
+    """Moves change the URL of a whole subtree - rebuild every snapshot with links"""
+    transaction.on_commit(refresh_snapshots_linking_to)
+
+
+@receiver(post_save, sender=get_image_model())
+def refresh_image_snapshots(sender, instance, created, **kwargs):
+    """
+    Re-render an image and rebuild the live pages using it (new file or
+    focal point). A freshly uploaded image is picked up once a page using
+    it is published.
+    """
+    if created:
+        return
+    schedule_snapshots(get_live_pages_using_images([instance.pk]))
+
+
+@receiver(post_save, sender=ImagePlaceholder)
+def refresh_placeholder_snapshots(sender, instance, **kwargs):
+    """Rebuild the live pages using an image once its placeholder is ready"""
+    schedule_snapshots(get_live_pages_using_images([instance.image_id]))
+
+
+@receiver(renditions_evicted)
+def refresh_evicted_snapshots(sender, image_ids, **kwargs):
+    """
+    Rebuild snapshots pointing at evicted renditions. Until the rebuild
+    finishes the pages are serialized live, which recreates the renditions.
+    """
+    page_ids = get_live_pages_using_images(image_ids)
+    HomePage.objects.filter(pk__in=page_ids).update(api_snapshot=None)
+    schedule_snapshots(page_ids)
@@ -0,0 +1,111 @@
+"""
+HomePage API Snapshots
+
+Serializes the full frontend payload of a published HomePage once, in the
+worker pool, and stores it on the page. The pages API then returns the
+stored payload instead of walking the StreamFields on every read; drafts
+and previews are still serialized live.
+
+Links and image URLs are built for the page's own site and its root URL,
+so the snapshot is only served for requests to that site and host;
+requests through other hosts are serialized live.
+
+Renditions are rendered before the payload is built, so the snapshot
+carries the complete format ladder. Snapshots are rebuilt when the page is
+published again, when an image it uses changes or loses renditions, and
+when a page it links to (or an ancestor, whose slug is in the URL) is
+published, unpublished, deleted or moved.
+"""
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from wagtail.models import ReferenceIndex
+
+from core import signed_renditions
+from core.workers import run_on_commit
+
+from .renditions import get_page_image_specs, render_image_specs, renditions_rendered
+
+
+def build_page_snapshot(page_id):
+    """
+    Render the renditions of a live homepage and store its API payload
+    (runs in a worker process).
+    
+    Args:
+        page_id (int): HomePage id
+        
+    Returns:
+        bool: True if a snapshot was stored
+    """
+    from .models import HomePage
+    
+    page = HomePage.objects.live().filter(pk=page_id).first()
+    if page is None:
+        return False
+    
+    if getattr(settings, 'RENDITION_PREGENERATION', True) and not signed_renditions.is_enabled():
+        for image_id, specs in get_page_image_specs(page).items():
+            render_image_specs(image_id, specs)
+    
+    page.save_api_snapshot()
+    return True
+
+
+def schedule_snapshots(page_ids):
+    """
+    Queue snapshot jobs once the current transaction has committed.
+    
+    Args:
+        page_ids (list): HomePage ids
+    """
+    run_on_commit(build_page_snapshot, [(page_id,) for page_id in page_ids], on_done=renditions_rendered)
+
+
+def get_live_pages_using_images(image_ids):
+    """
+    Find the live homepages whose content uses any of the given images.
+    
+    Args:
+        image_ids (iterable): Wagtail image ids
+        
+    Returns:
+        list: HomePage ids
+    """
+    from wagtail.images import get_image_model
+    from .models import HomePage
+    
+    page_ids = ReferenceIndex.get_references_to_in_bulk(
+        get_image_model().objects.filter(pk__in=list(image_ids)),
+    ).filter(
+        content_type=ContentType.objects.get_for_model(HomePage),
+    ).values_list('object_id', flat=True)
+    
+    return list(
+        HomePage.objects.live().filter(pk__in={int(pk) for pk in page_ids}).values_list('pk', flat=True)
+    )
+
+
+def refresh_snapshots_linking_to(page_path=None, exclude=None):
+    """
+    Drop and rebuild the snapshots linking to a page or one of its
+    descendants - all snapshots with links when no path is given.
+    
+    Args:
+        page_path (str): Tree path of the changed page (optional)
+        exclude (int): HomePage id to leave alone (optional)
+    """
+    from .models import HomePage
+    
+    page_ids = []
+    snapshots = HomePage.objects.live().filter(api_snapshot__isnull=False).exclude(pk=exclude)
+    for pk, page_paths in snapshots.values_list('pk', 'api_snapshot__page_paths'):
+        if page_paths is None:
+            # Stored before linked pages were recorded
+            page_ids.append(pk)
+        elif page_paths and (page_path is None or any(path.startswith(page_path) for path in page_paths)):
+            page_ids.append(pk)
+    
+    if page_ids:
+        HomePage.objects.filter(pk__in=page_ids).update(api_snapshot=None)
+        schedule_snapshots(page_ids)
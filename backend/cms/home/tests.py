@@ -1,7 +1,18 @@
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
 from django.urls import reverse
+from core import sites
 from home.models import HomePage
+from home.renditions import schedule_renditions
 
-from wagtail.models import Page
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, Site
 from wagtail.test.utils import WagtailPageTestCase
 
 
@@ -41,3 +52,242 @@ class HomeTests(WagtailPageTestCase):
     def test_homepage_template_used(self):
         response = self.client.get(reverse("home"))
         self.assertTemplateUsed(response, "home/home_page.html")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class HomePageImageSerializationTests(WagtailPageTestCase):
+    """
+    Tests for batched rendition resolution in the homepage API payload.
+    """
+
+    def setUp(self):
+        # Renditions are cached by image id, which the test database reuses
+        cache.clear()
+        self.images = [
+            Image.objects.create(title=f"Feature {i}", file=get_test_image_file(f"feature{i}.png"))
+            for i in range(4)
+        ]
+        self.homepage = HomePage(title="Home", body=[
+            {
+                'type': 'quality_homes',
+                'value': {
+                    'main_title': 'Quality',
+                    'features': [
+                        {'icon': '✓', 'title': f'Feature {i}', 'description': 'Text', 'image': image.pk}
+                        for i, image in enumerate(self.images)
+                    ],
+                },
+            },
+        ])
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+
+    def get_body_content_data(self):
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        return page.body_content_data
+
+    def test_feature_images_are_serialized(self):
+        features = self.get_body_content_data()[0]['value']['features']
+        self.assertEqual(len(features), 4)
+        for feature in features:
+            self.assertEqual(feature['image']['src'], feature['image']['desktop'])
+            self.assertTrue(feature['image']['mobile'].endswith('.webp'))
+
+    def test_rendition_queries_do_not_grow_with_images(self):
+        # Cold run creates every rendition
+        self.get_body_content_data()
+        cache.clear()
+
+        # Warm run: page + image load, one rendition and one placeholder query, whatever the image count
+        with self.assertNumQueries(4):
+            self.get_body_content_data()
+
+    def test_raw_blocks_fetch_each_model_once(self):
+        link = self.homepage.add_child(instance=HomePage(title="Linked", slug="linked"))
+        self.homepage.body.append(('horizontal_slider', {
+            'title': 'Services',
+            'slides': [{'title': 'Slide', 'image': self.images[0], 'page_link': link}],
+        }))
+        self.homepage.body.append(('dream_home_journey', {'background_image': self.images[1]}))
+        self.homepage.save()
+        self.get_body_content_data()
+        cache.clear()
+
+        # Page, images, linked pages, site root paths, renditions and placeholders -
+        # not one query per block type
+        with self.assertNumQueries(6):
+            body_data = self.get_body_content_data()
+        self.assertEqual(body_data[1]['value']['slides'][0]['page_link']['url'], link.url)
+
+    def test_api_projection_skips_unrequested_blocks(self):
+        background = Image.objects.create(title="Background", file=get_test_image_file("background.png"))
+        self.homepage.body.append(('dream_home_journey', {'background_image': background}))
+        self.homepage.save_revision().publish()
+        Site.objects.update(root_page=self.homepage)
+        cache.clear()
+
+        response = self.client.get(
+            f'/api/v2/pages/{self.homepage.pk}/?fields=_,body_content_data(dream_home_journey)'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertNotIn('hero_section_data', data)
+        self.assertEqual([block['type'] for block in data['body_content_data']], ['dream_home_journey'])
+        # Renditions are only resolved for the requested block
+        self.assertTrue(background.renditions.exists())
+        for image in self.images:
+            self.assertFalse(image.renditions.exists())
+
+        response = self.client.get(f'/api/v2/pages/{self.homepage.pk}/?fields=body_content_data(-quality_homes)')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_conditional_get_skips_serialization(self):
+        self.homepage.save_revision().publish()
+        Site.objects.update(root_page=self.homepage)
+        url = f'/api/v2/pages/{self.homepage.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response.headers)
+
+        # Page stamp only - nothing is loaded or serialized
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # Image changes embedded in the payload change the ETag
+        etag = response.headers['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.images[0].title = 'Renamed'
+            self.images[0].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_cached_rendition_urls_skip_database(self):
+        call_command('warm_renditions', '--workers=0', stdout=StringIO())
+        expected = self.get_body_content_data()
+
+        # Page load only - block output is memoized, so no images are loaded
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_body_content_data(), expected)
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_memoized_blocks_follow_image_changes(self):
+        self.get_body_content_data()
+
+        # Unchanged blocks are served from the memo, an image change invalidates it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.images[0].title = 'Renamed'
+            self.images[0].save()
+        features = self.get_body_content_data()[0]['value']['features']
+        self.assertEqual(features[0]['image']['alt'], 'Renamed')
+
+    def test_format_ladder_sources(self):
+        # Only the breakpoint images exist before pre-generation
+        image_data = self.get_body_content_data()[0]['value']['features'][0]['image']
+        self.assertEqual([source['type'] for source in image_data['sources']], ['image/webp'] * 3)
+
+        call_command('warm_renditions', '--workers=0', stdout=StringIO())
+        image_data = self.get_body_content_data()[0]['value']['features'][0]['image']
+        desktop_sources = [source for source in image_data['sources'] if source.get('media') == '(min-width: 1025px)']
+        self.assertEqual([source['type'] for source in desktop_sources], ['image/avif', 'image/webp', 'image/jpeg'])
+        self.assertEqual(image_data['srcset'], desktop_sources[-1]['srcset'])
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_publishing_pregenerates_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.homepage.save_revision().publish()
+
+        for image in self.images:
+            self.assertEqual(image.renditions.count(), 18)
+
+    def test_warm_renditions_command(self):
+        self.homepage.save_revision().publish()
+
+        out = StringIO()
+        call_command('warm_renditions', '--dry-run', '--workers=0', stdout=out)
+        self.assertIn('72 renditions needed for 4 images, 72 missing', out.getvalue())
+
+        call_command('warm_renditions', '--workers=0', stdout=StringIO())
+        for image in self.images:
+            self.assertEqual(image.renditions.count(), 18)
+
+    @override_settings(IMAGE_URL_MODE='signed', RENDITION_WORKERS=0)
+    def test_signed_urls_render_on_first_fetch(self):
+        # Page, image and placeholder loads only - no rendition lookups, nothing rendered
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(3):
+                image_data = self.get_body_content_data()[0]['value']['features'][0]['image']
+        self.assertFalse(self.images[0].renditions.exists())
+        self.assertTrue(image_data['mobile'].startswith('http://127.0.0.1:8000/images/'))
+        self.assertEqual(len(image_data['sources']), 9)
+
+        response = self.client.get(image_data['mobile'].removeprefix('http://127.0.0.1:8000'))
+        self.assertEqual(response.status_code, 302)
+        rendition = self.images[0].renditions.get()
+        self.assertEqual(rendition.filter_spec, 'fill-700x500|format-webp')
+        self.assertEqual(response.url, rendition.url)
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_publishing_stores_api_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.homepage.save_revision().publish()
+
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        with self.assertNumQueries(0):
+            body_data = page.body_content_data
+        self.assertEqual(body_data, page.build_body_content_data())
+        self.assertEqual(len(body_data[0]['value']['features'][0]['image']['sources']), 9)
+
+        # Drafts do not touch the published payload, previews serialize live
+        page.body[0].value['main_title'] = 'Draft title'
+        page.save_revision()
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        self.assertEqual(page.body_content_data, body_data)
+        self.assertNotIn('api_snapshot', page.latest_revision.content)
+
+        draft = page.get_latest_revision_as_object()
+        self.assertIsNone(draft.get_api_snapshot())
+        self.assertEqual(draft.body_content_data[0]['value']['main_title'], 'Draft title')
+
+        # Other hosts get URLs of their own
+        request = RequestFactory().get('/', HTTP_HOST='brand.example.com')
+        with sites.request_context(request):
+            page = HomePage.objects.get(pk=self.homepage.pk)
+            self.assertIsNone(page.get_api_snapshot())
+            image_url = page.body_content_data[0]['value']['features'][0]['image']['src']
+        self.assertTrue(image_url.startswith('http://brand.example.com/'))
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_rendition_jobs_are_queued_once(self):
+        specs = {self.images[0].pk: ['fill-10x10']}
+        with mock.patch('home.renditions.render_image_specs', side_effect=OSError("missing file")) as render:
+            # Inline failures are logged, not raised into the request
+            with self.assertLogs('core.workers', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                schedule_renditions(specs)
+                schedule_renditions(specs)
+        self.assertEqual(render.call_count, 1)
+
+    @override_settings(RENDITION_WORKERS=0)
+    def test_snapshot_follows_linked_page_changes(self):
+        linked = Site.objects.get(is_default_site=True).root_page.add_child(
+            instance=Page(title="About", slug="about")
+        )
+        self.homepage.hero_section = [{
+            'type': 'hero',
+            'value': {'slides': [{'title': 'Slide', 'image': self.images[0].pk, 'page_link': linked.pk}]},
+        }]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.homepage.save_revision().publish()
+
+        def get_button_url():
+            page = HomePage.objects.get(pk=self.homepage.pk)
+            self.assertIsNotNone(page.get_api_snapshot())
+            return page.hero_section_data['slides'][0]['button']['url']
+
+        self.assertEqual(get_button_url(), '/about/')
+
+        linked.slug = 'about-us'
+        with self.captureOnCommitCallbacks(execute=True):
+            linked.save_revision().publish()
+        self.assertEqual(get_button_url(), '/about-us/')
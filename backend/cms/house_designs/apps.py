@@ -5,3 +5,6 @@ class HouseDesignsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'house_designs'
     verbose_name = 'House Designs'
+
+    def ready(self):
+        from . import signals  # noqa: F401
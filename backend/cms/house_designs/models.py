@@ -17,6 +17,10 @@ from modelcluster.models import ClusterableModel
 from taggit.models import TaggedItemBase
 from modelcluster.contrib.taggit import ClusterTaggableManager
 
+from core.api import get_api_projection, project
+from core.block_serializers import registry
+from core.placeholders import get_placeholder_data, get_placeholders
+from core.utils import get_base_url, get_image_url
 from .blocks import HouseDesignContentBlock
 
 
@@ -324,6 +328,11 @@ class HouseDesign(index.Indexed, ClusterableModel):
         if self.base_price:
             return f"${self.base_price:,.0f}"
         return "Contact for pricing"
+    
+    @property
+    def additional_content_data(self):
+        """Serialize additional content blocks for API"""
+        return registry.serialize_stream(self.additional_content)
 
 
 # ===== HOUSE DESIGNS INDEX PAGE =====
@@ -398,25 +407,30 @@ class HouseDesignsIndexPage(Page):
         APIField('filter_options'),
     ]
     
+    # Accept sub fields, e.g. ?fields=house_designs_data(id,name,image)
+    # (see HeadlessPagesAPIViewSet)
+    api_projectable_fields = ['house_designs_data', 'filter_options']
+    
+    # Designs are snippets, edited without publishing this page - keep
+    # shared copies short-lived (see core/cache_control.py)
+    api_cache_control = {'s_maxage': 30, 'stale_while_revalidate': 60}
+    
     @property
     def hero_data(self):
         """Return hero section data for API"""
         from django.conf import settings
         
-        # Build base URL for media files
-        request = getattr(self, '_request', None)
-        if request:
-            base_url = f"{request.scheme}://{request.get_host()}"
-        else:
-            base_url = "http://127.0.0.1:8000"
+        # Host of the request being served (core/sites.py)
+        base_url = get_base_url()
         
         hero_image = None
         if self.hero_background_image:
             hero_image = {
-                'url': base_url + self.hero_background_image.file.url,
+                'url': get_image_url(self.hero_background_image, base_url),
                 'alt': self.hero_background_image.title,
                 'width': self.hero_background_image.width,
                 'height': self.hero_background_image.height,
+                **get_placeholder_data(self.hero_background_image),
             }
         
         return {
@@ -467,64 +481,123 @@ class HouseDesignsIndexPage(Page):
     
     @property
     def house_designs_data(self):
-        """Transform house designs for API"""
-        from django.conf import settings
+        """Transform house designs for API (only the requested keys)"""
+        fields = get_api_projection(self, 'house_designs_data')
+        designs = list(self.get_house_designs(fields))
+        return self.build_house_designs_data(designs, fields)
+    
+    @staticmethod
+    def get_house_designs(fields=None):
+        """Published designs, loading along what the requested keys read"""
         designs = HouseDesign.objects.filter(is_published=True)
+        if fields is None or 'image' in fields:
+            designs = designs.select_related('featured_image')
+        if fields is None or 'category' in fields:
+            designs = designs.select_related('category')
+        if fields is None or 'location' in fields:
+            designs = designs.select_related('build_location')
+        if fields is None or 'tags' in fields:
+            designs = designs.prefetch_related('tags')
+        return designs
+    
+    def build_house_designs_data(self, designs, fields=None, placeholders=None):
+        """
+        Build the house designs payload from loaded designs
         
-        # Build base URL for media files
-        request = getattr(self, '_request', None)
-        if request:
-            base_url = f"{request.scheme}://{request.get_host()}"
-        else:
-            base_url = "http://127.0.0.1:8000"  # Fallback for development
+        Args:
+            designs (list): Designs from get_house_designs()
+            fields (list): Requested keys (None for all)
+            placeholders (dict): Placeholders of the design images, if
+                already loaded (see get_placeholders)
+            
+        Returns:
+            list: Design payloads
+        """
+        builders = {
+            'id': lambda design: design.id,
+            'name': lambda design: design.name,
+            'slug': lambda design: design.slug,
+            'description': lambda design: design.description,
+            'image': self._design_image_data,
+            'specs': lambda design: {
+                'storeys': design.storeys,
+                'storeys_label': design.get_storeys_display(),
+                'bedrooms': design.bedrooms,
+                'bathrooms': str(design.bathrooms),
+                'garage_spaces': design.garage_spaces,
+                'block_width': design.block_width_display,
+            },
+            'pricing': lambda design: {
+                'base_price': str(design.base_price) if design.base_price else None,
+                'display': design.price_display,
+                'note': design.price_note,
+            },
+            'category': lambda design: {
+                'name': design.category.name,
+                'slug': design.category.slug,
+            } if design.category else None,
+            'location': lambda design: {
+                'name': design.build_location.name,
+                'slug': design.build_location.slug,
+            } if design.build_location else None,
+            'badges': lambda design: {
+                'on_display': design.is_on_display,
+                'virtual_tour': design.has_virtual_tour,
+            },
+            'virtual_tour_url': lambda design: design.virtual_tour_url if design.has_virtual_tour else None,
+            'tags': lambda design: [tag.name for tag in design.tags.all()],
+        }
+        if fields is not None:
+            # Unrequested keys are never computed (no image or tag queries)
+            builders = {key: build for key, build in builders.items() if key in fields}
+        
+        if 'image' in builders:
+            if placeholders is None:
+                placeholders = get_placeholders([design.featured_image for design in designs])
+            self._design_placeholders = placeholders
         
         return [
-            {
-                'id': design.id,
-                'name': design.name,
-                'slug': design.slug,
-                'description': design.description,
-                'image': {
-                    'url': base_url + design.featured_image.file.url if design.featured_image else None,
-                    'alt': design.featured_image.title if design.featured_image else design.name,
-                    'width': design.featured_image.width if design.featured_image else None,
-                    'height': design.featured_image.height if design.featured_image else None,
-                } if design.featured_image else None,
-                'specs': {
-                    'storeys': design.storeys,
-                    'storeys_label': design.get_storeys_display(),
-                    'bedrooms': design.bedrooms,
-                    'bathrooms': str(design.bathrooms),
-                    'garage_spaces': design.garage_spaces,
-                    'block_width': design.block_width_display,
-                },
-                'pricing': {
-                    'base_price': str(design.base_price) if design.base_price else None,
-                    'display': design.price_display,
-                    'note': design.price_note,
-                },
-                'category': {
-                    'name': design.category.name,
-                    'slug': design.category.slug,
-                } if design.category else None,
-                'location': {
-                    'name': design.build_location.name,
-                    'slug': design.build_location.slug,
-                } if design.build_location else None,
-                'badges': {
-                    'on_display': design.is_on_display,
-                    'virtual_tour': design.has_virtual_tour,
-                },
-                'virtual_tour_url': design.virtual_tour_url if design.has_virtual_tour else None,
-                'tags': [tag.name for tag in design.tags.all()],
-            }
+            {key: build(design) for key, build in builders.items()}
             for design in designs
         ]
     
+    def _design_image_data(self, design):
+        """Card image of a house design (placeholders loaded in bulk)"""
+        if not design.featured_image:
+            return None
+        
+        # Host of the request being served (core/sites.py)
+        base_url = get_base_url()
+        
+        return {
+            'url': get_image_url(design.featured_image, base_url),
+            'alt': design.featured_image.title,
+            'width': design.featured_image.width,
+            'height': design.featured_image.height,
+            **self._design_placeholders.get(design.featured_image_id, {}),
+        }
+    
     @property
     def filter_options(self):
-        """Get available filter options"""
-        return {
+        """Get available filter options (only the requested keys)"""
+        fields = get_api_projection(self, 'filter_options')
+        categories = None
+        if fields is None or 'categories' in fields:
+            categories = list(HouseCategory.objects.all())
+        return self.build_filter_options(categories, fields)
+    
+    def build_filter_options(self, categories, fields=None):
+        """
+        Build the filter options payload
+        
+        Args:
+            categories (list): HouseCategory objects (None when not requested)
+            fields (list): Requested keys (None for all)
+            
+        Returns:
+            dict: Filter options
+        """
+        return project({
             'storeys': [
                 {'label': 'Single Storey', 'value': '1'},
                 {'label': 'Double Storey', 'value': '2'},
@@ -543,8 +616,8 @@ class HouseDesignsIndexPage(Page):
             ],
             'categories': [
                 {'label': cat.name, 'value': cat.slug}
-                for cat in HouseCategory.objects.all()
-            ],
+                for cat in categories
+            ] if categories is not None else None,
             'price_ranges': [
                 {'label': 'Under $300k', 'value': '300000'},
                 {'label': 'Under $400k', 'value': '400000'},
@@ -552,7 +625,7 @@ class HouseDesignsIndexPage(Page):
                 {'label': 'Under $600k', 'value': '600000'},
                 {'label': '$600k+', 'value': '600001'},
             ],
-        }
+        }, fields)
     
     class Meta:
         verbose_name = "House Designs Index Page"
@@ -0,0 +1,28 @@
+"""
+Signal handlers for the house designs app
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.block_serializers import bump_generation
+
+from .models import BuildLocation, HouseCategory, HouseDesign, HouseDesignTag
+
+
+@receiver(post_save, sender=HouseDesign)
+@receiver(post_delete, sender=HouseDesign)
+@receiver(post_save, sender=HouseCategory)
+@receiver(post_delete, sender=HouseCategory)
+@receiver(post_save, sender=BuildLocation)
+@receiver(post_delete, sender=BuildLocation)
+@receiver(post_save, sender=HouseDesignTag)
+@receiver(post_delete, sender=HouseDesignTag)
+def invalidate_house_design_payloads(sender, **kwargs):
+    """
+    House design snippets are embedded in the house designs index payload
+    but play no part in its content stamp - bump the generation, which
+    every API validator includes, once the change is committed
+    """
+    transaction.on_commit(bump_generation)
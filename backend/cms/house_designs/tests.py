@@ -1,3 +1,38 @@
+from django.core.cache import cache
 from django.test import TestCase
+from wagtail.models import Site
 
-# Create your tests here.
+from .models import HouseCategory, HouseDesignsIndexPage
+
+
+class HouseDesignsValidatorTests(TestCase):
+    """
+    Tests for conditional GETs of the house designs index.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.page = root.add_child(instance=HouseDesignsIndexPage(title="Designs", slug="designs"))
+        self.page.save_revision().publish()
+        self.category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+
+    def assert_changed_by_snippet_edit(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Freedom Plus"
+            self.category.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Freedom Plus', response.content)
+
+    def test_snippet_edit_changes_page_validators(self):
+        self.assert_changed_by_snippet_edit(f'/api/v2/pages/{self.page.pk}/')
+
+    def test_snippet_edit_changes_async_validators(self):
+        self.assert_changed_by_snippet_edit('/api/v2/async/house-designs/')
@@ -18,7 +18,7 @@ from modelcluster.fields import ParentalKey
 
 from core.models import PageAbstract, HeroAbstract, SEOAbstract
 from core.fields import generalpage_stream_fields, landingpage_stream_fields
-from core.api import HeadlessSerializerMixin
+from core.api import HeadlessSerializerMixin, StreamFieldSerializer
 
 
 # ============================================================================
@@ -93,7 +93,7 @@ class GeneralPage(PageAbstract, SEOAbstract, HeadlessSerializerMixin, Page):
     api_fields = [
         APIField('intro_title'),
         APIField('intro_text'),
-        APIField('body'),
+        APIField('body', serializer=StreamFieldSerializer()),
         APIField('hero_data', serializer=lambda self: self.get_hero_data('generalpage_hero')),
     ]
     
@@ -188,7 +188,7 @@ class LandingPage(PageAbstract, SEOAbstract, HeadlessSerializerMixin, Page):
     # API configuration for headless CMS
     api_fields = [
         APIField('subtitle'),
-        APIField('body'),
+        APIField('body', serializer=StreamFieldSerializer()),
         APIField('hide_from_navigation'),
         APIField('hero_data', serializer=lambda self: self.get_hero_data('landingpage_hero')),
     ]